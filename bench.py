@@ -0,0 +1,687 @@
+"""Benchmark Crypto Tracker - jalan lokal tanpa nembak API beneran.
+
+Contoh:
+    python bench.py frames --sizes 10,100,500,1000
+    python bench.py startup --max-first-frame-ms 1000
+    python bench.py alerts --rules 5000 --coins 500
+    python bench.py e2e --sizes 10,100,1000,5000 --latency-ms 80 --jitter-ms 40 --error-rate 0.02 --json new.json
+    python bench.py indicators --sizes 100,1000,10000
+    python bench.py fanout --clients 1,10,50 --coins 100
+    python bench.py replay --sizes 100,1000,5000 --steps 200
+    python bench.py compare old.json new.json
+"""
+import time
+BENCH_T0 = time.perf_counter()
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class StubCoinGeckoServer:
+    """Server /simple/price palsu di localhost, harga deterministik per koin.
+
+    latency/jitter dalam detik; error_rate & rate_limit_rate = peluang balas 500 / 429
+    per request /simple/price (pakai seed biar bisa diulang).
+    """
+    def __init__(self, port=0, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, seed=1):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub.handle(self)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+        self.requests = 0
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.statuses = {}
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def price_body(self, coin_ids):
+        tick = int(time.time())
+        data = {}
+        for coin_id in coin_ids:
+            seed = sum(map(ord, coin_id))
+            price = (seed % 1000 + 1) * (1 + 0.001 * ((tick + seed) % 7))
+            data[coin_id] = {
+                'usd': price,
+                'usd_24h_change': (seed % 17) - 8,
+                'usd_24h_vol': price * 1e6,
+                'usd_market_cap': price * 1e8
+            }
+        return json.dumps(data).encode()
+
+    def market_chart_body(self, coin_id, days):
+        """Histori random walk deterministik; granularity ngikutin CoinGecko (5 menit <= 1 hari, sisanya per jam)"""
+        rng = random.Random(coin_id)
+        step = 300 if days <= 1 else 3600
+        now = int(time.time())
+        price = sum(map(ord, coin_id)) % 1000 + 1
+        prices, volumes = [], []
+        for ts in range(now - int(days * 86400), now, step):
+            price *= 1 + rng.gauss(0, 0.01)
+            prices.append([ts * 1000, price])
+            volumes.append([ts * 1000, price * 1e6])
+        return json.dumps({'prices': prices, 'total_volumes': volumes}).encode()
+
+    def send(self, handler, status, body=b"", headers=None):
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def handle(self, handler):
+        self.requests += 1
+        parsed = urlparse(handler.path)
+        if parsed.path.endswith("/exchange_rates"):
+            self.send(handler, 200, json.dumps({'rates': {
+                'btc': {'value': 1.0}, 'usd': {'value': 65000.0},
+                'eur': {'value': 60000.0}, 'idr': {'value': 1.05e9}
+            }}).encode())
+            return
+        if parsed.path.endswith("/market_chart"):
+            coin_id = parsed.path.split("/")[-2]
+            days = float(parse_qs(parsed.query).get('days', ['1'])[0])
+            self.send(handler, 200, self.market_chart_body(coin_id, days))
+            return
+        if not parsed.path.endswith("/simple/price"):
+            self.send(handler, 404, b"{}")
+            return
+        with self.lock:
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            roll = self.rng.random()
+        if delay:
+            time.sleep(delay)
+        if roll < self.rate_limit_rate:
+            status, body, headers = 429, b'{"status":{"error_code":429}}', {"Retry-After": "1"}
+        elif roll < self.rate_limit_rate + self.error_rate:
+            status, body, headers = 500, b'{"error":"internal"}', None
+        else:
+            ids = parse_qs(parsed.query).get('ids', [''])[0]
+            status, body, headers = 200, self.price_body([c for c in ids.split(',') if c]), None
+        with self.lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.send(handler, status, body, headers)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def load_tracker_class():
+    from index import CryptoTrackerGenZ
+    return CryptoTrackerGenZ
+
+
+def make_quotes(coin_ids, rng, base=None):
+    """Quote sintetis format PriceSource buat koin-koin yang dikasih"""
+    quotes = {}
+    for i, coin_id in enumerate(coin_ids):
+        price = (base or {}).get(coin_id, 10 + i) * (1 + rng.uniform(-0.01, 0.01))
+        quotes[coin_id] = {
+            'price': price,
+            'change_24h': rng.uniform(-8, 8),
+            'volume_24h': rng.uniform(1e6, 1e10),
+            'market_cap': price * 1e7 * (len(coin_ids) - i)
+        }
+    return quotes
+
+
+def make_tracker(size, warm_ticks=10, seed=42):
+    """Tracker offline dengan watchlist sintetis yang udah punya histori"""
+    from rich.console import Console
+    rng = random.Random(seed)
+    tracker = load_tracker_class()(api_base_url="http://127.0.0.1:9")
+    tracker.console = Console(file=io.StringIO(), width=140, height=60)
+    tracker.watchlist = [f"coin-{i}" for i in range(size)]
+    for _ in range(warm_ticks):
+        tracker.apply_price_data(make_quotes(tracker.watchlist, rng))
+    return tracker, rng
+
+
+def time_frame(tracker, console):
+    start = time.perf_counter()
+    layout = tracker.create_layout()
+    built = time.perf_counter()
+    console.print(layout)
+    done = time.perf_counter()
+    return (built - start) * 1000, (done - built) * 1000
+
+
+def bench_frames(sizes, frames, change_ratio):
+    """Biaya satu frame (build layout + render) vs jumlah koin, idle & pas ada data baru"""
+    from rich.console import Console
+    results = []
+    for size in sizes:
+        tracker, rng = make_tracker(size)
+        console = Console(file=io.StringIO(), width=140, height=60, force_terminal=True)
+        time_frame(tracker, console)
+
+        idle_build, idle_render = [], []
+        for _ in range(frames):
+            build_ms, render_ms = time_frame(tracker, console)
+            idle_build.append(build_ms)
+            idle_render.append(render_ms)
+
+        changed = max(1, int(size * change_ratio))
+        update_build, update_render = [], []
+        for _ in range(frames):
+            coins = rng.sample(tracker.watchlist, changed)
+            prices = {c: tracker.crypto_data[c]['price'] for c in coins}
+            tracker.apply_price_data(make_quotes(coins, rng, prices))
+            build_ms, render_ms = time_frame(tracker, console)
+            update_build.append(build_ms)
+            update_render.append(render_ms)
+
+        results.append({
+            'coins': size,
+            'idle_build_ms': statistics.median(idle_build),
+            'idle_render_ms': statistics.median(idle_render),
+            'update_build_ms': statistics.median(update_build),
+            'update_render_ms': statistics.median(update_render),
+            'changed_per_frame': changed
+        })
+    return results
+
+
+def startup_child(api_url):
+    """Jalan di proses baru: import index, fetch pertama ke stub, render frame pertama"""
+    from rich.console import Console
+    tracker = load_tracker_class()(api_base_url=api_url)
+    console = Console(file=io.StringIO(), width=140, height=60, force_terminal=True)
+    while tracker.first_frame_at is None:
+        batches = tracker.get_fetch_batches()
+        if batches and tracker.scheduler.should_fetch(cost=len(batches)):
+            tracker.fetch_crypto_data()
+        console.print(tracker.create_layout())
+        if time.perf_counter() - BENCH_T0 > 30:
+            break
+    report = tracker.startup_report()
+    report['process_first_frame_ms'] = (time.perf_counter() - BENCH_T0) * 1000
+    tracker.shutdown()
+    print(json.dumps(report))
+
+
+def bench_startup(runs, max_first_frame_ms):
+    """Time-to-first-frame (UI) & time-to-first-row (headless) di proses baru vs stub API"""
+    stub = StubCoinGeckoServer().start()
+    results = []
+    try:
+        for run in range(runs):
+            child = subprocess.run(
+                [sys.executable, os.path.join(HERE, "bench.py"), "startup-child", "--api-url", stub.url],
+                capture_output=True, text=True, timeout=60
+            )
+            report = json.loads(child.stdout.strip().splitlines()[-1])
+
+            start = time.perf_counter()
+            headless = subprocess.Popen(
+                [sys.executable, os.path.join(HERE, "index.py"), "--headless", "--ticks", "1",
+                 "--no-record", "--api-url", stub.url],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+            headless.stdout.readline()
+            report['headless_first_row_ms'] = (time.perf_counter() - start) * 1000
+            headless.wait(timeout=30)
+
+            report['run'] = run
+            results.append(report)
+    finally:
+        stub.stop()
+
+    worst = max(r.get('first_frame_ms', float('inf')) for r in results)
+    status = "OK" if worst <= max_first_frame_ms else "FAIL"
+    print(f"{status}: time-to-first-frame terburuk {worst:.0f}ms (batas {max_first_frame_ms:.0f}ms)", file=sys.stderr)
+    return results, status == "OK"
+
+
+def make_rules(count, coin_ids, rng):
+    """Campuran rule sintetis: threshold, move, volume spike, cross; sebagian wildcard"""
+    rules = []
+    for i in range(count):
+        coin = '*' if i % 50 == 0 else rng.choice(coin_ids)
+        kind = ('threshold', 'threshold', 'move', 'volume_spike', 'cross')[i % 5]
+        rule = {'type': kind, 'coin': coin, 'cooldown': 60}
+        if kind == 'threshold':
+            rule.update(field=rng.choice(['price', 'change_24h']), op=rng.choice(['>', '<']),
+                        value=rng.uniform(-5, 50))
+        elif kind == 'move':
+            rule.update(ticks=rng.choice([5, 10, 30]), pct=rng.uniform(0.5, 3),
+                        direction=rng.choice(['up', 'down', 'any']))
+        elif kind == 'volume_spike':
+            rule.update(ticks=20, factor=rng.uniform(1.2, 3))
+        else:
+            rule.update(fast=5, slow=rng.choice([20, 50]), direction=rng.choice(['up', 'down']))
+        rules.append(rule)
+    return rules
+
+
+def bench_alerts(rule_counts, coins, ticks, change_ratio, max_p99_ms):
+    """Biaya evaluasi rule alert per tick (cuma koin yang berubah) vs jumlah rule"""
+    from index import AlertEngine
+    results = []
+    for count in rule_counts:
+        tracker, rng = make_tracker(coins, warm_ticks=60)
+        engine = AlertEngine(make_rules(count, tracker.watchlist, rng))
+        changed = max(1, int(coins * change_ratio))
+        timings, fired = [], 0
+        for tick in range(-20, ticks):
+            batch = rng.sample(tracker.watchlist, changed)
+            prices = {c: tracker.crypto_data[c]['price'] for c in batch}
+            tracker.apply_price_data(make_quotes(batch, rng, prices))
+            start = time.perf_counter()
+            alerts = engine.evaluate(batch, tracker.crypto_data, tracker.price_history)
+            elapsed = (time.perf_counter() - start) * 1000
+            if tick >= 0:
+                # 20 tick pertama = badai alert awal (semua kondisi baru pertama kali true), ga dihitung
+                timings.append(elapsed)
+                fired += len(alerts)
+        timings.sort()
+        results.append({
+            'rules': count,
+            'coins': coins,
+            'changed_per_tick': changed,
+            'p50_ms': statistics.median(timings),
+            'p99_ms': timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+            'alerts': fired
+        })
+
+    worst = max(r['p99_ms'] for r in results)
+    status = "OK" if worst <= max_p99_ms else "FAIL"
+    print(f"{status}: p99 evaluasi terburuk {worst:.3f}ms (batas {max_p99_ms:.3f}ms)", file=sys.stderr)
+    return results, status == "OK"
+
+
+def bench_indicators(sizes, ticks):
+    """Biaya update indikator incremental per tick (semua koin berubah) vs hitung ulang window dari histori"""
+    import numpy as np
+    from index import IndicatorEngine, PriceHistoryStore
+    results = []
+    for size in sizes:
+        rng = np.random.default_rng(size)
+        coin_ids = [f"coin-{i}" for i in range(size)]
+        engine = IndicatorEngine()
+        history = PriceHistoryStore(depth=64)
+        prices = rng.uniform(1, 1000, size)
+        volumes = rng.uniform(1e6, 1e9, size)
+        update_ms, values_ms, window_ms = [], [], []
+        for tick in range(ticks):
+            prices = prices * np.exp(rng.normal(0, 0.002, size))
+            volumes = volumes + rng.uniform(0, 1e4, size)
+            for coin_id, price in zip(coin_ids, prices):
+                history.append(coin_id, price)
+            start = time.perf_counter()
+            engine.update(coin_ids, prices, volumes, ts=1e9)
+            update_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            engine.values()
+            values_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            history.gather(27)
+            window_ms.append((time.perf_counter() - start) * 1000)
+        results.append({
+            'coins': size,
+            'update_p50_ms': statistics.median(update_ms),
+            'update_us_per_coin': statistics.median(update_ms) * 1000 / size,
+            'values_p50_ms': statistics.median(values_ms),
+            'gather_window_p50_ms': statistics.median(window_ms)
+        })
+    return results
+
+
+def bench_replay(sizes, steps, volatility, seed):
+    """Replay sintetis speed max lewat jalur update live: quote/s murni, lalu sambil render frame terus"""
+    from rich.console import Console
+    from index import ReplaySource
+    results = []
+    for size in sizes:
+        row = {'coins': size}
+        for mode in ('apply', 'render'):
+            coins = [f"sim-{i:04d}" for i in range(size)]
+            replay = ReplaySource.synthetic(coins, volatility=volatility, seed=seed, steps=steps, speed=0)
+            tracker = load_tracker_class()(api_base_url="http://127.0.0.1:9", backfill_days=0, replay=replay)
+            console = Console(file=io.StringIO(), width=140, height=60, force_terminal=True)
+            tracker.console = console
+            replay.start(tracker.on_stream_quotes)
+            frame_ms = []
+            while mode == 'render' and not replay.finished:
+                build_ms, render_ms = time_frame(tracker, console)
+                frame_ms.append(build_ms + render_ms)
+            replay.thread.join()
+            stats = replay.stats()
+            row[f'{mode}_quotes_per_s'] = stats['quotes_per_s']
+            row[f'{mode}_tick_p50_ms'] = tracker.metrics.percentile('apply_ms', 0.5)
+            if mode == 'render':
+                row['frames'] = len(frame_ms)
+                row['frame_p50_ms'] = statistics.median(frame_ms) if frame_ms else None
+            tracker.shutdown()
+        results.append(row)
+    return results
+
+
+def bench_fanout(client_counts, coins, ticks, change_ratio):
+    """Daemon -> N client lewat Unix socket: biaya publish, byte per tick, waktu sampai semua client kebagian"""
+    from index import StateDaemon, StateSubscriber
+    results = []
+    for count in client_counts:
+        tracker, rng = make_tracker(coins)
+        directory = tempfile.mkdtemp(prefix="crypto-fanout-")
+        address = "unix:" + os.path.join(directory, "daemon.sock")
+        daemon = StateDaemon(tracker, address).start()
+        clients = []
+        for _ in range(count):
+            client = load_tracker_class()(api_base_url="http://127.0.0.1:9", backfill_days=0,
+                                          remote=StateSubscriber(address))
+            clients.append(client.remote.start(client))
+        start = time.perf_counter()
+        while not all(c.connected for c in clients) and time.perf_counter() - start < 10:
+            time.sleep(0.01)
+        daemon.publish()
+        start = time.perf_counter()
+        while not all(len(c.tracker.crypto_data) == coins for c in clients) and time.perf_counter() - start < 10:
+            time.sleep(0.01)
+        snapshot_bytes = clients[0].received_bytes if clients else 0
+
+        changed = max(1, int(coins * change_ratio))
+        publish_ms, delivery_ms, tick_bytes = [], [], []
+        for _ in range(ticks):
+            batch = rng.sample(tracker.watchlist, changed)
+            prices = {c: tracker.crypto_data[c]['price'] for c in batch}
+            tracker.apply_price_data(make_quotes(batch, rng, prices))
+            received = clients[0].received_bytes
+            start = time.perf_counter()
+            daemon.publish()
+            publish_ms.append((time.perf_counter() - start) * 1000)
+            while any(c.seq < daemon.seq for c in clients) and time.perf_counter() - start < 10:
+                time.sleep(0.0005)
+            delivery_ms.append((time.perf_counter() - start) * 1000)
+            tick_bytes.append(clients[0].received_bytes - received)
+
+        for client in clients:
+            client.stop()
+        daemon.stop()
+        os.rmdir(directory)
+        publish_ms.sort()
+        delivery_ms.sort()
+        results.append({
+            'clients': count,
+            'coins': coins,
+            'changed_per_tick': changed,
+            'snapshot_kb': snapshot_bytes / 1024,
+            'bytes_per_tick': statistics.median(tick_bytes),
+            'publish_p50_ms': statistics.median(publish_ms),
+            'delivery_p50_ms': statistics.median(delivery_ms),
+            'delivery_p99_ms': delivery_ms[min(len(delivery_ms) - 1, int(len(delivery_ms) * 0.99))],
+            'upstream_polls': ticks
+        })
+    return results
+
+
+def peak_rss_mb():
+    """Peak RSS proses ini (MB); None kalau platform-nya ga punya modul resource"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def e2e_child(api_url, size, ticks, batch_size):
+    """Jalan di proses baru biar RSS-nya bersih: fetch -> update state -> create_layout tiap tick"""
+    from rich.console import Console
+    tracker = load_tracker_class()(api_base_url=api_url, batch_size=batch_size)
+    tracker.console = Console(file=io.StringIO(), width=140, height=60)
+    tracker.watchlist = [f"coin-{i}" for i in range(size)]
+    console = Console(file=io.StringIO(), width=140, height=60, force_terminal=True)
+    rss_before = peak_rss_mb()
+
+    tick_ms, frame_cpu_ms, updated = [], [], 0
+    start_all = time.perf_counter()
+    for _ in range(ticks):
+        start = time.perf_counter()
+        tracker.fetch_crypto_data()
+        updated += len(tracker.drain_changed())
+        cpu_start = time.process_time()
+        console.print(tracker.create_layout())
+        frame_cpu_ms.append((time.process_time() - cpu_start) * 1000)
+        tick_ms.append((time.perf_counter() - start) * 1000)
+    elapsed = time.perf_counter() - start_all
+
+    tick_ms.sort()
+    frame_cpu_ms.sort()
+    metrics = tracker.metrics
+    report = {
+        'coins': size,
+        'ticks': ticks,
+        'ticks_per_s': ticks / elapsed,
+        'coin_updates_per_s': updated / elapsed,
+        'tick_p50_ms': statistics.median(tick_ms),
+        'tick_p99_ms': tick_ms[min(len(tick_ms) - 1, int(len(tick_ms) * 0.99))],
+        'frame_cpu_p50_ms': statistics.median(frame_cpu_ms),
+        'frame_cpu_p99_ms': frame_cpu_ms[min(len(frame_cpu_ms) - 1, int(len(frame_cpu_ms) * 0.99))],
+        'http_requests': metrics.counter('http_requests_total'),
+        'errors': metrics.counter('errors_total'),
+        'rate_limited': metrics.counter('rate_limited_total'),
+        'rss_start_mb': rss_before,
+        'rss_peak_mb': peak_rss_mb()
+    }
+    tracker.shutdown()
+    print(json.dumps(report))
+
+
+def bench_e2e(sizes, ticks, batch_size, latency_ms, jitter_ms, error_rate, rate_limit_rate, seed):
+    """End-to-end lawan stub server: satu proses baru per ukuran watchlist"""
+    stub = StubCoinGeckoServer(latency=latency_ms / 1000, jitter=jitter_ms / 1000, error_rate=error_rate,
+                               rate_limit_rate=rate_limit_rate, seed=seed).start()
+    results = []
+    try:
+        for size in sizes:
+            child = subprocess.run(
+                [sys.executable, os.path.join(HERE, "bench.py"), "e2e-child", "--api-url", stub.url,
+                 "--size", str(size), "--ticks", str(ticks), "--batch-size", str(batch_size)],
+                capture_output=True, text=True, timeout=600
+            )
+            if child.returncode != 0:
+                raise RuntimeError(f"e2e-child {size} koin gagal:\n{child.stderr}")
+            results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+    finally:
+        stub.stop()
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare_results(old_path, new_path, threshold):
+    """Bandingin dua file JSON hasil bench (baris dicocokin lewat kolom pertama), tandai yang berubah > threshold"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    if old.get('command') != new.get('command'):
+        print(f"Beda command: {old.get('command')} vs {new.get('command')}", file=sys.stderr)
+    rows = []
+    old_rows = {next(iter(r.values())): r for r in old.get('results', [])}
+    for row in new.get('results', []):
+        key_name, key = next(iter(row.items()))
+        before = old_rows.get(key)
+        if before is None:
+            continue
+        for field, value in row.items():
+            previous = before.get(field)
+            if field == key_name or not isinstance(value, (int, float)) or not isinstance(previous, (int, float)):
+                continue
+            change = (value - previous) / previous * 100 if previous else 0.0
+            rows.append({
+                key_name: key,
+                'metric': field,
+                'old': float(previous),
+                'new': float(value),
+                'change_pct': change,
+                'flag': "!!" if abs(change) >= threshold else ""
+            })
+    print(f"{old.get('revision')} -> {new.get('revision')}", file=sys.stderr)
+    return rows
+
+
+def print_rows(rows):
+    if not rows:
+        return
+    keys = list(rows[0])
+    print("  ".join(f"{k:>18}" for k in keys))
+    for row in rows:
+        print("  ".join(f"{v:>18.3f}" if isinstance(v, float) else f"{v:>18}" for v in row.values()))
+
+
+def parse_sizes(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Crypto Tracker")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    frames = sub.add_parser("frames", help="biaya frame vs jumlah koin")
+    frames.add_argument("--sizes", type=parse_sizes, default=[10, 50, 100, 250, 500, 1000])
+    frames.add_argument("--frames", type=int, default=20)
+    frames.add_argument("--change-ratio", type=float, default=0.05)
+
+    startup = sub.add_parser("startup", help="time-to-first-frame vs stub API")
+    startup.add_argument("--runs", type=int, default=3)
+    startup.add_argument("--max-first-frame-ms", type=float, default=1000)
+
+    alerts = sub.add_parser("alerts", help="biaya evaluasi rule alert per tick")
+    alerts.add_argument("--rules", type=parse_sizes, default=[100, 1000, 5000])
+    alerts.add_argument("--coins", type=int, default=500)
+    alerts.add_argument("--ticks", type=int, default=200)
+    alerts.add_argument("--change-ratio", type=float, default=0.05)
+    # baseline laptop biasa: p50 ~0,8ms, p99 0,8-2,3ms (p99 200 tick = sampel terburuk ke-2, gampang kena jitter GC/OS)
+    alerts.add_argument("--max-p99-ms", type=float, default=5.0,
+                        help="gagal (exit 1) kalau p99 terburuk lewat batas ini")
+
+    e2e = sub.add_parser("e2e", help="fetch -> state -> create_layout vs stub API (latency/error/429)")
+    e2e.add_argument("--sizes", type=parse_sizes, default=[10, 100, 1000, 5000])
+    e2e.add_argument("--ticks", type=int, default=30)
+    e2e.add_argument("--batch-size", type=int, default=250)
+    e2e.add_argument("--latency-ms", type=float, default=50)
+    e2e.add_argument("--jitter-ms", type=float, default=25)
+    e2e.add_argument("--error-rate", type=float, default=0.0)
+    e2e.add_argument("--rate-limit-rate", type=float, default=0.0)
+    e2e.add_argument("--seed", type=int, default=1)
+
+    e2e_worker = sub.add_parser("e2e-child")
+    e2e_worker.add_argument("--api-url", required=True)
+    e2e_worker.add_argument("--size", type=int, required=True)
+    e2e_worker.add_argument("--ticks", type=int, required=True)
+    e2e_worker.add_argument("--batch-size", type=int, required=True)
+
+    indicators = sub.add_parser("indicators", help="biaya update RSI/MACD/Bollinger/VWAP per tick")
+    indicators.add_argument("--sizes", type=parse_sizes, default=[100, 1000, 10000])
+    indicators.add_argument("--ticks", type=int, default=50)
+
+    fanout = sub.add_parser("fanout", help="daemon -> banyak client: byte & latency per tick")
+    fanout.add_argument("--clients", type=parse_sizes, default=[1, 10, 50])
+    fanout.add_argument("--coins", type=int, default=100)
+    fanout.add_argument("--ticks", type=int, default=50)
+    fanout.add_argument("--change-ratio", type=float, default=0.2)
+
+    replay = sub.add_parser("replay", help="load generator: replay sintetis secepat mungkin, quote/s & biaya frame")
+    replay.add_argument("--sizes", type=parse_sizes, default=[100, 1000, 5000])
+    replay.add_argument("--steps", type=int, default=200)
+    replay.add_argument("--volatility", type=float, default=0.5)
+    replay.add_argument("--seed", type=int, default=1)
+
+    compare = sub.add_parser("compare", help="bandingin dua file --json hasil bench")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=10.0, help="tandai perubahan >= persen ini")
+
+    child = sub.add_parser("startup-child")
+    child.add_argument("--api-url", required=True)
+
+    args = parser.parse_args(argv)
+    ok = True
+    if args.command == "startup-child":
+        startup_child(args.api_url)
+        return None
+    if args.command == "e2e-child":
+        e2e_child(args.api_url, args.size, args.ticks, args.batch_size)
+        return None
+    if args.command == "frames":
+        results = bench_frames(args.sizes, args.frames, args.change_ratio)
+    elif args.command == "startup":
+        results, ok = bench_startup(args.runs, args.max_first_frame_ms)
+    elif args.command == "alerts":
+        results, ok = bench_alerts(args.rules, args.coins, args.ticks, args.change_ratio, args.max_p99_ms)
+    elif args.command == "e2e":
+        results = bench_e2e(args.sizes, args.ticks, args.batch_size, args.latency_ms, args.jitter_ms,
+                            args.error_rate, args.rate_limit_rate, args.seed)
+    elif args.command == "indicators":
+        results = bench_indicators(args.sizes, args.ticks)
+    elif args.command == "fanout":
+        results = bench_fanout(args.clients, args.coins, args.ticks, args.change_ratio)
+    elif args.command == "replay":
+        results = bench_replay(args.sizes, args.steps, args.volatility, args.seed)
+    elif args.command == "compare":
+        results = compare_results(args.old, args.new, args.threshold)
+
+    print_rows(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            params = {k: v for k, v in vars(args).items() if k not in ('json', 'command')}
+            json.dump({
+                'command': args.command,
+                'revision': git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'params': params,
+                'results': results
+            }, f, indent=2)
+    if not ok:
+        sys.exit(1)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -1,155 +1,4399 @@
-import requests
 import time
+STARTUP_T0 = time.perf_counter()
 import json
-from datetime import datetime
+import csv
+from datetime import datetime, timezone
 import threading
 import sys
 import select
 import os
 import random
+import argparse
+import hashlib
+import hmac
+import ipaddress
+import bisect
+import heapq
+import base64
+import socket
+import ssl
+import struct
+import selectors
+import warnings
+import importlib.util
+from urllib.parse import urlsplit
+from email.utils import parsedate_to_datetime
+from collections import deque
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
 if os.name == "nt":
     import msvcrt
-from rich.console import Console
-from rich.table import Table
-from rich.live import Live
-from rich.layout import Layout
-from rich.panel import Panel
-from rich.text import Text
-from rich.align import Align
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
-from rich.columns import Columns
-from rich.rule import Rule
-from rich.padding import Padding
-from rich.box import ROUNDED, DOUBLE, MINIMAL
-from rich import print as rprint
-from rich.spinner import Spinner
+else:
+    import fcntl
+try:
+    import requests
+    import numpy as np
+except ImportError:
+    requests = np = None
+
+STARTUP_TIMINGS = {'import_ms': (time.perf_counter() - STARTUP_T0) * 1000}
+RICH_LOADED = False
+
+def load_rich():
+    """Import Rich pas UI pertama kali dipakai, mode headless ga perlu bayar biaya import-nya"""
+    global RICH_LOADED, Console, Table, Live, Layout, Panel, Text, Align
+    global Columns, ROUNDED, DOUBLE, MINIMAL
+    if RICH_LOADED:
+        return
+    start = time.perf_counter()
+    from rich.console import Console
+    from rich.table import Table
+    from rich.live import Live
+    from rich.layout import Layout
+    from rich.panel import Panel
+    from rich.text import Text
+    from rich.align import Align
+    from rich.columns import Columns
+    from rich.box import ROUNDED, DOUBLE, MINIMAL
+    RICH_LOADED = True
+    STARTUP_TIMINGS['rich_import_ms'] = (time.perf_counter() - start) * 1000
+
+class Metrics:
+    """Histogram timer per stage, counter, gauge & ring buffer error terakhir (thread-safe)"""
+    BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+    BUCKETS_BYTES = (1e3, 1e4, 1e5, 1e6, 1e7)
+
+    def __init__(self, recent=512, error_history=50):
+        self.lock = threading.Lock()
+        self.recent_size = recent
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.errors = deque(maxlen=error_history)
+        self.help = {}
+
+    def observe(self, name, value, buckets=None):
+        with self.lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                bounds = buckets or self.BUCKETS_MS
+                hist = {'bounds': bounds, 'counts': [0] * (len(bounds) + 1), 'sum': 0.0, 'count': 0,
+                        'recent': deque(maxlen=self.recent_size)}
+                self.histograms[name] = hist
+            hist['counts'][bisect.bisect_left(hist['bounds'], value)] += 1
+            hist['sum'] += value
+            hist['count'] += 1
+            hist['recent'].append(value)
+
+    def observe_since(self, name, start):
+        """Catat durasi (ms) sejak start = time.perf_counter(), return durasinya"""
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.observe(name, elapsed_ms)
+        return elapsed_ms
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def record_error(self, stage, message):
+        with self.lock:
+            self.errors.append({'ts': time.time(), 'stage': stage, 'message': str(message)})
+        self.inc('errors_total', stage=stage)
+
+    def counter(self, name, **labels):
+        with self.lock:
+            if labels:
+                return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+            return sum(v for (n, _), v in self.counters.items() if n == name)
+
+    def percentile(self, name, q):
+        """Persentil dari sampel terbaru (None kalau belum ada)"""
+        with self.lock:
+            hist = self.histograms.get(name)
+            values = sorted(hist['recent']) if hist else []
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(len(values) * q))]
+
+    def render_prometheus(self, prefix="crypto_tracker_"):
+        """Semua metric dalam format text exposition Prometheus"""
+        lines = []
+        with self.lock:
+            for name, hist in sorted(self.histograms.items()):
+                full = prefix + name
+                lines.append(f"# TYPE {full} histogram")
+                cumulative = 0
+                for bound, count in zip(hist['bounds'], hist['counts']):
+                    cumulative += count
+                    lines.append(f'{full}_bucket{{le="{bound:g}"}} {cumulative}')
+                lines.append(f'{full}_bucket{{le="+Inf"}} {hist["count"]}')
+                lines.append(f"{full}_sum {hist['sum']:.6g}")
+                lines.append(f"{full}_count {hist['count']}")
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                full = prefix + name
+                if full not in typed:
+                    lines.append(f"# TYPE {full} counter")
+                    typed.add(full)
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{full}{{{label_text}}} {value}" if label_text else f"{full} {value}")
+            for name, value in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {prefix + name} gauge")
+                lines.append(f"{prefix + name} {value:.6g}")
+        return "\n".join(lines) + "\n"
+
+class MetricsServer:
+    """Endpoint /metrics (format Prometheus) di thread HTTP lokal"""
+    def __init__(self, metrics, host="127.0.0.1", port=9108):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = owner.metrics.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.metrics = metrics
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class FrameProfiler:
+    """cProfile per frame, simpan N frame paling lambat lalu dump ke file .prof (buka pakai pstats/snakeviz)"""
+    def __init__(self, keep=5, directory="profiles"):
+        import cProfile
+        self.cProfile = cProfile
+        self.keep = keep
+        self.directory = directory
+        self.slowest = []
+        self.frames = 0
+        self.profile = None
+
+    def start(self):
+        self.profile = self.cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self, elapsed_ms):
+        self.profile.disable()
+        self.frames += 1
+        entry = (elapsed_ms, self.frames, self.profile)
+        self.profile = None
+        if len(self.slowest) < self.keep:
+            self.slowest.append(entry)
+        elif elapsed_ms > min(self.slowest)[0]:
+            self.slowest.remove(min(self.slowest))
+            self.slowest.append(entry)
+
+    def dump(self):
+        """Tulis profile frame-frame terlambat, return list path-nya"""
+        if not self.slowest:
+            return []
+        os.makedirs(self.directory, exist_ok=True)
+        paths = []
+        for rank, (elapsed_ms, frame, profile) in enumerate(sorted(self.slowest, reverse=True), 1):
+            path = os.path.join(self.directory, f"frame-{rank}-{frame}-{elapsed_ms:.0f}ms.prof")
+            profile.dump_stats(path)
+            paths.append(path)
+        return paths
+
+class PooledHttpClient:
+    """Session HTTP bareng: keep-alive, gzip, ETag, dan timing tiap request"""
+    def __init__(self, pool_size=10, timeout=10, history=256, metrics=None):
+        self.timeout = timeout
+        self.metrics = metrics
+        self.session = requests.Session()
+        self.adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.adapter.build_response = self.build_response
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'crypto-tracker/2.0'
+        })
+        self.cache = {}
+        self.timings = deque(maxlen=history)
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+    def build_response(self, request, raw):
+        """Tandai tiap response: socket-nya sama dengan request sebelumnya di koneksi itu (keep-alive) atau baru"""
+        response = requests.adapters.HTTPAdapter.build_response(self.adapter, request, raw)
+        connection = getattr(raw, 'connection', None)
+        sock = getattr(connection, 'sock', None)
+        response.connection_reused = sock is not None and getattr(connection, 'tracker_sock', None) is sock
+        if connection is not None:
+            connection.tracker_sock = sock
+        return response
+
+    def request(self, url, params, headers):
+        start = time.perf_counter()
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if self.metrics is not None:
+            self.metrics.observe('http_request_ms', elapsed_ms)
+            self.metrics.observe('http_response_bytes', len(response.content), Metrics.BUCKETS_BYTES)
+            self.metrics.inc('http_requests_total', status=response.status_code)
+        return response, elapsed_ms
+
+    def get_json(self, url, params=None):
+        """GET + parse JSON, skip parsing kalau 304 atau body-nya sama persis"""
+        key = (url, tuple(sorted((params or {}).items())))
+        with self.lock:
+            cached = self.cache.get(key)
+        headers = {}
+        if cached and cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+
+        response, elapsed_ms = self.request(url, params, headers)
+        if response.status_code == 304 and not cached:
+            # 304 tapi cache-nya ga ada (dibuang / proxy ngaco): body kosong, wajib ambil ulang full
+            response, elapsed_ms = self.request(url, params, {'Cache-Control': 'no-cache'})
+        reused = getattr(response, 'connection_reused', False)
+
+        cached_hit = False
+        if response.status_code == 304 and cached:
+            data = cached['data']
+            cached_hit = True
+        else:
+            if response.status_code == 304:
+                raise requests.HTTPError(f"304 tanpa cache buat {url}", response=response)
+            response.raise_for_status()
+            digest = hashlib.blake2b(response.content, digest_size=16).digest()
+            if cached and cached['digest'] == digest:
+                data = cached['data']
+                cached_hit = True
+            else:
+                parse_start = time.perf_counter()
+                data = response.json()
+                if self.metrics is not None:
+                    self.metrics.observe_since('json_parse_ms', parse_start)
+                with self.lock:
+                    self.cache[key] = {
+                        'etag': response.headers.get('ETag'),
+                        'digest': digest,
+                        'data': data
+                    }
+
+        with self.lock:
+            self.request_count += 1
+            self.timings.append({
+                'seq': self.request_count,
+                'url': url,
+                'status': response.status_code,
+                'elapsed_ms': elapsed_ms,
+                'bytes': len(response.content),
+                'reused': reused,
+                'cached': cached_hit
+            })
+        return data
+
+    def timings_since(self, seq):
+        """Timing request yang seq-nya lebih besar dari seq"""
+        with self.lock:
+            return [t for t in self.timings if t['seq'] > seq]
+
+    def summarize(self, timings):
+        """Ringkasan timing satu refresh: total, reuse vs koneksi baru"""
+        reused = [t['elapsed_ms'] for t in timings if t['reused']]
+        fresh = [t['elapsed_ms'] for t in timings if not t['reused']]
+        return {
+            'requests': len(timings),
+            'total_ms': sum(t['elapsed_ms'] for t in timings),
+            'bytes': sum(t['bytes'] for t in timings),
+            'reused': len(reused),
+            'cached': sum(1 for t in timings if t['cached']),
+            'avg_reused_ms': sum(reused) / len(reused) if reused else None,
+            'avg_new_ms': sum(fresh) / len(fresh) if fresh else None
+        }
+
+    def close(self):
+        self.session.close()
+
+class PollScheduler:
+    """Jadwal polling adaptif: token bucket kuota API, gabung refresh manual, backoff + jitter"""
+    def __init__(self, base_interval=15, min_interval=5, max_interval=60,
+                 rate_per_minute=10, burst=5, coalesce_window=1.0, max_backoff=300,
+                 target_volatility=0.1):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = base_interval
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.coalesce_window = coalesce_window
+        self.max_backoff = max_backoff
+        self.target_volatility = target_volatility
+        self.last_refill = time.time()
+        self.last_poll = 0
+        self.next_poll = 0
+        self.backoff_until = 0
+        self.failures = 0
+        self.pending_since = None
+        self.pending_count = 0
+        self.decision = "Nunggu fetch pertama"
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def request_refresh(self, reason="manual"):
+        """Minta refresh, request yang datang berdekatan digabung jadi satu fetch"""
+        with self.lock:
+            if self.pending_since is None:
+                self.pending_since = time.time()
+            self.pending_count += 1
+            self.decision = f"Refresh {reason} diantri ({self.pending_count}x)"
+
+    def should_fetch(self, now=None, cost=1):
+        """True kalau sekarang boleh fetch; cost = jumlah request API yang bakal dipake"""
+        now = time.time() if now is None else now
+        with self.lock:
+            self._refill(now)
+            if now < self.backoff_until:
+                return False
+
+            manual = self.pending_since is not None and now - self.pending_since >= self.coalesce_window
+            scheduled = now >= self.next_poll
+            if not (manual or scheduled):
+                return False
+
+            needed = min(cost, self.capacity)
+            if self.tokens < needed:
+                wait = (needed - self.tokens) / self.rate
+                self.decision = f"Kuota tipis, nunggu token ~{wait:.0f}s"
+                return False
+
+            # biaya dipotong sama kayak yang dicek; fetch lebih gede dari burst ga bikin saldo minus
+            self.tokens -= needed
+            if manual and self.pending_count > 1:
+                self.decision = f"Refresh manual ({self.pending_count} digabung)"
+            elif manual:
+                self.decision = "Refresh manual"
+            else:
+                self.decision = f"Poll terjadwal tiap {self.interval:.0f}s"
+            self.pending_since = None
+            self.pending_count = 0
+            self.last_poll = now
+            self.next_poll = now + self.interval
+            return True
+
+    def try_acquire(self, cost=1):
+        """Ambil token buat request sampingan (misal kurs FX) tanpa ganggu jadwal poll"""
+        with self.lock:
+            self._refill(time.time())
+            if time.time() < self.backoff_until or self.tokens < cost:
+                return False
+            self.tokens -= cost
+            return True
+
+    def record_result(self, status=None, retry_after=None, failed=False, volatility=None):
+        """Catat hasil fetch: backoff kalau 429/5xx/koneksi gagal, adaptasi interval kalau sukses"""
+        now = time.time()
+        with self.lock:
+            if failed and (status is None or status == 429 or status >= 500):
+                self.failures += 1
+                delay = min(self.max_backoff, self.base_interval * (2 ** (self.failures - 1)))
+                delay = random.uniform(delay / 2, delay)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                self.backoff_until = now + delay
+                self.next_poll = self.backoff_until
+                label = status if status is not None else "koneksi"
+                self.decision = f"Backoff {delay:.0f}s ({label})"
+                return
+
+            self.failures = 0
+            if volatility is not None:
+                if volatility > 0:
+                    target = self.base_interval * self.target_volatility / volatility
+                else:
+                    target = self.max_interval
+                target = max(self.min_interval, min(self.max_interval, target))
+                self.interval = 0.5 * self.interval + 0.5 * target
+                self.next_poll = self.last_poll + self.interval
+
+    def configure(self, base_interval, min_interval, max_interval):
+        """Ganti interval dari config tanpa reset kuota; poll berikutnya ikut dimajuin kalau interval mengecil"""
+        with self.lock:
+            self.base_interval = base_interval
+            self.min_interval = min_interval
+            self.max_interval = max_interval
+            self.interval = max(min_interval, min(max_interval, base_interval))
+            if self.last_poll:
+                self.next_poll = min(self.next_poll, self.last_poll + self.interval)
+
+    def progress(self, now=None):
+        """Progress (0-1) menuju fetch berikutnya plus sisa detiknya"""
+        now = time.time() if now is None else now
+        with self.lock:
+            start = self.last_poll
+            end = max(self.next_poll, self.backoff_until)
+        if end <= start:
+            return 1.0, 0
+        fraction = min(1.0, max(0.0, (now - start) / (end - start)))
+        return fraction, max(0, end - now)
+
+    def status(self):
+        with self.lock:
+            self._refill(time.time())
+            return {
+                'decision': self.decision,
+                'interval': self.interval,
+                'tokens': self.tokens,
+                'capacity': self.capacity,
+                'backoff': self.backoff_until > time.time()
+            }
+
+def parse_retry_after(value):
+    """Parse header Retry-After (detik atau HTTP-date) jadi detik"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def parse_address(value):
+    """Alamat daemon: 'unix:/path' atau path -> Unix socket, 'host:port' / ':port' -> TCP"""
+    if value.startswith('unix:'):
+        return socket.AF_UNIX, os.path.expanduser(value[5:])
+    host, sep, port = value.rpartition(':')
+    if sep and port.isdigit():
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    return socket.AF_UNIX, os.path.expanduser(value)
+
+def is_loopback(family, address):
+    """True kalau alamat daemon cuma bisa dijangkau dari mesin ini (Unix socket / 127.x / localhost)"""
+    if family == socket.AF_UNIX:
+        return True
+    host = address[0]
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == 'localhost'
+
+class PriceSource:
+    """Interface sumber harga.
+
+    Source polling ngisi get_batches + fetch_batch, source streaming ngisi
+    start/stop dan ngirim quote lewat callback. Quote selalu format normal:
+    {coin_id: {'price', 'change_24h', 'volume_24h', 'market_cap'}}, key yang
+    ga ada artinya pakai nilai sebelumnya.
+    """
+    name = "base"
+    streaming = False
+
+    def get_batches(self, coin_ids):
+        return [list(coin_ids)] if coin_ids else []
+
+    def fetch_batch(self, coin_ids):
+        raise NotImplementedError
+
+    def start(self, on_quotes):
+        pass
+
+    def stop(self):
+        pass
+
+    def covered_coins(self):
+        """Koin yang lagi di-cover live sama source ini (ga perlu dipoll REST)"""
+        return set()
+
+class CoinGeckoPriceSource(PriceSource):
+    """Polling REST /simple/price CoinGecko, dipecah per batch"""
+    name = "coingecko"
+
+    def __init__(self, http, base_url="https://api.coingecko.com/api/v3", batch_size=50):
+        self.http = http
+        self.base_url = base_url.rstrip('/')
+        self.batch_size = batch_size
+
+    def get_batches(self, coin_ids):
+        size = max(1, self.batch_size)
+        return [coin_ids[i:i + size] for i in range(0, len(coin_ids), size)]
+
+    def fetch_batch(self, coin_ids):
+        url = f"{self.base_url}/simple/price"
+        params = {
+            'ids': ','.join(coin_ids),
+            'vs_currencies': 'usd',
+            'include_24hr_change': 'true',
+            'include_24hr_vol': 'true',
+            'include_market_cap': 'true'
+        }
+
+        data = self.http.get_json(url, params=params)
+        return {
+            coin_id: {
+                'price': info.get('usd', 0),
+                'change_24h': info.get('usd_24h_change', 0),
+                'volume_24h': info.get('usd_24h_vol', 0),
+                'market_cap': info.get('usd_market_cap', 0)
+            }
+            for coin_id, info in data.items()
+        }
+
+class CoinCapPriceSource(PriceSource):
+    """Polling REST /assets ala CoinCap; id-nya mirip CoinGecko, yang beda di-mapping"""
+    name = "coincap"
+    ID_MAP = {'binancecoin': 'binance-coin', 'avalanche-2': 'avalanche', 'matic-network': 'polygon'}
+
+    def __init__(self, http, base_url="https://api.coincap.io/v2", batch_size=100, id_map=None):
+        self.http = http
+        self.base_url = base_url.rstrip('/')
+        self.batch_size = batch_size
+        self.id_map = dict(self.ID_MAP, **(id_map or {}))
+
+    def get_batches(self, coin_ids):
+        size = max(1, self.batch_size)
+        return [coin_ids[i:i + size] for i in range(0, len(coin_ids), size)]
+
+    def fetch_batch(self, coin_ids):
+        remote = {self.id_map.get(coin_id, coin_id): coin_id for coin_id in coin_ids}
+        data = self.http.get_json(f"{self.base_url}/assets", params={'ids': ','.join(remote)})
+        quotes = {}
+        for asset in data.get('data', []):
+            coin_id = remote.get(asset.get('id'))
+            if coin_id is None or asset.get('priceUsd') is None:
+                continue
+            quote = {'price': float(asset['priceUsd'])}
+            for field, key in (('change_24h', 'changePercent24Hr'), ('volume_24h', 'volumeUsd24Hr'),
+                               ('market_cap', 'marketCapUsd')):
+                if asset.get(key) is not None:
+                    quote[field] = float(asset[key])
+            quotes[coin_id] = quote
+        return quotes
+
+class ExchangeRestPriceSource(PriceSource):
+    """Ticker 24 jam dari REST exchange ala Binance; koin dipetakan ke pair lewat simbolnya (crypto_icons)"""
+    name = "binance"
+
+    def __init__(self, http, symbols, base_url="https://api.binance.com", quote_asset="USDT"):
+        self.http = http
+        self.symbols = symbols
+        self.base_url = base_url.rstrip('/')
+        self.quote_asset = quote_asset
+        self.unsupported = set()
+
+    def ticker_map(self, coin_ids):
+        mapping = {}
+        for coin_id in coin_ids:
+            symbol = self.symbols.get(coin_id)
+            ticker = f"{symbol}{self.quote_asset}".upper() if symbol else None
+            if ticker and ticker not in self.unsupported:
+                mapping[ticker] = coin_id
+        return mapping
+
+    def request(self, tickers):
+        return self.http.get_json(f"{self.base_url}/api/v3/ticker/24hr",
+                                  params={'symbols': json.dumps(sorted(tickers), separators=(',', ':'))})
+
+    def fetch_batch(self, coin_ids):
+        tickers = self.ticker_map(coin_ids)
+        if not tickers:
+            return {}
+        try:
+            data = self.request(tickers)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 400:
+                raise
+            # Satu simbol ga dikenal bikin seluruh request 400: cek satu-satu sekali, yang salah di-skip seterusnya
+            data = []
+            for ticker in tickers:
+                try:
+                    data.extend(self.request([ticker]))
+                except requests.exceptions.HTTPError as single:
+                    if single.response is None or single.response.status_code != 400:
+                        raise
+                    self.unsupported.add(ticker)
+
+        quotes = {}
+        for ticker in data:
+            coin_id = tickers.get(ticker.get('symbol'))
+            if coin_id is None:
+                continue
+            quote = {'price': float(ticker['lastPrice'])}
+            if ticker.get('priceChangePercent') is not None:
+                quote['change_24h'] = float(ticker['priceChangePercent'])
+            if ticker.get('quoteVolume') is not None:
+                quote['volume_24h'] = float(ticker['quoteVolume'])
+            quotes[coin_id] = quote
+        return quotes
+
+class AggregatedPriceSource(PriceSource):
+    """Gabungan beberapa provider polling: ditanya barengan, harga per koin = median setelah buang outlier.
+
+    Tiap batch nunggu quorum provider sehat tercepat atau sampai deadline, jadi latency ekor
+    dibatasi deadline, bukan provider paling lambat. Skor health (EWMA sukses) bikin provider
+    yang error/429 otomatis dilewati, dan dicoba lagi sesekali buat cek udah pulih belum.
+    """
+    name = "aggregate"
+
+    def __init__(self, sources, deadline=3.0, quorum=2, outlier_pct=2.0, batch_size=50,
+                 min_score=0.3, probe_interval=30):
+        self.sources = list(sources)
+        self.deadline = deadline
+        self.quorum = quorum
+        self.outlier_pct = outlier_pct
+        self.batch_size = batch_size
+        self.min_score = min_score
+        self.probe_interval = probe_interval
+        self.pool = ThreadPoolExecutor(max_workers=max(4, 4 * len(self.sources)))
+        self.lock = threading.Lock()
+        self.health = {
+            source.name: {'score': 1.0, 'latency_ms': None, 'ok': 0, 'failed': 0, 'late': 0,
+                          'cooldown_until': 0, 'last_attempt': 0, 'last_error': None}
+            for source in self.sources
+        }
+        self.last_tick = {}
+
+    def get_batches(self, coin_ids):
+        size = max(1, self.batch_size)
+        return [coin_ids[i:i + size] for i in range(0, len(coin_ids), size)]
+
+    def is_healthy(self, name, now):
+        health = self.health[name]
+        if now < health['cooldown_until']:
+            return False
+        if health['score'] >= self.min_score:
+            return True
+        return now - health['last_attempt'] >= self.probe_interval
+
+    def record(self, name, elapsed_ms, error=None):
+        """Update skor health provider dari hasil satu request (dipanggil juga buat yang telat)"""
+        with self.lock:
+            health = self.health[name]
+            health['score'] = 0.7 * health['score'] + (0.3 if error is None else 0.0)
+            if error is None:
+                health['ok'] += 1
+                latency = health['latency_ms']
+                health['latency_ms'] = elapsed_ms if latency is None else 0.8 * latency + 0.2 * elapsed_ms
+                return
+            health['failed'] += 1
+            health['last_error'] = str(error)
+            response = getattr(error, 'response', None)
+            if response is not None and response.status_code == 429:
+                wait = parse_retry_after(response.headers.get('Retry-After'))
+                health['cooldown_until'] = time.time() + (wait if wait is not None else 60)
+
+    def fetch_one(self, source, coin_ids):
+        start = time.perf_counter()
+        try:
+            quotes = source.fetch_batch(coin_ids)
+        except Exception as e:
+            self.record(source.name, (time.perf_counter() - start) * 1000, e)
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.record(source.name, elapsed_ms)
+        return quotes, elapsed_ms, time.time()
+
+    def fetch_batch(self, coin_ids):
+        from concurrent.futures import wait, FIRST_COMPLETED
+        now = time.time()
+        with self.lock:
+            active = [source for source in self.sources if self.is_healthy(source.name, now)]
+            if not active:
+                active = sorted(self.sources, key=lambda source: self.health[source.name]['cooldown_until'])[:1]
+            for source in active:
+                self.health[source.name]['last_attempt'] = now
+
+        futures = {self.pool.submit(self.fetch_one, source, coin_ids): source for source in active}
+        need = min(self.quorum, len(active))
+        deadline = time.perf_counter() + self.deadline
+        results, errors = {}, []
+        pending = set(futures)
+        while pending and len(results) < need:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                source = futures[future]
+                try:
+                    results[source.name] = future.result()
+                except Exception as e:
+                    errors.append(e)
+
+        for future in pending:
+            with self.lock:
+                self.health[futures[future].name]['late'] += 1
+
+        self.last_tick = {
+            'providers': {name: round(result[1], 1) for name, result in results.items()},
+            'late': sorted(futures[f].name for f in pending),
+            'failed': len(errors)
+        }
+        if not results:
+            if errors:
+                raise errors[0]
+            raise TimeoutError(f"Semua provider lewat deadline {self.deadline:.1f}s")
+        return self.consolidate(results)
+
+    def consolidate(self, results):
+        """Median per koin, provider yang harganya nyimpang > outlier_pct dari median dibuang"""
+        by_coin = {}
+        for name, (quotes, _, received_at) in results.items():
+            for coin_id, quote in quotes.items():
+                if quote.get('price') is not None:
+                    by_coin.setdefault(coin_id, []).append((name, quote, received_at))
+
+        order = {source.name: i for i, source in enumerate(self.sources)}
+        consolidated = {}
+        for coin_id, entries in by_coin.items():
+            prices = np.array([quote['price'] for _, quote, _ in entries])
+            median = float(np.median(prices))
+            # dikali, bukan dibagi median: harga 0.0 itu valid dan ga boleh bikin bagi nol
+            keep = np.abs(prices - median) * 100 <= self.outlier_pct * abs(median)
+            if keep.sum() * 2 <= len(entries):
+                # Ga ada mayoritas yang sepakat (misal cuma 2 provider & beda jauh): percaya provider prioritas tertinggi
+                keep = np.array([order[name] == min(order[n] for n, _, _ in entries) for name, _, _ in entries])
+            accepted = [entry for entry, ok in zip(entries, keep) if ok]
+            accepted.sort(key=lambda entry: order[entry[0]])
+
+            quote = {'price': float(np.median([q['price'] for _, q, _ in accepted]))}
+            for field in ('change_24h', 'volume_24h', 'market_cap'):
+                for _, source_quote, _ in accepted:
+                    if source_quote.get(field) is not None:
+                        quote[field] = source_quote[field]
+                        break
+            quote['sources'] = [name for name, _, _ in accepted]
+            quote['rejected'] = [name for (name, _, _), ok in zip(entries, keep) if not ok]
+            quote['as_of'] = min(received_at for _, _, received_at in accepted)
+            consolidated[coin_id] = quote
+        return consolidated
+
+    def status(self):
+        """Ringkasan health tiap provider buat UI"""
+        now = time.time()
+        with self.lock:
+            return [
+                {'name': name, 'healthy': self.is_healthy(name, now), **health}
+                for name, health in self.health.items()
+            ]
+
+    def stop(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+class FxRates:
+    """Kurs dari /exchange_rates CoinGecko, disimpan relatif ke USD dan di-refresh jarang (TTL)"""
+    SYMBOLS = {'usd': '$', 'eur': '€', 'idr': 'Rp', 'btc': '₿', 'eth': 'Ξ', 'jpy': '¥', 'gbp': '£', 'sgd': 'S$'}
+
+    def __init__(self, http, base_url="https://api.coingecko.com/api/v3", ttl=600):
+        self.http = http
+        self.base_url = base_url.rstrip('/')
+        self.ttl = ttl
+        self.rates = {'usd': 1.0}
+        self.updated_at = 0
+        self.version = 0
+        self.in_flight = False
+
+    def is_stale(self):
+        return not self.in_flight and time.time() - self.updated_at >= self.ttl
+
+    def refresh(self):
+        """Ambil tabel kurs (basis BTC) lalu ubah jadi 'unit mata uang per 1 USD'"""
+        self.in_flight = True
+        try:
+            data = self.http.get_json(f"{self.base_url}/exchange_rates")
+            table = data.get('rates', {})
+            usd = table.get('usd', {}).get('value')
+            if not usd:
+                raise ValueError("Kurs USD ga ada di /exchange_rates")
+            self.load({code: info['value'] / usd for code, info in table.items() if info.get('value')})
+        finally:
+            self.in_flight = False
+
+    def load(self, rates):
+        """Pasang tabel kurs relatif USD (hasil refresh, atau kiriman daemon)"""
+        self.rates = {**rates, 'usd': 1.0}
+        self.updated_at = time.time()
+        self.version += 1
+
+    def rate(self, currency):
+        return self.rates.get(currency)
+
+    def symbol(self, currency):
+        return self.SYMBOLS.get(currency, currency.upper() + ' ')
+
+class CoinUniverse:
+    """Semua koin CoinGecko (/coins/list), di-cache di disk (TTL) + index prefix & trigram buat cari cepat"""
+    def __init__(self, http, base_url="https://api.coingecko.com/api/v3", cache_path=None, ttl=86400):
+        self.http = http
+        self.base_url = base_url.rstrip('/')
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.ids = []
+        self.symbols = []
+        self.names = []
+        self.by_id = {}
+        self.prefix_keys = []
+        self.prefix_index = []
+        self.trigrams = {}
+        self.updated_at = 0
+        self.loaded_at = None
+        self.version = 0
+        self.in_flight = False
+
+    def __contains__(self, coin_id):
+        return coin_id in self.by_id
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def ready(self):
+        return bool(self.ids)
+
+    def is_stale(self):
+        return not self.in_flight and time.time() - self.updated_at >= self.ttl
+
+    def read_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return None, 0
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+            return cached['coins'], cached['fetched_at']
+        except (OSError, ValueError, KeyError):
+            return None, 0
+
+    def write_cache(self, coins, fetched_at):
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'fetched_at': fetched_at, 'coins': coins}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.cache_path)
+
+    def refresh(self, offline=False):
+        """Pakai cache disk kalau masih fresh, kalau basi download ulang; cache basi jadi cadangan kalau API gagal.
+
+        offline=True (client daemon) cuma baca cache disk, ga pernah nembak API.
+        """
+        self.in_flight = True
+        try:
+            coins, fetched_at = self.read_cache()
+            if offline and coins is None:
+                self.updated_at = time.time() - self.ttl + 300
+                return
+            if not offline and (coins is None or time.time() - fetched_at >= self.ttl):
+                try:
+                    fresh = self.http.get_json(f"{self.base_url}/coins/list")
+                    coins = [[c['id'], c.get('symbol', ''), c.get('name', '')] for c in fresh if c.get('id')]
+                    fetched_at = time.time()
+                    if self.cache_path:
+                        self.write_cache(coins, fetched_at)
+                except Exception:
+                    if coins is None:
+                        raise
+            if fetched_at != self.loaded_at or not self.ready:
+                self.build(coins)
+                self.loaded_at = fetched_at
+            # offline: cache basi tetap dipakai, dibaca ulang 5 menit lagi siapa tau udah diperbarui daemon
+            self.updated_at = max(fetched_at, time.time() - self.ttl + 300) if offline else fetched_at
+        finally:
+            self.in_flight = False
+
+    @staticmethod
+    def trigrams_of(text):
+        text = f"  {text} "
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def build(self, coins):
+        """Bikin index: list key prefix yang di-sort (bisect) + posting list trigram (array NumPy)"""
+        ids, symbols, names = [], [], []
+        prefix = []
+        postings = {}
+        for i, (coin_id, symbol, name) in enumerate(coins):
+            symbol, lowered = symbol.lower(), name.lower()
+            ids.append(coin_id)
+            symbols.append(symbol)
+            names.append(name)
+            keys = {coin_id, symbol, lowered}
+            keys.update(lowered.split())
+            prefix.extend((key, i) for key in keys if key)
+            text = f"  {coin_id}  {symbol}  {lowered} "
+            for gram in {text[j:j + 3] for j in range(len(text) - 2)}:
+                postings.setdefault(gram, []).append(i)
+        prefix.sort()
+
+        self.ids, self.symbols, self.names = ids, symbols, names
+        self.by_id = {coin_id: i for i, coin_id in enumerate(ids)}
+        self.prefix_keys = [key for key, _ in prefix]
+        self.prefix_index = [i for _, i in prefix]
+        self.trigrams = {gram: np.array(idx, dtype=np.int32) for gram, idx in postings.items()}
+        self.version += 1
+
+    def name(self, coin_id):
+        i = self.by_id.get(coin_id)
+        return self.names[i] if i is not None else None
+
+    def symbol(self, coin_id):
+        i = self.by_id.get(coin_id)
+        return self.symbols[i] if i is not None else None
+
+    def search(self, query, limit=8, prefer=()):
+        """Saran koin buat query: exact id/symbol > prefix > mirip (trigram); return [(id, symbol, name)]"""
+        query = query.lower().strip()
+        if not query or not self.ready:
+            return []
+        scores = {}
+
+        def score(i, value):
+            if value > scores.get(i, -1):
+                scores[i] = value
+
+        start = bisect.bisect_left(self.prefix_keys, query)
+        for pos in range(start, min(start + 200, len(self.prefix_keys))):
+            key = self.prefix_keys[pos]
+            if not key.startswith(query):
+                break
+            i = self.prefix_index[pos]
+            if key == query:
+                if key == self.ids[i]:
+                    score(i, 100)
+                elif key == self.symbols[i]:
+                    score(i, 90)
+                else:
+                    score(i, 85)
+            else:
+                score(i, 70 if key in (self.ids[i], self.names[i].lower()) else 60)
+
+        grams = [g for g in self.trigrams_of(query) if g in self.trigrams]
+        if grams and len(query) >= 3:
+            hits = np.bincount(np.concatenate([self.trigrams[g] for g in grams]), minlength=len(self.ids))
+            top = np.argpartition(-hits, min(limit * 4, len(hits) - 1))[:limit * 4]
+            total = len(self.trigrams_of(query))
+            for i in top.tolist():
+                if hits[i] * 2 >= total:
+                    score(i, 50 * hits[i] / total)
+
+        prefer = set(prefer)
+        ranked = sorted(scores, key=lambda i: (-scores[i], self.ids[i] not in prefer, len(self.ids[i]), self.ids[i]))
+        return [(self.ids[i], self.symbols[i], self.names[i]) for i in ranked[:limit]]
+
+class AlertSink:
+    """Tujuan kirim alert; turunannya cukup ngisi send()"""
+    def send(self, alert):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class BellAlertSink(AlertSink):
+    """Bunyi bell terminal + satu baris ringkas di stderr"""
+    def send(self, alert):
+        sys.stderr.write(f"\a[ALERT] {alert['message']}\n")
+        sys.stderr.flush()
+
+class FileAlertSink(AlertSink):
+    """Append alert ke file NDJSON"""
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, alert):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(alert, separators=(',', ':')) + "\n")
+
+class WebhookAlertSink(AlertSink):
+    """POST alert sebagai JSON ke webhook (misal stand-in lokal)"""
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, alert):
+        self.session.post(self.url, json=alert, timeout=self.timeout).raise_for_status()
+
+    def close(self):
+        self.session.close()
+
+class AlertEngine:
+    """Rule alert dari file config, dikompilasi sekali jadi array NumPy.
+
+    Semua rule diturunkan jadi "metric(koin) op nilai":
+      threshold     -> field crypto_data (price, change_24h, volume_24h, market_cap)
+      move          -> % perubahan harga dalam N tick dari price_history
+      volume_spike  -> volume_24h / EMA volume N tick
+      cross         -> SMA cepat - SMA lambat (edge > 0 = golden cross, < 0 = death cross)
+    Alert cuma nyala di rising edge (kondisi baru jadi true) dan nunggu cooldown.
+    Kalau history_depth dikasih, rule yang butuh tick lebih banyak dari histori ditolak.
+    """
+    FIELDS = ('price', 'change_24h', 'volume_24h', 'market_cap')
+    OPS = {'>': 0, '>=': 1, '<': 2, '<=': 3, 'abs>=': 4}
+
+    def __init__(self, rules, sinks=None, default_cooldown=300, history_depth=None):
+        self.rules = []
+        self.sinks = list(sinks or [])
+        self.recent = deque(maxlen=20)
+        self.fired = 0
+        self.errors = deque(maxlen=20)
+        self.coin_rows = {}
+        self.volume_ema = {}
+        self.metrics = []
+        metric_index = {}
+
+        metric_idx, op_codes, values, cooldowns, coins = [], [], [], [], []
+        for i, raw in enumerate(rules):
+            rule = dict(raw)
+            rule.setdefault('id', f"rule-{i + 1}")
+            rule.setdefault('coin', '*')
+            metric, op, value = self.compile_rule(rule)
+            lookback = self.lookback(metric)
+            if history_depth is not None and lookback > history_depth:
+                raise ValueError(f"Rule {rule['id']}: butuh {lookback} tick histori, "
+                                 f"padahal cuma disimpan {history_depth} (--history-depth)")
+            if metric not in metric_index:
+                metric_index[metric] = len(self.metrics)
+                self.metrics.append(metric)
+            metric_idx.append(metric_index[metric])
+            op_codes.append(self.OPS[op])
+            values.append(float(value))
+            cooldowns.append(float(rule.get('cooldown', default_cooldown)))
+            coins.append(rule['coin'])
+            self.rules.append(rule)
+
+        self.history_window = max([self.lookback(m) for m in self.metrics] + [0])
+        metric_idx = np.array(metric_idx, dtype=np.int64)
+        op_codes = np.array(op_codes, dtype=np.int8)
+        values = np.array(values, dtype=np.float64)
+        cooldowns = np.array(cooldowns, dtype=np.float64)
+
+        wildcard = np.array([c == '*' for c in coins], dtype=bool)
+        self.wild_rules = np.flatnonzero(wildcard)
+        self.wild = (metric_idx[self.wild_rules], op_codes[self.wild_rules],
+                     values[self.wild_rules], cooldowns[self.wild_rules])
+        self.wild_state = np.zeros((0, len(self.wild_rules)), dtype=bool)
+        self.wild_last = np.zeros((0, len(self.wild_rules)))
+
+        self.coin_rules = {}
+        for rule_index in np.flatnonzero(~wildcard):
+            self.coin_rules.setdefault(coins[rule_index], []).append(rule_index)
+        self.coin_rules = {c: np.array(idx, dtype=np.int64) for c, idx in self.coin_rules.items()}
+        self.spec = (metric_idx, op_codes, values, cooldowns)
+        self.spec_state = np.zeros(len(self.rules), dtype=bool)
+        self.spec_last = np.zeros(len(self.rules))
+
+        self.queue = deque()
+        self.wakeup = threading.Event()
+        self.worker = None
+
+    @classmethod
+    def compile_rule(cls, rule):
+        kind = rule.get('type', 'threshold')
+        if kind == 'threshold':
+            field = rule.get('field', 'price')
+            if field not in cls.FIELDS:
+                raise ValueError(f"Rule {rule['id']}: field '{field}' ga dikenal")
+            op = rule.get('op', '>')
+            if op not in cls.OPS:
+                raise ValueError(f"Rule {rule['id']}: operator '{op}' ga dikenal")
+            return ('field', cls.FIELDS.index(field)), op, rule['value']
+        if kind == 'move':
+            ticks = int(rule.get('ticks', 10))
+            if ticks < 1:
+                raise ValueError(f"Rule {rule['id']}: ticks minimal 1")
+            pct = abs(float(rule['pct']))
+            direction = rule.get('direction', 'any')
+            op, value = {'up': ('>=', pct), 'down': ('<=', -pct), 'any': ('abs>=', pct)}[direction]
+            return ('move', ticks), op, value
+        if kind == 'volume_spike':
+            return ('volume_ratio', int(rule.get('ticks', 20))), '>=', float(rule.get('factor', 2.0))
+        if kind == 'cross':
+            fast, slow = int(rule.get('fast', 5)), int(rule.get('slow', 20))
+            if not 1 <= fast < slow:
+                raise ValueError(f"Rule {rule['id']}: harus 1 <= fast < slow")
+            op = '<' if rule.get('direction', 'up') == 'down' else '>'
+            return ('sma_diff', fast, slow), op, 0.0
+        raise ValueError(f"Rule {rule['id']}: tipe '{kind}' ga dikenal")
+
+    @staticmethod
+    def lookback(metric):
+        """Jumlah tick histori yang dibutuhin satu metric"""
+        if metric[0] == 'move':
+            return metric[1] + 1
+        if metric[0] == 'sma_diff':
+            return metric[2]
+        return 0
+
+    @classmethod
+    def from_config(cls, path, history_depth=None):
+        """Load config JSON: {"rules": [...], "sinks": [...], "cooldown": detik}"""
+        with open(path) as f:
+            config = json.load(f)
+        sinks = []
+        for sink in config.get('sinks', [{'type': 'bell'}]):
+            kind = sink.get('type')
+            if kind == 'bell':
+                sinks.append(BellAlertSink())
+            elif kind == 'file':
+                sinks.append(FileAlertSink(sink['path']))
+            elif kind == 'webhook':
+                sinks.append(WebhookAlertSink(sink['url'], sink.get('timeout', 5)))
+            else:
+                raise ValueError(f"Sink '{kind}' ga dikenal")
+        return cls(config.get('rules', []), sinks, config.get('cooldown', 300), history_depth)
+
+    def _coin_row(self, coin_id):
+        row = self.coin_rows.get(coin_id)
+        if row is None:
+            row = len(self.coin_rows)
+            self.coin_rows[coin_id] = row
+            if row >= len(self.wild_state):
+                grow = max(16, len(self.wild_state))
+                self.wild_state = np.vstack([self.wild_state, np.zeros((grow, self.wild_state.shape[1]), dtype=bool)])
+                self.wild_last = np.vstack([self.wild_last, np.zeros((grow, self.wild_last.shape[1]))])
+                for span in self.volume_ema:
+                    self.volume_ema[span] = np.concatenate([self.volume_ema[span], np.full(grow, np.nan)])
+        return row
+
+    def compute_metrics(self, coin_ids, crypto_data, price_history):
+        """Matrix metric (koin x metric) buat koin yang berubah aja"""
+        rows = np.array([self._coin_row(c) for c in coin_ids], dtype=np.int64)
+        records = [crypto_data[c] for c in coin_ids]
+        fields = np.array([[record[f] for f in self.FIELDS] for record in records], dtype=np.float64)
+        fields = fields.reshape(len(coin_ids), len(self.FIELDS))
+        result = np.full((len(coin_ids), len(self.metrics)), np.nan)
+        window = self.history_window
+        if window:
+            ids, values, valid = price_history.gather(window, coin_ids)
+            if len(ids) != len(coin_ids):
+                positions = {c: i for i, c in enumerate(coin_ids)}
+                target = [positions[c] for c in ids]
+            else:
+                target = slice(None)
+
+        for m, metric in enumerate(self.metrics):
+            kind = metric[0]
+            if kind == 'field':
+                result[:, m] = fields[:, metric[1]]
+            elif self.lookback(metric) and (not len(ids) or self.lookback(metric) > values.shape[1]):
+                continue
+            elif kind == 'move':
+                start = values[:, -(metric[1] + 1)]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    move = (values[:, -1] / start - 1) * 100
+                move[~valid[:, -(metric[1] + 1)]] = np.nan
+                result[target, m] = move
+            elif kind == 'volume_ratio':
+                span = metric[1]
+                ema = self.volume_ema.get(span)
+                if ema is None:
+                    ema = np.full(max(16, len(self.wild_state)), np.nan)
+                volume = fields[:, self.FIELDS.index('volume_24h')]
+                previous = ema[rows]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    result[:, m] = volume / previous
+                alpha = 2.0 / (span + 1)
+                ema[rows] = np.where(np.isnan(previous), volume, previous + alpha * (volume - previous))
+                self.volume_ema[span] = ema
+            elif kind == 'sma_diff':
+                fast, slow = metric[1], metric[2]
+                diff = values[:, -fast:].mean(axis=1) - values[:, -slow:].mean(axis=1)
+                diff[~valid[:, -slow]] = np.nan
+                result[target, m] = diff
+        return rows, result
+
+    @staticmethod
+    def check(ops, metric_values, thresholds):
+        with np.errstate(invalid='ignore'):
+            return np.select(
+                [ops == 0, ops == 1, ops == 2, ops == 3, ops == 4],
+                [metric_values > thresholds, metric_values >= thresholds, metric_values < thresholds,
+                 metric_values <= thresholds, np.abs(metric_values) >= thresholds],
+                default=False
+            )
+
+    def evaluate(self, coin_ids, crypto_data, price_history, now=None):
+        """Evaluasi rule cuma buat koin yang berubah; return list (ts, rule, koin, nilai) yang nyala"""
+        coin_ids = [c for c in coin_ids if c in crypto_data]
+        if not coin_ids or not self.rules:
+            return []
+        now = time.time() if now is None else now
+        rows, metrics = self.compute_metrics(coin_ids, crypto_data, price_history)
+        fired_rules, fired_pos, fired_values = [], [], []
+
+        if len(self.wild_rules):
+            metric_idx, ops, thresholds, cooldowns = self.wild
+            values = metrics[:, metric_idx]
+            cond = self.check(ops, values, thresholds)
+            edge = cond & ~self.wild_state[rows] & (now - self.wild_last[rows] >= cooldowns)
+            self.wild_state[rows] = cond
+            i, j = np.nonzero(edge)
+            if len(i):
+                self.wild_last[rows[i], j] = now
+                fired_rules.append(self.wild_rules[j])
+                fired_pos.append(i)
+                fired_values.append(values[i, j])
+
+        specific = [(i, self.coin_rules[c]) for i, c in enumerate(coin_ids) if c in self.coin_rules]
+        if specific:
+            rule_idx = np.concatenate([idx for _, idx in specific])
+            positions = np.repeat([i for i, _ in specific], [len(idx) for _, idx in specific])
+            metric_idx, ops, thresholds, cooldowns = (a[rule_idx] for a in self.spec)
+            values = metrics[positions, metric_idx]
+            cond = self.check(ops, values, thresholds)
+            edge = cond & ~self.spec_state[rule_idx] & (now - self.spec_last[rule_idx] >= cooldowns)
+            self.spec_state[rule_idx] = cond
+            if edge.any():
+                self.spec_last[rule_idx[edge]] = now
+                fired_rules.append(rule_idx[edge])
+                fired_pos.append(positions[edge])
+                fired_values.append(values[edge])
+
+        if not fired_rules:
+            return []
+        # dict + pesan alert baru dibikin di worker/pas dibaca, biar tick ga kebebanan badai alert
+        fired = [(now, r, coin_ids[i], v) for r, i, v in zip(
+            np.concatenate(fired_rules).tolist(), np.concatenate(fired_pos).tolist(),
+            np.concatenate(fired_values).tolist())]
+        self.recent.extend(fired)
+        self.dispatch(fired)
+        self.fired += len(fired)
+        return fired
+
+    def latest(self):
+        """Alert terakhir sebagai dict (atau None)"""
+        return self.make_alert(self.recent[-1]) if self.recent else None
+
+    def make_alert(self, fired):
+        now, rule_index, coin_id, value = fired
+        rule = self.rules[rule_index]
+        kind = rule.get('type', 'threshold')
+        if kind == 'threshold':
+            message = f"{coin_id} {rule.get('field', 'price')} {rule.get('op', '>')} {rule['value']} (sekarang {value:,.6g})"
+        elif kind == 'move':
+            message = f"{coin_id} gerak {value:+.2f}% dalam {rule.get('ticks', 10)} tick"
+        elif kind == 'volume_spike':
+            message = f"{coin_id} volume {value:.1f}x rata-rata"
+        else:
+            label = "death cross" if rule.get('direction', 'up') == 'down' else "golden cross"
+            message = f"{coin_id} {label} SMA{rule.get('fast', 5)}/SMA{rule.get('slow', 20)}"
+        return {
+            'ts': round(now, 3),
+            'rule': rule['id'],
+            'type': kind,
+            'coin': coin_id,
+            'value': value,
+            'message': message
+        }
+
+    def dispatch(self, fired):
+        """Antri ke worker thread biar sink lambat (webhook) ga nahan tick"""
+        if not self.sinks:
+            return
+        if self.worker is None:
+            self.worker = threading.Thread(target=self.run_worker, daemon=True)
+            self.worker.start()
+        self.queue.extend(fired)
+        self.wakeup.set()
+
+    def run_worker(self):
+        while True:
+            self.wakeup.wait()
+            self.wakeup.clear()
+            while self.queue:
+                fired = self.queue.popleft()
+                if fired is None:
+                    return
+                alert = self.make_alert(fired)
+                for sink in self.sinks:
+                    try:
+                        sink.send(alert)
+                    except Exception as e:
+                        self.errors.append(f"{type(sink).__name__}: {e}")
+
+    def close(self):
+        if self.worker is not None:
+            self.queue.append(None)
+            self.wakeup.set()
+            self.worker.join(timeout=5)
+        for sink in self.sinks:
+            sink.close()
+
+class WebSocketClient:
+    """Client WebSocket minimalis (RFC 6455) pakai stdlib, cukup buat feed ticker"""
+    GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+        self.sock = None
+        self.buffer = bytearray()
+        self.fragments = []
+
+    def connect(self):
+        parts = urlsplit(self.url)
+        secure = parts.scheme == 'wss'
+        host = parts.hostname
+        port = parts.port or (443 if secure else 80)
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+        sock = socket.create_connection((host, port), timeout=self.timeout)
+        if secure:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+
+        key = base64.b64encode(os.urandom(16)).decode()
+        handshake = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        sock.sendall(handshake.encode())
+
+        while b"\r\n\r\n" not in self.buffer:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("Handshake websocket keputus")
+            self.buffer.extend(chunk)
+        head, _, rest = bytes(self.buffer).partition(b"\r\n\r\n")
+        self.buffer = bytearray(rest)
+
+        lines = head.decode('latin-1').split("\r\n")
+        if len(lines[0].split()) < 2 or lines[0].split()[1] != '101':
+            raise ConnectionError(f"Handshake websocket ditolak: {lines[0]}")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        expected = base64.b64encode(hashlib.sha1((key + self.GUID).encode()).digest()).decode()
+        if headers.get('sec-websocket-accept') != expected:
+            raise ConnectionError("Sec-WebSocket-Accept ga cocok")
+
+        self.sock = sock
+        return self
+
+    @staticmethod
+    def _mask(payload, mask):
+        if not payload:
+            return payload
+        repeated = (mask * (len(payload) // 4 + 1))[:len(payload)]
+        return (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(len(payload), 'big')
+
+    def _send_frame(self, opcode, payload=b""):
+        header = bytearray([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header.append(0x80 | length)
+        elif length < 65536:
+            header.append(0x80 | 126)
+            header.extend(struct.pack(">H", length))
+        else:
+            header.append(0x80 | 127)
+            header.extend(struct.pack(">Q", length))
+        mask = os.urandom(4)
+        self.sock.sendall(bytes(header) + mask + self._mask(payload, mask))
+
+    def send_text(self, text):
+        self._send_frame(0x1, text.encode('utf-8'))
+
+    def _parse_frame(self):
+        buf = self.buffer
+        if len(buf) < 2:
+            return None
+        length = buf[1] & 0x7f
+        pos = 2
+        if length == 126:
+            if len(buf) < 4:
+                return None
+            length = struct.unpack(">H", buf[2:4])[0]
+            pos = 4
+        elif length == 127:
+            if len(buf) < 10:
+                return None
+            length = struct.unpack(">Q", buf[2:10])[0]
+            pos = 10
+        mask = None
+        if buf[1] & 0x80:
+            if len(buf) < pos + 4:
+                return None
+            mask = bytes(buf[pos:pos + 4])
+            pos += 4
+        if len(buf) < pos + length:
+            return None
+
+        fin = bool(buf[0] & 0x80)
+        opcode = buf[0] & 0x0f
+        payload = bytes(buf[pos:pos + length])
+        del buf[:pos + length]
+        if mask:
+            payload = self._mask(payload, mask)
+        return fin, opcode, payload
+
+    def recv(self, timeout=None):
+        """Tunggu satu pesan text/binary; socket.timeout kalau belum ada apa-apa"""
+        self.sock.settimeout(timeout)
+        while True:
+            frame = self._parse_frame()
+            if frame is None:
+                chunk = self.sock.recv(65536)
+                if not chunk:
+                    raise ConnectionError("Websocket ditutup server")
+                self.buffer.extend(chunk)
+                continue
+
+            fin, opcode, payload = frame
+            if opcode == 0x8:
+                try:
+                    self._send_frame(0x8, payload[:2])
+                except OSError:
+                    pass
+                raise ConnectionError("Websocket ditutup server")
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+
+            self.fragments.append(payload)
+            if not fin:
+                continue
+            message = b"".join(self.fragments)
+            self.fragments = []
+            return message.decode('utf-8', errors='replace')
+
+    def close(self):
+        if self.sock is None:
+            return
+        try:
+            self._send_frame(0x8, struct.pack(">H", 1000))
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+        self.sock = None
+
+class BinanceStreamSource(PriceSource):
+    """Streaming miniTicker ala Binance; crypto_icons dipakai buat mapping koin -> ticker"""
+    name = "binance-stream"
+    streaming = True
+
+    def __init__(self, get_coins, symbols, base_url="wss://stream.binance.com:9443",
+                 quote_asset="USDT", stale_after=30):
+        self.get_coins = get_coins
+        self.symbols = symbols
+        self.base_url = base_url.rstrip('/')
+        self.quote_asset = quote_asset
+        self.stale_after = stale_after
+        self.on_quotes = None
+        self.connected = False
+        self.last_error = None
+        self.last_seen = {}
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def ticker_map(self):
+        """Mapping ticker exchange (BTCUSDT) -> coin id CoinGecko (bitcoin)"""
+        mapping = {}
+        for coin_id in self.get_coins():
+            symbol = self.symbols.get(coin_id)
+            if symbol:
+                mapping[f"{symbol}{self.quote_asset}".upper()] = coin_id
+        return mapping
+
+    def stream_url(self, tickers):
+        streams = '/'.join(f"{ticker.lower()}@miniTicker" for ticker in sorted(tickers))
+        return f"{self.base_url}/stream?streams={streams}"
+
+    def parse_message(self, message, tickers):
+        payload = json.loads(message)
+        if isinstance(payload, dict) and 'data' in payload:
+            payload = payload['data']
+        events = payload if isinstance(payload, list) else [payload]
+
+        quotes = {}
+        for event in events:
+            coin_id = tickers.get(str(event.get('s', '')).upper())
+            if coin_id is None:
+                continue
+            close = float(event['c'])
+            open_price = float(event.get('o') or 0)
+            quote = {'price': close}
+            if open_price:
+                quote['change_24h'] = (close - open_price) / open_price * 100
+            if 'q' in event:
+                quote['volume_24h'] = float(event['q'])
+            quotes[coin_id] = quote
+        return quotes
+
+    def start(self, on_quotes):
+        self.on_quotes = on_quotes
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def covered_coins(self):
+        if not self.connected:
+            return set()
+        now = time.time()
+        return {coin_id for coin_id, seen in list(self.last_seen.items()) if now - seen <= self.stale_after}
+
+    def run(self):
+        """Loop koneksi: subscribe ulang kalau watchlist berubah, reconnect pakai backoff"""
+        delay = 1
+        while not self.stop_event.is_set():
+            tickers = self.ticker_map()
+            if not tickers:
+                self.stop_event.wait(1)
+                continue
+
+            client = WebSocketClient(self.stream_url(tickers))
+            resubscribe = False
+            try:
+                client.connect()
+                self.connected = True
+                self.last_error = None
+                delay = 1
+                while not self.stop_event.is_set():
+                    if self.ticker_map() != tickers:
+                        resubscribe = True
+                        break
+                    try:
+                        message = client.recv(timeout=1)
+                    except socket.timeout:
+                        continue
+                    quotes = self.parse_message(message, tickers)
+                    if quotes:
+                        now = time.time()
+                        for coin_id in quotes:
+                            self.last_seen[coin_id] = now
+                        self.on_quotes(quotes)
+            except (OSError, ConnectionError, ValueError) as e:
+                self.last_error = str(e)
+            finally:
+                self.connected = False
+                self.last_seen.clear()
+                client.close()
+
+            if not resubscribe:
+                self.stop_event.wait(delay)
+                delay = min(30, delay * 2)
+
+class ReplaySource(PriceSource):
+    """Sumber streaming buat replay & simulasi: tick dari rekaman NDJSON (output --headless) atau random walk.
+
+    Tick dikirim lewat on_quotes yang sama kayak stream live, jadi alert, candle & render kena
+    jalur update yang persis sama. Jam replay jalan `speed` kali jam dinding (0 = secepat
+    mungkin), jadi sekalian jadi load generator.
+    """
+    name = "replay"
+    streaming = True
+    FIELDS = ('price', 'change_24h', 'volume_24h', 'market_cap')
+
+    def __init__(self, coins, ticks, speed=1.0, label="replay", names=None, icons=None):
+        self.coins = list(coins)
+        self.names = names or {}
+        self.icons = icons or {}
+        self.ticks = ticks
+        self.speed = speed
+        self.label = label
+        self.on_quotes = None
+        self.connected = False
+        self.finished = False
+        self.sim_time = None
+        self.emitted_ticks = 0
+        self.emitted_quotes = 0
+        self.started_at = None
+        self.elapsed = 0.0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @classmethod
+    def from_ndjson(cls, path, speed=1.0):
+        """Load rekaman sekali jadi kolom NumPy (parse JSON ga ikut keukur pas replay); ts sama = satu tick"""
+        codes, coins, names, icons = {}, [], {}, {}
+        ts, rows, columns = [], [], {field: [] for field in cls.FIELDS}
+        with open(path) as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                    stamp = float(row['ts'])
+                    coin_id = row['coin']
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if coin_id not in codes:
+                    codes[coin_id] = len(coins)
+                    coins.append(coin_id)
+                    if row.get('name'):
+                        names[coin_id] = row['name']
+                    if row.get('icon'):
+                        icons[coin_id] = row['icon']
+                ts.append(stamp)
+                rows.append(codes[coin_id])
+                for field, values in columns.items():
+                    value = row.get(field)
+                    values.append(float(value) if isinstance(value, (int, float)) else np.nan)
+        if not ts:
+            raise ValueError(f"Ga ada tick yang kebaca di {path}")
+        ts = np.array(ts)
+        order = np.argsort(ts, kind='stable')
+        columns = {field: np.array(values)[order] for field, values in columns.items()}
+        ticks = cls.recorded_ticks(coins, ts[order], np.array(rows)[order], columns)
+        return cls(coins, ticks, speed, label=os.path.basename(path), names=names, icons=icons)
+
+    @classmethod
+    def recorded_ticks(cls, coins, ts, rows, columns):
+        bounds = (np.flatnonzero(np.diff(ts)) + 1).tolist()
+        for start, end in zip([0] + bounds, bounds + [len(ts)]):
+            fields = [(field, columns[field][start:end].tolist()) for field in cls.FIELDS]
+            quotes = {}
+            for i, row in enumerate(rows[start:end].tolist()):
+                quotes[coins[row]] = {field: values[i] for field, values in fields if values[i] == values[i]}
+            yield float(ts[start]), quotes
+
+    @classmethod
+    def synthetic(cls, coins, volatility=0.5, seed=0, interval=1.0, steps=None, speed=1.0, start=None):
+        """Random walk geometris: tiap tick semua koin gerak ~N(0, volatility%), hasilnya sama buat seed yang sama"""
+        rng = np.random.default_rng(seed)
+        size = len(coins)
+        price = np.exp(rng.uniform(np.log(0.01), np.log(50000), size))
+        supply = np.exp(rng.uniform(np.log(1e7), np.log(1e11), size))
+        ticks = cls.random_walk(list(coins), price, supply, rng, volatility / 100, interval, steps,
+                                time.time() if start is None else start)
+        return cls(coins, ticks, speed, label=f"simulasi seed {seed}",
+                   names={c: f"Sim {i}" for i, c in enumerate(coins) if c.startswith('sim-')},
+                   icons={c: f"S{i}" for i, c in enumerate(coins) if c.startswith('sim-')})
+
+    @staticmethod
+    def random_walk(coins, price, supply, rng, sigma, interval, steps, ts):
+        day_open = price.copy()
+        day_start = ts
+        turnover = rng.uniform(0.01, 0.2, len(coins)) * price * supply
+        volume = np.zeros(len(coins))
+        step = 0
+        while steps is None or step < steps:
+            if ts - day_start >= 86400:
+                day_open, day_start, volume = price.copy(), ts, np.zeros(len(coins))
+            price = price * np.exp(rng.normal(-0.5 * sigma * sigma, sigma, len(coins)))
+            volume += turnover * interval / 86400 * rng.uniform(0.5, 1.5, len(coins))
+            change = (price / day_open - 1) * 100
+            market_cap = price * supply
+            yield ts, {
+                coin_id: {'price': p, 'change_24h': c, 'volume_24h': v, 'market_cap': m}
+                for coin_id, p, c, v, m in zip(coins, price.tolist(), change.tolist(),
+                                                volume.tolist(), market_cap.tolist())
+            }
+            ts += interval
+            step += 1
+
+    def start(self, on_quotes):
+        self.on_quotes = on_quotes
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def covered_coins(self):
+        return set(self.coins)
+
+    def clock(self):
+        """Jam replay: ts tick terakhir yang dikirim (candle & indikator ikut jam ini, bukan jam dinding)"""
+        return self.sim_time if self.sim_time is not None else time.time()
+
+    def run(self):
+        """Kirim tick sesuai jadwal ts-nya dibagi speed; speed 0 = ga pernah nunggu"""
+        self.connected = True
+        self.started_at = time.perf_counter()
+        first_ts = None
+        try:
+            for ts, quotes in self.ticks:
+                if first_ts is None:
+                    first_ts = ts
+                if self.speed:
+                    delay = self.started_at + (ts - first_ts) / self.speed - time.perf_counter()
+                    if delay > 0 and self.stop_event.wait(delay):
+                        break
+                if self.stop_event.is_set():
+                    break
+                self.sim_time = ts
+                self.on_quotes(quotes)
+                self.emitted_ticks += 1
+                self.emitted_quotes += len(quotes)
+                self.elapsed = time.perf_counter() - self.started_at
+        finally:
+            self.elapsed = time.perf_counter() - self.started_at
+            self.finished = True
+
+    def stats(self):
+        elapsed = self.elapsed or 1e-9
+        return {
+            'ticks': self.emitted_ticks,
+            'quotes': self.emitted_quotes,
+            'elapsed_s': self.elapsed,
+            'ticks_per_s': self.emitted_ticks / elapsed,
+            'quotes_per_s': self.emitted_quotes / elapsed
+        }
+
+def grow_rows(old, max_rows=None):
+    """Jumlah baris baru buat store per koin: dobel, tapi ga pernah lewat max_rows (budget memori)"""
+    new = old * 2 if max_rows is None else min(old * 2, max_rows)
+    if new <= old:
+        raise MemoryError(f"Slot koin udah penuh ({old} baris, maks {max_rows})")
+    return new
+
+class CoinRecordStore(MutableMapping):
+    """Record crypto_data dalam slot kolom NumPy (baris = koin), bukan satu dict per koin.
+
+    Nama, ikon & daftar sumber di-intern jadi kode int32, jadi ribuan koin cuma nyimpen
+    satu string per nama. Baca per koin tetap dapet dict biasa (dibikin pas diminta),
+    `column()` buat baca satu field banyak koin sekaligus. Slot koin yang dibuang dipakai
+    ulang, dan `touched` (waktu terakhir ditulis) dipakai buat urutan LRU/TTL.
+    """
+    NUMERIC = ('price', 'change_24h', 'volume_24h', 'market_cap', 'updated_at')
+    INTERNED = ('name', 'icon', 'sources')
+
+    def __init__(self, capacity=32, max_rows=None):
+        self.max_rows = max_rows
+        self.numeric = {field: np.zeros(capacity) for field in self.NUMERIC}
+        self.codes = {field: np.zeros(capacity, dtype=np.int32) for field in self.INTERNED}
+        self.touched = np.zeros(capacity)
+        self.rows = {}
+        self.free_rows = list(range(capacity - 1, -1, -1))
+        self.interned = []
+        self.intern_codes = {}
+
+    def _grow(self):
+        old = len(self.touched)
+        new = grow_rows(old, self.max_rows)
+        for field in self.NUMERIC:
+            self.numeric[field] = np.concatenate([self.numeric[field], np.zeros(new - old)])
+        for field in self.INTERNED:
+            self.codes[field] = np.concatenate([self.codes[field], np.zeros(new - old, dtype=np.int32)])
+        self.touched = np.concatenate([self.touched, np.zeros(new - old)])
+        self.free_rows.extend(range(new - 1, old - 1, -1))
+
+    def intern(self, value):
+        code = self.intern_codes.get(value)
+        if code is None:
+            code = self.intern_codes[value] = len(self.interned)
+            self.interned.append(value)
+        return code
+
+    def compact_interned(self):
+        """Buang string intern yang udah ga dipakai koin mana pun (koin sering keluar-masuk)"""
+        used = sorted({int(code) for field in self.INTERNED for code in self.codes[field][list(self.rows.values())]})
+        remap = np.zeros(len(self.interned), dtype=np.int32)
+        remap[used] = np.arange(len(used), dtype=np.int32)
+        self.interned = [self.interned[code] for code in used]
+        self.intern_codes = {value: code for code, value in enumerate(self.interned)}
+        for field in self.INTERNED:
+            self.codes[field] = remap[self.codes[field]]
+
+    def rows_for(self, coin_ids):
+        """Slot tiap koin, koin baru langsung dikasih slot (kosong = semua field 0)"""
+        rows = []
+        for coin_id in coin_ids:
+            row = self.rows.get(coin_id)
+            if row is None:
+                if not self.free_rows:
+                    self._grow()
+                row = self.free_rows.pop()
+                self.rows[coin_id] = row
+            rows.append(row)
+        return np.array(rows, dtype=np.int64)
+
+    def read(self, rows):
+        return {field: self.numeric[field][rows].tolist() for field in self.NUMERIC}
+
+    def write(self, rows, columns, sources):
+        """Tulis satu batch: kolom numerik langsung per array, daftar sumber di-intern"""
+        for field, values in columns.items():
+            self.numeric[field][rows] = values
+        codes, seen = [], {}
+        for value in sources:
+            code = seen.get(id(value))
+            if code is None:
+                code = seen[id(value)] = self.intern(tuple(value))
+            codes.append(code)
+        self.codes['sources'][rows] = codes
+        self.touched[rows] = time.time()
+
+    def set_labels(self, coin_id, name, icon):
+        """Ganti nama/ikon satu koin, return True kalau ada yang berubah"""
+        row = self.rows[coin_id]
+        name_code, icon_code = self.intern(name), self.intern(icon)
+        if self.codes['name'][row] == name_code and self.codes['icon'][row] == icon_code:
+            return False
+        self.codes['name'][row] = name_code
+        self.codes['icon'][row] = icon_code
+        return True
+
+    def __setitem__(self, coin_id, record):
+        rows = self.rows_for([coin_id])
+        self.write(rows, {field: [record.get(field) or 0] for field in self.NUMERIC}, [record.get('sources') or ()])
+        self.set_labels(coin_id, record.get('name') or coin_id, record.get('icon') or '')
+
+    def __getitem__(self, coin_id):
+        row = self.rows[coin_id]
+        interned, codes = self.interned, self.codes
+        record = {field: self.numeric[field][row].item() for field in self.NUMERIC}
+        record['name'] = interned[codes['name'][row]]
+        record['icon'] = interned[codes['icon'][row]]
+        record['sources'] = list(interned[codes['sources'][row]])
+        return record
+
+    def __delitem__(self, coin_id):
+        row = self.rows.pop(coin_id)
+        for field in self.NUMERIC:
+            self.numeric[field][row] = 0
+        for field in self.INTERNED:
+            self.codes[field][row] = 0
+        self.touched[row] = 0
+        self.free_rows.append(row)
+        if len(self.interned) > 3 * len(self.rows) + 64:
+            self.compact_interned()
+
+    def __contains__(self, coin_id):
+        return coin_id in self.rows
+
+    def __iter__(self):
+        return iter(list(self.rows))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def column(self, field, coin_ids=None):
+        """Satu field numerik buat banyak koin sekaligus (default: semua, urut iterasi store)"""
+        rows = [self.rows[c] for c in (self.rows if coin_ids is None else coin_ids)]
+        return self.numeric[field][rows]
+
+    def last_touched(self, coin_id):
+        row = self.rows.get(coin_id)
+        return None if row is None else float(self.touched[row])
+
+    def nbytes(self):
+        """Perkiraan memori: kolom NumPy + string/tuple intern + index koin"""
+        arrays = sum(a.nbytes for a in self.numeric.values()) + sum(a.nbytes for a in self.codes.values())
+        strings = sum(sys.getsizeof(value) for value in self.interned)
+        return arrays + self.touched.nbytes + strings + sys.getsizeof(self.rows) + sys.getsizeof(self.intern_codes)
+
+    def row_nbytes(self):
+        return 8 * len(self.NUMERIC) + 4 * len(self.INTERNED) + 8
+
+class PriceHistoryStore:
+    """Histori harga: ring buffer float64 2-D (baris = koin, kolom = tick).
+
+    Buffer dialokasi sekali, append O(1) tanpa pop(0), dan statistik rolling
+    (min/max, return, EMA, volatilitas) dihitung sekaligus buat semua koin.
+    """
+    def __init__(self, depth=512, capacity=32, ema_span=10, max_rows=None):
+        self.depth = max(2, int(depth))
+        self.max_rows = max_rows
+        self.alpha = 2.0 / (ema_span + 1)
+        self.prices = np.full((capacity, self.depth), np.nan)
+        self.positions = np.zeros(capacity, dtype=np.int64)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.ema = np.full(capacity, np.nan)
+        self.rows = {}
+        self.free_rows = list(range(capacity - 1, -1, -1))
+        self.version = 0
+
+    def _grow(self):
+        old = len(self.positions)
+        new = grow_rows(old, self.max_rows)
+        prices = np.full((new, self.depth), np.nan)
+        prices[:old] = self.prices
+        self.prices = prices
+        self.positions = np.concatenate([self.positions, np.zeros(new - old, dtype=np.int64)])
+        self.counts = np.concatenate([self.counts, np.zeros(new - old, dtype=np.int64)])
+        self.ema = np.concatenate([self.ema, np.full(new - old, np.nan)])
+        self.free_rows.extend(range(new - 1, old - 1, -1))
+
+    def row_for(self, coin_id):
+        row = self.rows.get(coin_id)
+        if row is None:
+            if not self.free_rows:
+                self._grow()
+            row = self.free_rows.pop()
+            self.rows[coin_id] = row
+        return row
+
+    def append(self, coin_id, price):
+        row = self.row_for(coin_id)
+        self.prices[row, self.positions[row]] = price
+        self.positions[row] = (self.positions[row] + 1) % self.depth
+        self.counts[row] = min(self.counts[row] + 1, self.depth)
+        ema = self.ema[row]
+        self.ema[row] = price if np.isnan(ema) else ema + self.alpha * (price - ema)
+        self.version += 1
+
+    def extend(self, coin_id, values):
+        """Tambah banyak harga sekaligus (urut lama -> baru), dipakai buat warm start"""
+        values = np.asarray(values, dtype=np.float64)[-self.depth:]
+        if not len(values):
+            return
+        row = self.row_for(coin_id)
+        idx = (self.positions[row] + np.arange(len(values))) % self.depth
+        self.prices[row, idx] = values
+        self.positions[row] = (self.positions[row] + len(values)) % self.depth
+        self.counts[row] = min(self.counts[row] + len(values), self.depth)
+        ema = self.ema[row]
+        for value in values:
+            ema = value if np.isnan(ema) else ema + self.alpha * (value - ema)
+        self.ema[row] = ema
+        self.version += 1
+
+    def __delitem__(self, coin_id):
+        row = self.rows.pop(coin_id)
+        self.prices[row] = np.nan
+        self.positions[row] = 0
+        self.counts[row] = 0
+        self.ema[row] = np.nan
+        self.free_rows.append(row)
+        self.version += 1
+
+    def __contains__(self, coin_id):
+        return coin_id in self.rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def nbytes(self):
+        return self.prices.nbytes + self.positions.nbytes + self.counts.nbytes + self.ema.nbytes
+
+    def row_nbytes(self):
+        return 8 * self.depth + 24
+
+    def __iter__(self):
+        return iter(list(self.rows))
+
+    def __getitem__(self, coin_id):
+        return self.window(coin_id, self.depth)
+
+    def count(self, coin_id):
+        row = self.rows.get(coin_id)
+        return 0 if row is None else int(self.counts[row])
+
+    def window(self, coin_id, n):
+        """n harga terakhir satu koin, urut dari yang paling lama"""
+        row = self.rows.get(coin_id)
+        if row is None:
+            return np.empty(0)
+        n = min(n, int(self.counts[row]))
+        idx = (self.positions[row] - n + np.arange(n)) % self.depth
+        return self.prices[row, idx]
+
+    def gather(self, n, coin_ids=None):
+        """Window n tick terakhir semua koin (atau coin_ids aja) sekaligus: (coin_ids, matrix, mask valid)"""
+        coin_ids = list(self.rows) if coin_ids is None else [c for c in coin_ids if c in self.rows]
+        n = max(1, min(n, self.depth))
+        if not coin_ids:
+            return coin_ids, np.empty((0, n)), np.zeros((0, n), dtype=bool)
+        rows = np.fromiter((self.rows[c] for c in coin_ids), dtype=np.int64, count=len(coin_ids))
+        offsets = np.arange(n)
+        idx = (self.positions[rows, None] - n + offsets) % self.depth
+        values = self.prices[rows[:, None], idx]
+        valid = offsets >= (n - np.minimum(self.counts[rows], n))[:, None]
+        return coin_ids, values, valid
+
+    def rolling_min_max(self, n):
+        coin_ids, values, valid = self.gather(n)
+        mins = np.where(valid, values, np.inf).min(axis=1) if len(coin_ids) else np.empty(0)
+        maxs = np.where(valid, values, -np.inf).max(axis=1) if len(coin_ids) else np.empty(0)
+        return coin_ids, mins, maxs
+
+    def returns(self, n=1):
+        """Return (%) dari n tick lalu ke tick terakhir; NaN kalau histori belum cukup"""
+        coin_ids, values, valid = self.gather(n + 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = (values[:, -1] / values[:, 0] - 1) * 100 if len(coin_ids) else np.empty(0)
+        if len(coin_ids):
+            result[~valid[:, 0]] = np.nan
+        return coin_ids, result
+
+    def latest(self):
+        """Harga terakhir semua koin: (coin_ids, array)"""
+        coin_ids = list(self.rows)
+        rows = np.fromiter((self.rows[c] for c in coin_ids), dtype=np.int64, count=len(coin_ids))
+        return coin_ids, self.prices[rows, (self.positions[rows] - 1) % self.depth]
+
+    def ema_values(self):
+        coin_ids = list(self.rows)
+        rows = np.fromiter((self.rows[c] for c in coin_ids), dtype=np.int64, count=len(coin_ids))
+        return coin_ids, self.ema[rows]
+
+    def volatility(self, n=20, coin_ids=None):
+        """Standar deviasi log-return (%) di n tick terakhir"""
+        coin_ids, values, valid = self.gather(n, coin_ids)
+        if not coin_ids:
+            return coin_ids, np.empty(0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_returns = np.diff(np.log(values), axis=1)
+            pair_valid = valid[:, 1:] & valid[:, :-1]
+            counts = pair_valid.sum(axis=1)
+            filled = np.where(pair_valid, log_returns, 0.0)
+            mean = filled.sum(axis=1) / counts
+            var = np.where(pair_valid, (log_returns - mean[:, None]) ** 2, 0.0).sum(axis=1) / counts
+        result = np.sqrt(var) * 100
+        result[counts < 2] = np.nan
+        return coin_ids, result
+
+    def correlation(self, n=60, coin_ids=None):
+        """Matrix korelasi log-return antar koin di n tick terakhir (koin yang histori-nya penuh aja)"""
+        coin_ids, values, valid = self.gather(n + 1, coin_ids)
+        full = valid.all(axis=1) if len(coin_ids) else np.zeros(0, dtype=bool)
+        coin_ids = [c for c, ok in zip(coin_ids, full) if ok]
+        if len(coin_ids) < 2:
+            return coin_ids, np.empty((len(coin_ids), len(coin_ids)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_returns = np.diff(np.log(values[full]), axis=1)
+            matrix = np.corrcoef(log_returns)
+        return coin_ids, np.nan_to_num(matrix)
+
+    def sparkline_levels(self, n, levels, coin_ids=None):
+        """Level sparkline (0..levels-1) n tick terakhir buat koin yang histori-nya penuh"""
+        coin_ids, values, valid = self.gather(n, coin_ids)
+        if not coin_ids:
+            return {}, set()
+        full = valid.all(axis=1)
+        mins = values.min(axis=1, initial=np.inf, where=valid)
+        maxs = values.max(axis=1, initial=-np.inf, where=valid)
+        spread = maxs - mins
+        flat = full & (spread == 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            normalized = (values - mins[:, None]) / spread[:, None]
+        idx = (np.nan_to_num(normalized) * (levels - 1)).astype(np.int64)
+        result = {}
+        for i in np.flatnonzero(full & ~flat):
+            result[coin_ids[i]] = idx[i]
+        return result, {coin_ids[i] for i in np.flatnonzero(flat)}
+
+class IndicatorEngine:
+    """RSI, MACD, Bollinger & VWAP per koin, di-update incremental tiap tick.
+
+    State tiap indikator disimpan per baris koin (kayak PriceHistoryStore): rata-rata
+    Wilder buat RSI, tiga EMA buat MACD, ring kecil + running sum buat Bollinger, dan
+    akumulator sesi harian buat VWAP. Satu batch tick = beberapa operasi vektor O(1)
+    per koin, ga ada window yang dihitung ulang dari nol.
+    """
+    STATE = {
+        'ticks': 0.0, 'last': float('nan'), 'avg_gain': 0.0, 'avg_loss': 0.0,
+        'ema_fast': float('nan'), 'ema_slow': float('nan'),
+        'signal': float('nan'), 'bb_sum': 0.0, 'bb_sumsq': 0.0, 'bb_pos': 0.0,
+        'vwap_day': -1.0, 'vwap_pv': 0.0, 'vwap_volume': 0.0, 'vwap_price': 0.0,
+        'vwap_count': 0.0, 'last_volume': float('nan')
+    }
+
+    def __init__(self, capacity=32, rsi_period=14, macd_fast=12, macd_slow=26, macd_signal=9,
+                 bb_period=20, bb_width=2.0, max_rows=None):
+        self.max_rows = max_rows
+        self.rsi_period = rsi_period
+        self.macd_slow = macd_slow
+        self.alpha_fast = 2.0 / (macd_fast + 1)
+        self.alpha_slow = 2.0 / (macd_slow + 1)
+        self.alpha_signal = 2.0 / (macd_signal + 1)
+        self.bb_period = bb_period
+        self.bb_width = bb_width
+        self.state = {name: np.full(capacity, value) for name, value in self.STATE.items()}
+        self.ring = np.zeros((capacity, bb_period))
+        self.rows = {}
+        self.free_rows = list(range(capacity - 1, -1, -1))
+        self.version = 0
+
+    def _grow(self):
+        old = len(self.ring)
+        new = grow_rows(old, self.max_rows)
+        for name, value in self.STATE.items():
+            self.state[name] = np.concatenate([self.state[name], np.full(new - old, value)])
+        self.ring = np.concatenate([self.ring, np.zeros((new - old, self.bb_period))])
+        self.free_rows.extend(range(new - 1, old - 1, -1))
+
+    def row_for(self, coin_id):
+        row = self.rows.get(coin_id)
+        if row is None:
+            if not self.free_rows:
+                self._grow()
+            row = self.free_rows.pop()
+            self.rows[coin_id] = row
+        return row
+
+    def __contains__(self, coin_id):
+        return coin_id in self.rows
+
+    def nbytes(self):
+        return sum(values.nbytes for values in self.state.values()) + self.ring.nbytes
+
+    def row_nbytes(self):
+        return 8 * (len(self.STATE) + self.bb_period)
+
+    def __delitem__(self, coin_id):
+        row = self.rows.pop(coin_id)
+        for name, value in self.STATE.items():
+            self.state[name][row] = value
+        self.ring[row] = 0.0
+        self.free_rows.append(row)
+        self.version += 1
+
+    def update(self, coin_ids, prices, volumes=None, ts=None):
+        """Masukin satu batch tick (satu harga per koin)"""
+        if not len(coin_ids):
+            return
+        rows = np.fromiter((self.row_for(c) for c in coin_ids), dtype=np.int64, count=len(coin_ids))
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.full(len(rows), np.nan) if volumes is None else np.asarray(volumes, dtype=np.float64)
+        self.update_rows(rows, prices, volumes, time.time() if ts is None else ts)
+
+    def update_rows(self, rows, prices, volumes, ts):
+        s = self.state
+        last = s['last'][rows]
+        has_last = ~np.isnan(last)
+        ticks = s['ticks'][rows] + has_last
+        s['ticks'][rows] = ticks
+
+        # RSI Wilder: rata-rata biasa sampai `period` delta, habis itu smoothing 1/period
+        delta = np.where(has_last, prices - last, 0.0)
+        weight = np.where(has_last, 1.0 / np.clip(ticks, 1, self.rsi_period), 0.0)
+        s['avg_gain'][rows] += weight * (np.maximum(delta, 0.0) - s['avg_gain'][rows])
+        s['avg_loss'][rows] += weight * (np.maximum(-delta, 0.0) - s['avg_loss'][rows])
+        s['last'][rows] = prices
+
+        # MACD = EMA cepat - EMA lambat, signal = EMA dari MACD
+        for name, alpha in (('ema_fast', self.alpha_fast), ('ema_slow', self.alpha_slow)):
+            ema = s[name][rows]
+            s[name][rows] = np.where(np.isnan(ema), prices, ema + alpha * (prices - ema))
+        macd = s['ema_fast'][rows] - s['ema_slow'][rows]
+        signal = s['signal'][rows]
+        s['signal'][rows] = np.where(np.isnan(signal), macd, signal + self.alpha_signal * (macd - signal))
+
+        # Bollinger: harga yang keluar window diambil dari ring, sum dihitung ulang tiap ring muter
+        pos = s['bb_pos'][rows].astype(np.int64)
+        old = self.ring[rows, pos]
+        self.ring[rows, pos] = prices
+        s['bb_sum'][rows] += prices - old
+        s['bb_sumsq'][rows] += prices * prices - old * old
+        pos = (pos + 1) % self.bb_period
+        s['bb_pos'][rows] = pos
+        wrapped = rows[pos == 0]
+        if len(wrapped):
+            s['bb_sum'][wrapped] = self.ring[wrapped].sum(axis=1)
+            s['bb_sumsq'][wrapped] = (self.ring[wrapped] ** 2).sum(axis=1)
+
+        # VWAP sesi harian (UTC); volume per tick ditaksir dari kenaikan volume rolling 24 jam
+        day = float(ts // 86400)
+        reset = s['vwap_day'][rows] != day
+        if reset.any():
+            r = rows[reset]
+            for name in ('vwap_pv', 'vwap_volume', 'vwap_price', 'vwap_count'):
+                s[name][r] = 0.0
+            s['vwap_day'][r] = day
+        tick_volume = np.nan_to_num(np.maximum(volumes - s['last_volume'][rows], 0.0))
+        s['last_volume'][rows] = volumes
+        s['vwap_pv'][rows] += prices * tick_volume
+        s['vwap_volume'][rows] += tick_volume
+        s['vwap_price'][rows] += prices
+        s['vwap_count'][rows] += 1
+        self.version += 1
+
+    def warm(self, coin_ids, values, valid, ts=None):
+        """Isi state dari matrix histori (hasil PriceHistoryStore.gather), satu kolom = satu langkah vektor"""
+        if not len(coin_ids):
+            return
+        rows = np.fromiter((self.row_for(c) for c in coin_ids), dtype=np.int64, count=len(coin_ids))
+        ts = time.time() if ts is None else ts
+        for column in range(values.shape[1]):
+            mask = valid[:, column]
+            if mask.any():
+                self.update_rows(rows[mask], values[mask, column], np.full(int(mask.sum()), np.nan), ts)
+
+    def values(self, coin_ids=None):
+        """Indikator terkini: (coin_ids, dict nama -> array); NaN kalau tick-nya belum cukup"""
+        coin_ids = list(self.rows) if coin_ids is None else [c for c in coin_ids if c in self.rows]
+        rows = np.fromiter((self.rows[c] for c in coin_ids), dtype=np.int64, count=len(coin_ids))
+        s = self.state
+        ticks, last = s['ticks'][rows], s['last'][rows]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gain, loss = s['avg_gain'][rows], s['avg_loss'][rows]
+            rsi = np.where(loss > 0, 100 - 100 / (1 + gain / loss), np.where(gain > 0, 100.0, 50.0))
+            rsi[ticks < self.rsi_period] = np.nan
+
+            macd = s['ema_fast'][rows] - s['ema_slow'][rows]
+            signal = s['signal'][rows]
+            warm_macd = ticks + 1 >= self.macd_slow
+            macd[~warm_macd] = np.nan
+            signal = np.where(warm_macd, signal, np.nan)
+
+            mean = s['bb_sum'][rows] / self.bb_period
+            std = np.sqrt(np.maximum(s['bb_sumsq'][rows] / self.bb_period - mean * mean, 0.0))
+            full = ticks + 1 >= self.bb_period
+            mean[~full] = np.nan
+            upper, lower = mean + self.bb_width * std, mean - self.bb_width * std
+            percent_b = np.where(upper > lower, (last - lower) / (upper - lower), 0.5)
+            percent_b[~full] = np.nan
+
+            volume = s['vwap_volume'][rows]
+            vwap = np.where(volume > 0, s['vwap_pv'][rows] / volume, s['vwap_price'][rows] / s['vwap_count'][rows])
+        return coin_ids, {
+            'price': last, 'rsi': rsi, 'macd': macd, 'signal': signal, 'histogram': macd - signal,
+            'bb_mid': mean, 'bb_upper': upper, 'bb_lower': lower, 'percent_b': percent_b, 'vwap': vwap
+        }
+
+class CandleStore:
+    """Candle OHLCV multi-resolusi (1m, 5m, 1h, 1d) per koin, di-roll-up streaming dari tick & backfill.
+
+    Tiap resolusi = ring buffer 3-D (field x koin x candle). Satu batch tick cuma update candle
+    terakhir atau buka candle baru, dihitung vektor buat semua koin sekaligus. Volume candle =
+    volume 24 jam terakhir yang kelihatan (API cuma ngasih volume rolling 24 jam).
+    """
+    RESOLUTIONS = {'1m': 60, '5m': 300, '1h': 3600, '1d': 86400}
+    TS, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+    def __init__(self, depth=720, capacity=32, max_rows=None):
+        self.depth = max(2, int(depth))
+        self.max_rows = max_rows
+        self.data = {res: np.full((6, capacity, self.depth), np.nan) for res in self.RESOLUTIONS}
+        self.positions = {res: np.zeros(capacity, dtype=np.int64) for res in self.RESOLUTIONS}
+        self.counts = {res: np.zeros(capacity, dtype=np.int64) for res in self.RESOLUTIONS}
+        self.rows = {}
+        self.free_rows = list(range(capacity - 1, -1, -1))
+        self.version = 0
+
+    def _grow(self):
+        old = len(self.positions['1m'])
+        new = grow_rows(old, self.max_rows)
+        for res in self.RESOLUTIONS:
+            data = np.full((6, new, self.depth), np.nan)
+            data[:, :old] = self.data[res]
+            self.data[res] = data
+            self.positions[res] = np.concatenate([self.positions[res], np.zeros(new - old, dtype=np.int64)])
+            self.counts[res] = np.concatenate([self.counts[res], np.zeros(new - old, dtype=np.int64)])
+        self.free_rows.extend(range(new - 1, old - 1, -1))
+
+    def row_for(self, coin_id):
+        row = self.rows.get(coin_id)
+        if row is None:
+            if not self.free_rows:
+                self._grow()
+            row = self.free_rows.pop()
+            self.rows[coin_id] = row
+        return row
+
+    def __contains__(self, coin_id):
+        return coin_id in self.rows
+
+    def nbytes(self):
+        return sum(self.data[res].nbytes + self.positions[res].nbytes + self.counts[res].nbytes
+                   for res in self.RESOLUTIONS)
+
+    def row_nbytes(self):
+        return len(self.RESOLUTIONS) * (6 * 8 * self.depth + 16)
+
+    def __delitem__(self, coin_id):
+        row = self.rows.pop(coin_id)
+        for res in self.RESOLUTIONS:
+            self.data[res][:, row] = np.nan
+            self.positions[res][row] = 0
+            self.counts[res][row] = 0
+        self.free_rows.append(row)
+        self.version += 1
+
+    def update(self, coin_ids, ts, prices, volumes):
+        """Masukin satu batch tick (timestamp sama) ke candle semua resolusi"""
+        if not coin_ids:
+            return
+        rows = np.fromiter((self.row_for(c) for c in coin_ids), dtype=np.int64, count=len(coin_ids))
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        for res, seconds in self.RESOLUTIONS.items():
+            data, positions, counts = self.data[res], self.positions[res], self.counts[res]
+            bucket = ts // seconds * seconds
+            current = (positions[rows] - 1) % self.depth
+            fresh = (counts[rows] == 0) | (bucket > data[self.TS, rows, current])
+
+            same = ~fresh
+            if same.any():
+                r, c = rows[same], current[same]
+                data[self.HIGH, r, c] = np.maximum(data[self.HIGH, r, c], prices[same])
+                data[self.LOW, r, c] = np.minimum(data[self.LOW, r, c], prices[same])
+                data[self.CLOSE, r, c] = prices[same]
+                data[self.VOLUME, r, c] = volumes[same]
+            if fresh.any():
+                r = rows[fresh]
+                slot = positions[r]
+                data[self.TS, r, slot] = bucket
+                for field in (self.OPEN, self.HIGH, self.LOW, self.CLOSE):
+                    data[field, r, slot] = prices[fresh]
+                data[self.VOLUME, r, slot] = volumes[fresh]
+                positions[r] = (slot + 1) % self.depth
+                counts[r] = np.minimum(counts[r] + 1, self.depth)
+        self.version += 1
+
+    def series(self, coin_id, res):
+        """Candle satu koin urut lama -> baru, array (6, n): ts, open, high, low, close, volume"""
+        row = self.rows.get(coin_id)
+        if row is None:
+            return np.empty((6, 0))
+        count = self.counts[res][row]
+        idx = (self.positions[res][row] - count + np.arange(count)) % self.depth
+        return self.data[res][:, row, idx]
+
+    def backfill(self, coin_id, timestamps, prices, volumes):
+        """Gabung histori (misal market_chart) di depan candle yang udah ada.
+
+        Resolusi yang lebih halus dari jarak antar titik histori dilewati, biar
+        candle 1m ga keisi satu titik per jam.
+        """
+        ts = np.asarray(timestamps, dtype=np.float64)
+        if not len(ts):
+            return
+        order = np.argsort(ts, kind='stable')
+        ts = ts[order]
+        prices = np.asarray(prices, dtype=np.float64)[order]
+        volumes = np.asarray(volumes, dtype=np.float64)[order]
+        step = float(np.median(np.diff(ts))) if len(ts) > 1 else 0.0
+        for res, seconds in self.RESOLUTIONS.items():
+            if seconds < step * 0.9:
+                continue
+            existing = self.series(coin_id, res)
+            cutoff = existing[self.TS, 0] if existing.shape[1] else np.inf
+            buckets = ts // seconds * seconds
+            mask = buckets < cutoff
+            if not mask.any():
+                continue
+            b, p, v = buckets[mask], prices[mask], volumes[mask]
+            starts = np.flatnonzero(np.r_[True, b[1:] != b[:-1]])
+            ends = np.r_[starts[1:], len(b)] - 1
+            candles = np.vstack([
+                b[starts], p[starts], np.maximum.reduceat(p, starts),
+                np.minimum.reduceat(p, starts), p[ends], v[ends]
+            ])
+            self.load(coin_id, res, np.hstack([candles, existing]))
+
+    def load(self, coin_id, res, candles):
+        """Timpa candle satu resolusi pakai array (6, n) urut lama -> baru, misal dari snapshot daemon"""
+        candles = np.asarray(candles, dtype=np.float64)[:, -self.depth:]
+        row = self.row_for(coin_id)
+        count = candles.shape[1]
+        self.data[res][:, row] = np.nan
+        self.data[res][:, row, :count] = candles
+        self.positions[res][row] = count % self.depth
+        self.counts[res][row] = count
+        self.version += 1
+
+    def closes(self, res, n, coin_ids=None):
+        """Close n candle terakhir banyak koin sekaligus: (coin_ids, matrix), NaN kalau candle-nya belum ada"""
+        coin_ids = list(self.rows) if coin_ids is None else [c for c in coin_ids if c in self.rows]
+        n = max(1, min(n, self.depth))
+        if not coin_ids:
+            return coin_ids, np.empty((0, n))
+        rows = np.fromiter((self.rows[c] for c in coin_ids), dtype=np.int64, count=len(coin_ids))
+        counts = self.counts[res][rows]
+        offsets = np.arange(n)
+        idx = (self.positions[res][rows, None] - n + offsets) % self.depth
+        values = self.data[res][self.CLOSE][rows[:, None], idx]
+        values[offsets < (n - np.minimum(counts, n))[:, None]] = np.nan
+        return coin_ids, values
+
+    def sparkline_levels(self, res, points, width, levels, coin_ids=None):
+        """Level sparkline (-1 = kosong) dari `points` close terakhir, di-downsample (rata-rata) ke `width` kolom"""
+        coin_ids = list(self.rows) if coin_ids is None else [c for c in coin_ids if c in self.rows]
+        if not coin_ids:
+            return {}
+        available = int(self.counts[res][[self.rows[c] for c in coin_ids]].max())
+        per_column = max(1, min(points, available) // width)
+        coin_ids, values = self.closes(res, per_column * width, coin_ids)
+        if not coin_ids:
+            return {}
+        values = values[:, -per_column * width:].reshape(len(coin_ids), -1, per_column)
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            columns = np.nanmean(values, axis=2)
+            mins = np.nanmin(columns, axis=1, keepdims=True)
+            maxs = np.nanmax(columns, axis=1, keepdims=True)
+        spread = maxs - mins
+        with np.errstate(divide='ignore', invalid='ignore'):
+            normalized = np.where(spread > 0, (columns - mins) / spread, 0.5)
+        idx = np.where(np.isnan(columns), -1, (np.nan_to_num(normalized) * (levels - 1)).astype(np.int64))
+        return {coin_id: idx[i] for i, coin_id in enumerate(coin_ids) if (idx[i] >= 0).sum() >= 2}
+
+class FileLock:
+    """Kunci eksklusif antar proses di satu file (flock di POSIX, msvcrt.locking di Windows)"""
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def __enter__(self):
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.name == "nt":
+            msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if os.name == "nt":
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self.fd)
+            self.fd = None
+
+class TickStore:
+    """Arsip tick di disk: satu folder per hari (UTC), satu file ticks.bin berisi record ukuran tetap.
+
+    Tiap flush nulis record utuh (little-endian, packed) dalam satu write, jadi kolom ga
+    mungkin beda panjang; kalau proses mati di tengah write, sisa record setengah jadi
+    dibuang pas baca & dipotong sama writer berikutnya. Index koin disimpan sekali di
+    coins.json dan dipakai bareng semua hari. Tulis ke arsip (dan coins.json) dikunci
+    pakai file .lock per folder, jadi beberapa proses aman nulis ke folder yang sama.
+    """
+    COLUMNS = (
+        ('ts', '<f8'),
+        ('coin', '<u4'),
+        ('price', '<f8'),
+        ('volume', '<f8'),
+        ('market_cap', '<f8'),
+        ('change', '<f4'),
+    )
+    FILENAME = 'ticks.bin'
+
+    def __init__(self, directory, flush_rows=4096, flush_interval=2.0):
+        self.directory = directory
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.buffer = []
+        self.last_flush = time.time()
+        os.makedirs(directory, exist_ok=True)
+        self.lock_path = os.path.join(directory, '.lock')
+        self.coin_path = os.path.join(directory, 'coins.json')
+        self.coin_ids = []
+        self.coin_index = {}
+        self.coin_signature = None
+        self.reload_coins()
+
+    @classmethod
+    def record_dtype(cls):
+        """Dtype record dibangun pas dipakai; numpy bisa aja baru ke-install setelah modul ini di-import"""
+        return np.dtype(list(cls.COLUMNS))
+
+    def file_lock(self):
+        """Kunci eksklusif antar proses buat folder arsip (flock / msvcrt)"""
+        return FileLock(self.lock_path)
+
+    def reload_coins(self):
+        """Baca ulang coins.json kalau diubah proses lain; list-nya cuma pernah nambah di ujung"""
+        try:
+            stat = os.stat(self.coin_path)
+        except OSError:
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self.coin_signature:
+            return
+        with open(self.coin_path) as f:
+            coin_ids = json.load(f)
+        self.coin_signature = signature
+        if coin_ids[:len(self.coin_ids)] == self.coin_ids:
+            self.coin_ids = coin_ids
+            self.coin_index = {coin_id: i for i, coin_id in enumerate(coin_ids)}
+
+    def _coin_index(self, coin_id):
+        index = self.coin_index.get(coin_id)
+        if index is None:
+            with self.file_lock():
+                self.reload_coins()
+                index = self.coin_index.get(coin_id)
+                if index is None:
+                    index = len(self.coin_ids)
+                    self.coin_ids.append(coin_id)
+                    self.coin_index[coin_id] = index
+                    tmp_path = f"{self.coin_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, 'w') as f:
+                        json.dump(self.coin_ids, f)
+                    os.replace(tmp_path, self.coin_path)
+                    stat = os.stat(self.coin_path)
+                    self.coin_signature = (stat.st_mtime_ns, stat.st_size)
+        return index
+
+    @staticmethod
+    def day_name(ts):
+        return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%d')
+
+    def append(self, ts, coin_id, price, volume, market_cap, change):
+        with self.lock:
+            self.buffer.append((ts, self._coin_index(coin_id), price, volume or 0, market_cap or 0, change or 0))
+            due = len(self.buffer) >= self.flush_rows or time.time() - self.last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Tulis buffer (diurut per ts) ke file hari yang sesuai, record utuh sekali write"""
+        with self.lock:
+            rows, self.buffer = self.buffer, []
+            self.last_flush = time.time()
+        if not rows:
+            return
+        record = self.record_dtype()
+        records = np.array(rows, dtype=record)
+        records = records[np.argsort(records['ts'], kind='stable')]
+        days = np.array([self.day_name(ts) for ts in records['ts']])
+        with self.file_lock():
+            for day in np.unique(days):
+                day_dir = os.path.join(self.directory, day)
+                os.makedirs(day_dir, exist_ok=True)
+                with open(os.path.join(day_dir, self.FILENAME), 'ab') as f:
+                    size = f.seek(0, os.SEEK_END)
+                    if size % record.itemsize:
+                        # sisa write yang keputus crash; buang biar record berikutnya tetap sejajar
+                        f.truncate(size - size % record.itemsize)
+                    f.write(records[days == day].tobytes())
+
+    def days(self):
+        """Daftar hari yang ada di arsip, urut lama -> baru"""
+        names = []
+        for name in os.listdir(self.directory):
+            if len(name) == 10 and os.path.isdir(os.path.join(self.directory, name)):
+                names.append(name)
+        return sorted(names)
+
+    def open_day(self, day):
+        """Memmap record satu hari (read-only), dikembaliin per kolom; record terakhir yang belum utuh diabaikan"""
+        day_dir = os.path.join(self.directory, day)
+        path = os.path.join(day_dir, self.FILENAME)
+        if not os.path.exists(path) and os.path.exists(os.path.join(day_dir, 'ts.bin')):
+            return self.open_legacy_day(day_dir)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        record = self.record_dtype()
+        count = size // record.itemsize
+        records = np.memmap(path, dtype=record, mode='r', shape=(count,)) if count else np.empty(0, dtype=record)
+        return {name: records[name] for name, _ in self.COLUMNS}
+
+    def open_legacy_day(self, day_dir):
+        """Arsip format lama (satu file per kolom), panjang dipotong ke kolom terpendek"""
+        columns = {}
+        for name, dtype in self.COLUMNS:
+            path = os.path.join(day_dir, f"{name}.bin")
+            count = (os.path.getsize(path) if os.path.exists(path) else 0) // np.dtype(dtype).itemsize
+            columns[name] = np.memmap(path, dtype=dtype, mode='r', shape=(count,)) if count else np.empty(0, dtype=dtype)
+        length = min(len(column) for column in columns.values())
+        return {name: column[:length] for name, column in columns.items()}
+
+    def query(self, start_ts, end_ts, coin_ids=None):
+        """Tick di rentang [start_ts, end_ts), urut file (ga diasumsikan urut ts antar proses/flush)"""
+        self.reload_coins()
+        start_day = self.day_name(start_ts)
+        end_day = self.day_name(end_ts)
+        wanted = None
+        if coin_ids is not None:
+            wanted = np.array([self.coin_index[c] for c in coin_ids if c in self.coin_index], dtype='<u4')
+
+        parts = []
+        for day in self.days():
+            if day < start_day or day > end_day:
+                continue
+            columns = self.open_day(day)
+            mask = (columns['ts'] >= start_ts) & (columns['ts'] < end_ts)
+            if wanted is not None:
+                mask &= np.isin(columns['coin'], wanted)
+            if mask.any():
+                parts.append({name: column[mask] for name, column in columns.items()})
+
+        if not parts:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in self.COLUMNS}
+        if len(parts) == 1:
+            return parts[0]
+        return {name: np.concatenate([part[name] for part in parts]) for name, _ in self.COLUMNS}
+
+    def load_recent(self, coin_ids, depth, max_rows=2_000_000):
+        """Ambil sampai depth tick terakhir per koin, baca tail file dari hari terbaru mundur"""
+        self.reload_coins()
+        wanted = [self.coin_index[c] for c in coin_ids if c in self.coin_index]
+        if not wanted:
+            return {}
+        max_rows = min(max_rows, depth * len(wanted) * 4)
+
+        tails = []
+        total = 0
+        for day in reversed(self.days()):
+            columns = self.open_day(day)
+            take = min(len(columns['ts']), max_rows - total)
+            if take <= 0:
+                break
+            start = len(columns['ts']) - take
+            tails.append({name: np.array(column[start:]) for name, column in columns.items()})
+            total += take
+            counts = np.bincount(np.concatenate([t['coin'] for t in tails]), minlength=max(wanted) + 1)
+            if counts[wanted].min() >= depth or total >= max_rows:
+                break
+
+        if not tails:
+            return {}
+        merged = {name: np.concatenate([t[name] for t in reversed(tails)]) for name, _ in self.COLUMNS}
+        order = np.argsort(merged['coin'], kind='stable')
+        sorted_coins = merged['coin'][order]
+
+        result = {}
+        for coin_id in coin_ids:
+            index = self.coin_index.get(coin_id)
+            if index is None:
+                continue
+            lo = np.searchsorted(sorted_coins, index, side='left')
+            hi = np.searchsorted(sorted_coins, index, side='right')
+            if hi <= lo:
+                continue
+            rows = order[max(lo, hi - depth):hi]
+            result[coin_id] = {name: merged[name][rows] for name, _ in self.COLUMNS}
+        return result
+
+class Portfolio:
+    """Holdings dari file (lot beli/jual), nilai & P&L per koin disimpan di array NumPy.
+
+    Lot diakuntansi sekali pas load (FIFO atau average cost) jadi sisa jumlah, sisa modal
+    dan realized P&L per koin. Tiap tick cuma baris koin yang harganya berubah yang dihitung ulang.
+    """
+    METHODS = ('fifo', 'average')
+
+    def __init__(self, holdings, method="fifo"):
+        if method not in self.METHODS:
+            raise ValueError(f"Metode lot '{method}' ga dikenal (pilih fifo/average)")
+        self.method = method
+        self.coins = []
+        self.rows = {}
+        lot_rows, lot_qty, lot_price = [], [], []
+        for holding in holdings:
+            coin_id = holding['coin']
+            row = self.rows.setdefault(coin_id, len(self.coins))
+            if row == len(self.coins):
+                self.coins.append(coin_id)
+            lots = holding.get('lots')
+            if lots is None:
+                quantity = float(holding['quantity'])
+                cost = float(holding.get('cost_basis', 0))
+                lots = [{'qty': quantity, 'price': cost / quantity if quantity else 0}]
+            for lot in lots:
+                lot_rows.append(row)
+                lot_qty.append(float(lot['qty']))
+                lot_price.append(float(lot['price']))
+
+        self.lot_rows = np.array(lot_rows, dtype=np.int64)
+        self.lot_qty = np.array(lot_qty, dtype=np.float64)
+        self.lot_price = np.array(lot_price, dtype=np.float64)
+
+        size = len(self.coins)
+        self.quantity = np.zeros(size)
+        self.cost = np.zeros(size)
+        self.realized = np.zeros(size)
+        self.price = np.full(size, np.nan)
+        self.value = np.zeros(size)
+        self.version = 0
+        self.account()
+
+    @classmethod
+    def from_file(cls, path):
+        """Load JSON: {"method": "fifo", "holdings": [{"coin": .., "lots": [{"qty": .., "price": ..}]}]}"""
+        with open(path) as f:
+            config = json.load(f)
+        return cls(config.get('holdings', []), config.get('method', 'fifo'))
+
+    def account(self):
+        """Hitung sisa jumlah, modal & realized P&L dari urutan lot (qty negatif = jual)"""
+        order = np.argsort(self.lot_rows, kind='stable')
+        bounds = np.searchsorted(self.lot_rows[order], np.arange(len(self.coins) + 1))
+        for row, coin_id in enumerate(self.coins):
+            lots = order[bounds[row]:bounds[row + 1]]
+            if self.method == 'fifo':
+                self.quantity[row], self.cost[row], self.realized[row] = self.account_fifo(coin_id, lots)
+            else:
+                self.quantity[row], self.cost[row], self.realized[row] = self.account_average(coin_id, lots)
+
+    def account_fifo(self, coin_id, lots):
+        open_lots = deque()
+        realized = 0.0
+        for qty, price in zip(self.lot_qty[lots].tolist(), self.lot_price[lots].tolist()):
+            if qty > 0:
+                open_lots.append([qty, price])
+                continue
+            sell = -qty
+            while sell > 1e-12 and open_lots:
+                take = min(sell, open_lots[0][0])
+                realized += take * (price - open_lots[0][1])
+                open_lots[0][0] -= take
+                sell -= take
+                if open_lots[0][0] <= 1e-12:
+                    open_lots.popleft()
+            if sell > 1e-9:
+                raise ValueError(f"{coin_id}: jual lebih banyak dari yang dipegang")
+        quantity = sum(q for q, _ in open_lots)
+        cost = sum(q * p for q, p in open_lots)
+        return quantity, cost, realized
+
+    def account_average(self, coin_id, lots):
+        quantity = cost = realized = 0.0
+        for qty, price in zip(self.lot_qty[lots].tolist(), self.lot_price[lots].tolist()):
+            if qty > 0:
+                quantity += qty
+                cost += qty * price
+                continue
+            sell = -qty
+            if sell > quantity + 1e-9:
+                raise ValueError(f"{coin_id}: jual lebih banyak dari yang dipegang")
+            average = cost / quantity if quantity else 0
+            realized += sell * (price - average)
+            cost -= sell * average
+            quantity -= sell
+        return quantity, cost, realized
+
+    def update(self, coin_ids, crypto_data):
+        """Nilai ulang cuma koin yang berubah; return True kalau ada yang kena"""
+        rows = [self.rows[c] for c in coin_ids if c in self.rows and c in crypto_data]
+        if not rows:
+            return False
+        rows = np.array(rows, dtype=np.int64)
+        prices = np.fromiter((crypto_data[self.coins[r]]['price'] for r in rows), dtype=np.float64, count=len(rows))
+        self.price[rows] = prices
+        self.value[rows] = self.quantity[rows] * prices
+        self.version += 1
+        return True
+
+    def unrealized(self):
+        """Unrealized P&L per koin (NaN kalau harganya belum ada)"""
+        return np.where(np.isnan(self.price), np.nan, self.value - self.cost)
+
+    def weights(self):
+        total = self.value.sum()
+        return self.value / total if total > 0 else np.zeros(len(self.coins))
+
+    def summary(self):
+        priced = ~np.isnan(self.price)
+        value = float(self.value.sum())
+        cost = float(self.cost[priced].sum())
+        return {
+            'value': value,
+            'cost': cost,
+            'unrealized': value - cost,
+            'realized': float(self.realized.sum()),
+            'priced': int(priced.sum()),
+            'coins': len(self.coins)
+        }
+
+    def position(self, coin_id):
+        """Posisi satu koin sebagai dict (buat output headless)"""
+        row = self.rows.get(coin_id)
+        if row is None:
+            return None
+        total = self.value.sum()
+        return {
+            'quantity': float(self.quantity[row]),
+            'value': float(self.value[row]),
+            'cost': float(self.cost[row]),
+            'unrealized_pnl': float(self.value[row] - self.cost[row]) if not np.isnan(self.price[row]) else None,
+            'weight': float(self.value[row] / total) if total > 0 else 0.0
+        }
+
+class SnapshotWriter:
+    """Tulis tick hasil fetch ke NDJSON/CSV (satu baris per koin), di-buffer lalu ditulis per batch"""
+    FIELDS = ('ts', 'coin', 'name', 'icon', 'price', 'change_24h', 'volume_24h', 'market_cap')
+    PORTFOLIO_FIELDS = ('quantity', 'value', 'cost', 'unrealized_pnl', 'weight')
+    PROVENANCE_FIELDS = ('sources', 'age_s')
+
+    def __init__(self, stream, fmt="ndjson", flush_rows=1000, flush_interval=1.0, write_header=True, portfolio=None,
+                 provenance=False):
+        self.stream = stream
+        self.portfolio = portfolio
+        self.provenance = provenance
+        self.fields = self.FIELDS + (self.PORTFOLIO_FIELDS if portfolio is not None else ())
+        self.fields += self.PROVENANCE_FIELDS if provenance else ()
+        self.fmt = fmt
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.rows = []
+        self.last_flush = time.time()
+        self.written = 0
+        self.csv_writer = csv.writer(stream, lineterminator="\n") if fmt == "csv" else None
+        if self.csv_writer is not None and write_header:
+            self.csv_writer.writerow(self.fields)
+
+    def write_snapshot(self, ts, crypto_data, coin_ids):
+        for coin_id in coin_ids:
+            data = crypto_data.get(coin_id)
+            if data is None:
+                continue
+            market_cap = data['market_cap']
+            row = (
+                round(ts, 3), coin_id, data['name'], data['icon'], data['price'],
+                data['change_24h'], data['volume_24h'], market_cap if market_cap == market_cap else None
+            )
+            if self.portfolio is not None:
+                position = self.portfolio.position(coin_id) or {}
+                row += tuple(position.get(field) for field in self.PORTFOLIO_FIELDS)
+            if self.provenance:
+                row += ('+'.join(data.get('sources', ())), round(ts - data.get('updated_at', ts), 3))
+            self.rows.append(row)
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        if len(self.rows) >= self.flush_rows or time.time() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        rows, self.rows = self.rows, []
+        self.last_flush = time.time()
+        if rows:
+            if self.csv_writer is not None:
+                self.csv_writer.writerows(rows)
+            else:
+                self.stream.write("\n".join(
+                    json.dumps(dict(zip(self.fields, row)), separators=(',', ':')) for row in rows
+                ) + "\n")
+            self.written += len(rows)
+        self.stream.flush()
+
+class StateProtocol:
+    """Format frame antara StateDaemon & client: header (jenis, panjang) + payload.
+
+    SNAPSHOT, TABLE & COMMAND berupa JSON (SNAPSHOT ditambah blob float64 buat
+    histori & candle). DELTA biner: satu record fixed 52 byte per koin yang
+    berubah, koin & provider diganti nomor dari TABLE, di-encode sekali buat
+    semua client. TABLE juga bawa kurs FX daemon, jadi client ga perlu nembak API.
+    Kalau daemon pakai token, frame pertama client wajib COMMAND {"op": "auth"}.
+    """
+    SNAPSHOT, TABLE, DELTA, COMMAND = 1, 2, 3, 4
+    HEADER = struct.Struct('<BI')
+    DELTA_HEADER = struct.Struct('<QdI')
+    DELTA_FIELDS = [
+        ('coin', '<u4'), ('sources', '<u8'), ('price', '<f8'), ('change_24h', '<f8'),
+        ('volume_24h', '<f8'), ('market_cap', '<f8'), ('updated_at', '<f8')
+    ]
+    MAX_FRAME = 256 << 20
+
+    @classmethod
+    def frame(cls, kind, payload):
+        return cls.HEADER.pack(kind, len(payload)) + payload
+
+    @classmethod
+    def pack_json(cls, kind, message, blob=b""):
+        body = json.dumps(message, separators=(',', ':'), default=float).encode()
+        return cls.frame(kind, struct.pack('<I', len(body)) + body + blob)
+
+    @staticmethod
+    def unpack_json(payload):
+        """Payload JSON -> (message, blob sisanya)"""
+        size = struct.unpack_from('<I', payload)[0]
+        return json.loads(payload[4:4 + size]), payload[4 + size:]
+
+    @classmethod
+    def pack_delta(cls, seq, ts, rows):
+        """rows = list tuple urut sesuai DELTA_FIELDS"""
+        array = np.array(rows, dtype=np.dtype(cls.DELTA_FIELDS))
+        return cls.frame(cls.DELTA, cls.DELTA_HEADER.pack(seq, ts, len(rows)) + array.tobytes())
+
+    @classmethod
+    def unpack_delta(cls, payload):
+        seq, ts, count = cls.DELTA_HEADER.unpack_from(payload)
+        rows = np.frombuffer(payload, dtype=np.dtype(cls.DELTA_FIELDS), count=count, offset=cls.DELTA_HEADER.size)
+        return seq, ts, rows
+
+    @classmethod
+    def split_frames(cls, buffer):
+        """Ambil semua frame utuh dari bytearray, sisa yang belum lengkap ditinggal di buffer"""
+        frames = []
+        offset = 0
+        while len(buffer) - offset >= cls.HEADER.size:
+            kind, size = cls.HEADER.unpack_from(buffer, offset)
+            if size > cls.MAX_FRAME:
+                raise ValueError(f"Frame kegedean ({size} byte)")
+            end = offset + cls.HEADER.size + size
+            if end > len(buffer):
+                break
+            frames.append((kind, bytes(buffer[offset + cls.HEADER.size:end])))
+            offset = end
+        del buffer[:offset]
+        return frames
+
+class StateDaemon:
+    """Satu loop fetch buat banyak dashboard: state tracker dipublish lewat Unix socket / TCP.
+
+    Client baru dapet snapshot penuh (data, last price, histori, candle), habis itu
+    cuma delta biner per tick. Semua socket non-blocking di satu thread selector;
+    client yang antrian kirimnya lewat max_backlog diputus, nanti reconnect dan
+    dapet snapshot baru. Alamat TCP selain loopback wajib pakai token: client yang
+    belum auth ga dikirimin apa-apa dan command-nya ga dijalanin.
+    """
+    MAX_SOURCES = 64
+
+    def __init__(self, tracker, address, max_backlog=8 << 20, token=None):
+        self.tracker = tracker
+        self.label = address
+        self.family, self.address = parse_address(address)
+        self.token = token
+        self.max_backlog = max_backlog
+        self.lock = threading.Lock()
+        self.selector = selectors.DefaultSelector()
+        self.listener = None
+        self.wake_r, self.wake_w = socket.socketpair()
+        self.clients = {}
+        self.commands = deque()
+        self.coin_index = {}
+        self.coin_table = []
+        self.sources = []
+        self.source_bits = {}
+        self.watchlist = ()
+        self.fx_version = None
+        self.table_dirty = True
+        self.backfill_seen = set()
+        self.seq = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if not self.token and not is_loopback(self.family, self.address):
+            raise ValueError(f"Daemon di {self.label} bisa diakses dari luar, wajib pakai --token")
+        if self.family == socket.AF_UNIX and os.path.exists(self.address):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.address)
+                raise OSError(f"Daemon lain udah jalan di {self.label}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(self.address)
+            finally:
+                probe.close()
+        self.listener = socket.socket(self.family, socket.SOCK_STREAM)
+        if self.family != socket.AF_UNIX:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(self.address)
+        self.listener.listen(128)
+        self.listener.setblocking(False)
+        self.wake_r.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.selector.register(self.wake_r, selectors.EVENT_READ)
+        self.running = True
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        self.wake()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        for sock in list(self.clients):
+            self.close_client(sock)
+        if self.listener is not None:
+            self.selector.unregister(self.listener)
+            self.listener.close()
+            if self.family == socket.AF_UNIX and os.path.exists(self.address):
+                os.unlink(self.address)
+        self.wake_r.close()
+        self.wake_w.close()
+        self.selector.close()
+
+    def wake(self):
+        try:
+            self.wake_w.send(b"\0")
+        except OSError:
+            pass
+
+    def serve(self):
+        """Thread selector: accept, baca command client, kirim antrian frame"""
+        while self.running:
+            for key, events in self.selector.select(timeout=0.5):
+                sock = key.fileobj
+                if sock is self.listener:
+                    self.accept()
+                elif sock is self.wake_r:
+                    try:
+                        while self.wake_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                elif sock in self.clients:
+                    if events & selectors.EVENT_READ:
+                        self.read_client(sock)
+                    if events & selectors.EVENT_WRITE and sock in self.clients:
+                        self.write_client(sock)
+            self.update_interest()
+
+    def accept(self):
+        try:
+            sock, _ = self.listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        if self.family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.lock:
+            self.clients[sock] = {'out': bytearray(), 'in': bytearray(), 'synced': False,
+                                  'authed': not self.token, 'drop': False, 'events': selectors.EVENT_READ}
+        self.selector.register(sock, selectors.EVENT_READ)
+        self.tracker.metrics.set_gauge('daemon_clients', len(self.clients))
+
+    def close_client(self, sock):
+        with self.lock:
+            self.clients.pop(sock, None)
+        try:
+            self.selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        sock.close()
+        self.tracker.metrics.set_gauge('daemon_clients', len(self.clients))
+
+    def read_client(self, sock):
+        client = self.clients[sock]
+        try:
+            data = sock.recv(65536)
+            if not data:
+                raise ConnectionError("client nutup koneksi")
+            client['in'] += data
+            for kind, payload in StateProtocol.split_frames(client['in']):
+                if kind != StateProtocol.COMMAND:
+                    continue
+                command = StateProtocol.unpack_json(payload)[0]
+                if client['authed']:
+                    if command.get('op') != 'auth':
+                        self.commands.append(command)
+                elif command.get('op') == 'auth' and hmac.compare_digest(
+                        str(command.get('token', '')).encode(), self.token.encode()):
+                    client['authed'] = True
+                else:
+                    self.tracker.metrics.inc('daemon_auth_failures_total')
+                    raise ConnectionError("token client salah")
+        except BlockingIOError:
+            pass
+        except (OSError, ValueError):
+            self.close_client(sock)
+
+    def write_client(self, sock):
+        with self.lock:
+            out = self.clients[sock]['out']
+            try:
+                sent = sock.send(out)
+            except BlockingIOError:
+                return
+            except OSError:
+                self.clients[sock]['drop'] = True
+                return
+            del out[:sent]
+
+    def update_interest(self):
+        with self.lock:
+            clients = list(self.clients.items())
+        for sock, client in clients:
+            if client['drop']:
+                self.tracker.metrics.inc('daemon_dropped_clients_total')
+                self.close_client(sock)
+                continue
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client['out'] else 0)
+            if events != client['events']:
+                client['events'] = events
+                self.selector.modify(sock, events)
+
+    def coin_code(self, coin_id, record):
+        """Nomor koin buat DELTA; koin baru / nama-ikon berubah bikin TABLE dikirim ulang"""
+        code = self.coin_index.get(coin_id)
+        if code is None:
+            code = self.coin_index[coin_id] = len(self.coin_table)
+            self.coin_table.append([coin_id, record['name'], record['icon']])
+            self.table_dirty = True
+        else:
+            entry = self.coin_table[code]
+            if entry[1] != record['name'] or entry[2] != record['icon']:
+                entry[1], entry[2] = record['name'], record['icon']
+                self.table_dirty = True
+        return code
+
+    def source_mask(self, sources):
+        """Daftar provider -> bitmask 64 bit"""
+        mask = 0
+        for name in sources:
+            bit = self.source_bits.get(name)
+            if bit is None:
+                if len(self.sources) >= self.MAX_SOURCES:
+                    raise ValueError(f"Provider kebanyakan buat DELTA (maks {self.MAX_SOURCES}): {name}")
+                bit = self.source_bits[name] = 1 << len(self.sources)
+                self.sources.append(name)
+                self.table_dirty = True
+            mask |= bit
+        return mask
+
+    def table_message(self):
+        return {'watchlist': list(self.watchlist), 'coins': self.coin_table, 'sources': self.sources,
+                'fx': self.tracker.fx.rates}
+
+    def encode_coins(self, coin_ids, full):
+        """Frame SNAPSHOT: record, last price, histori & candle koin-koin ini (full = plus TABLE)"""
+        tracker = self.tracker
+        blocks, blobs = [], []
+        for coin_id in coin_ids:
+            history = tracker.price_history.window(coin_id, tracker.price_history.depth)
+            candles = {res: tracker.candles.series(coin_id, res) for res in CandleStore.RESOLUTIONS}
+            blocks.append([coin_id, len(history), {res: series.shape[1] for res, series in candles.items()}])
+            blobs.append(np.ascontiguousarray(history, dtype='<f8').tobytes())
+            blobs.extend(np.ascontiguousarray(series, dtype='<f8').tobytes() for series in candles.values())
+        message = {
+            'seq': self.seq,
+            'full': full,
+            'blocks': blocks,
+            'records': {c: tracker.crypto_data[c] for c in coin_ids if c in tracker.crypto_data},
+            'last_prices': {c: tracker.last_prices[c] for c in coin_ids if c in tracker.last_prices}
+        }
+        if full:
+            message['table'] = self.table_message()
+        return StateProtocol.pack_json(StateProtocol.SNAPSHOT, message, b"".join(blobs))
+
+    def publish(self):
+        """Satu tick: delta di-encode sekali lalu diantri ke semua client, client baru dapet snapshot"""
+        start = time.perf_counter()
+        tracker = self.tracker
+        now = time.time()
+        with tracker.state_lock:
+            changed = tracker.drain_changed()
+            backfilled = self.backfill_seen - tracker.backfill_pending
+            self.backfill_seen = set(tracker.backfill_pending)
+
+            rows = []
+            for coin_id in sorted(changed):
+                record = tracker.crypto_data.get(coin_id)
+                if record is None:
+                    continue
+                rows.append((
+                    self.coin_code(coin_id, record), self.source_mask(record.get('sources', ())),
+                    record['price'], record['change_24h'], record['volume_24h'], record['market_cap'],
+                    record.get('updated_at', now)
+                ))
+            if tuple(tracker.watchlist) != self.watchlist:
+                self.watchlist = tuple(tracker.watchlist)
+                self.table_dirty = True
+            if tracker.fx.version != self.fx_version:
+                self.fx_version = tracker.fx.version
+                self.table_dirty = True
+
+            frames = []
+            if self.table_dirty:
+                frames.append(StateProtocol.pack_json(StateProtocol.TABLE, self.table_message()))
+                self.table_dirty = False
+            if rows:
+                self.seq += 1
+                frames.append(StateProtocol.pack_delta(self.seq, now, rows))
+            reloaded = [c for c in backfilled if c in tracker.crypto_data]
+            if reloaded:
+                frames.append(self.encode_coins(reloaded, full=False))
+            frames = b"".join(frames)
+
+            snapshot = None
+            with self.lock:
+                for client in self.clients.values():
+                    if not client['authed']:
+                        continue
+                    if not client['synced']:
+                        if snapshot is None:
+                            for coin_id, record in tracker.crypto_data.items():
+                                self.coin_code(coin_id, record)
+                            snapshot = self.encode_coins(list(tracker.crypto_data), full=True)
+                        client['out'] += snapshot
+                        client['synced'] = True
+                    elif frames:
+                        if len(client['out']) + len(frames) > self.max_backlog:
+                            client['drop'] = True
+                        else:
+                            client['out'] += frames
+        if frames or snapshot is not None:
+            self.wake()
+            self.tracker.metrics.inc('daemon_published_bytes_total', len(frames) * len(self.clients))
+            self.tracker.metrics.observe_since('daemon_publish_ms', start)
+
+    def apply_commands(self):
+        """Jalanin command dari client (tambah/hapus koin, refresh) di thread loop utama"""
+        while self.commands:
+            command = self.commands.popleft()
+            op, coin_id = command.get('op'), command.get('coin')
+            if op == 'add' and coin_id:
+                if coin_id in self.tracker.universe or not self.tracker.universe.ready:
+                    self.tracker.add_coin(coin_id)
+            elif op == 'remove' and coin_id and len(self.tracker.watchlist) > 1:
+                self.tracker.remove_coin(coin_id)
+            elif op == 'refresh':
+                self.tracker.scheduler.request_refresh("client")
+
+class StateSubscriber:
+    """Client tipis buat StateDaemon: snapshot & delta langsung masuk ke tracker, reconnect sendiri kalau putus"""
+    def __init__(self, address, retry_delay=2.0, token=None):
+        self.label = address
+        self.family, self.address = parse_address(address)
+        self.retry_delay = retry_delay
+        self.token = token
+        self.tracker = None
+        self.sock = None
+        self.send_lock = threading.Lock()
+        self.running = False
+        self.thread = None
+        self.connected = False
+        self.seq = 0
+        self.last_message_at = None
+        self.received_bytes = 0
+        self.coins = []
+        self.sources = []
+        self.source_names = {}
+
+    def start(self, tracker):
+        self.tracker = tracker
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        sock = self.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def send_command(self, op, coin_id=None):
+        """Kirim command ke daemon; False kalau lagi ga nyambung"""
+        with self.send_lock:
+            if self.sock is None or not self.connected:
+                return False
+            try:
+                self.sock.sendall(StateProtocol.pack_json(StateProtocol.COMMAND, {'op': op, 'coin': coin_id}))
+                return True
+            except OSError:
+                return False
+
+    def run(self):
+        while self.running:
+            sock = socket.socket(self.family, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(5)
+                sock.connect(self.address)
+                sock.settimeout(None)
+                if self.token:
+                    sock.sendall(StateProtocol.pack_json(StateProtocol.COMMAND, {'op': 'auth', 'token': self.token}))
+                self.sock = sock
+                self.connected = True
+                buffer = bytearray()
+                while self.running:
+                    data = sock.recv(1 << 16)
+                    if not data:
+                        raise ConnectionError("daemon nutup koneksi")
+                    buffer += data
+                    for kind, payload in StateProtocol.split_frames(buffer):
+                        self.handle_frame(kind, payload)
+            except (OSError, ValueError) as e:
+                if self.running:
+                    self.tracker.report_error(f"Koneksi ke daemon {self.label} putus: {e}", stage="daemon")
+            finally:
+                self.connected = False
+                self.sock = None
+                sock.close()
+            if self.running:
+                time.sleep(self.retry_delay)
+
+    def decode_sources(self, mask):
+        names = self.source_names.get(mask)
+        if names is None:
+            names = self.source_names[mask] = [n for i, n in enumerate(self.sources) if mask >> i & 1]
+        return names
+
+    def apply_table(self, table):
+        self.coins = [entry[0] for entry in table['coins']]
+        self.sources = table['sources']
+        self.source_names = {}
+        self.tracker.sync_watchlist(table['watchlist'], table['coins'])
+        if table.get('fx') and table['fx'] != self.tracker.fx.rates:
+            self.tracker.fx.load(table['fx'])
+            self.tracker.converted_cache = None
+
+    def handle_frame(self, kind, payload):
+        self.last_message_at = time.time()
+        self.received_bytes += StateProtocol.HEADER.size + len(payload)
+        if kind == StateProtocol.DELTA:
+            self.seq, _, rows = StateProtocol.unpack_delta(payload)
+            quotes = {}
+            for code, mask, price, change, volume, market_cap, updated_at in rows.tolist():
+                quotes[self.coins[code]] = {
+                    'price': price, 'change_24h': change, 'volume_24h': volume,
+                    'market_cap': market_cap, 'sources': self.decode_sources(mask), 'as_of': updated_at
+                }
+            self.tracker.apply_price_data(quotes, track_last=True)
+        elif kind == StateProtocol.TABLE:
+            self.apply_table(StateProtocol.unpack_json(payload)[0])
+        elif kind == StateProtocol.SNAPSHOT:
+            message, blob = StateProtocol.unpack_json(payload)
+            if 'table' in message:
+                self.apply_table(message['table'])
+            self.seq = message['seq']
+            coins = {}
+            offset = 0
+            for coin_id, history_count, candle_counts in message['blocks']:
+                history = np.frombuffer(blob, dtype='<f8', count=history_count, offset=offset)
+                offset += history.nbytes
+                candles = {}
+                for res, count in candle_counts.items():
+                    candles[res] = np.frombuffer(blob, dtype='<f8', count=6 * count, offset=offset).reshape(6, count)
+                    offset += candles[res].nbytes
+                coins[coin_id] = (history, candles)
+            self.tracker.load_remote_state(message['records'], message['last_prices'], coins, message['full'])
+
+class TrackerConfig:
+    """Setting tracker dari file JSON dengan profil bernama; file diawasin jadi editan langsung kepake.
+
+    {"active_profile": "default", "profiles": {"default": {"watchlist": [..], "update_interval": 15,
+     "min_interval": 5, "max_interval": 60, "currency": "idr", "columns": ["rsi"], "icons": {..}}}}
+
+    Key yang ga diisi pakai DEFAULTS. Watcher-nya polling mtime/size (ga butuh library tambahan),
+    dan file selalu ditulis atomik (tmp + os.replace) jadi ga pernah kebaca setengah jadi.
+    """
+    DEFAULTS = {
+        'watchlist': ['bitcoin', 'ethereum', 'binancecoin', 'cardano', 'solana',
+                      'polkadot', 'dogecoin', 'avalanche-2', 'chainlink', 'polygon'],
+        'icons': {'bitcoin': 'BTC', 'ethereum': 'ETH', 'binancecoin': 'BNB', 'cardano': 'ADA',
+                  'solana': 'SOL', 'polkadot': 'DOT', 'dogecoin': 'DOGE', 'avalanche-2': 'AVAX',
+                  'chainlink': 'LINK', 'polygon': 'MATIC'},
+        'update_interval': 15,
+        'min_interval': 5,
+        'max_interval': 60,
+        'currency': 'usd',
+        'columns': [],
+    }
+
+    def __init__(self, path=None, profile=None):
+        self.path = os.path.expanduser(path) if path else None
+        self.requested_profile = profile
+        self.data = {'active_profile': profile or 'default', 'profiles': {}}
+        self.profile, self.settings = self.resolve(self.data)
+        self.signature = None
+        self.last_check = 0
+        self.error = None
+        self.lock = threading.Lock()
+        if self.path and os.path.exists(self.path):
+            try:
+                self.load()
+            except (OSError, ValueError):
+                pass
+
+    def file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def resolve(self, data):
+        """Gabung DEFAULTS sama profil aktif lalu validasi; error -> ValueError"""
+        profiles = data.get('profiles') or {}
+        profile = self.requested_profile or data.get('active_profile') or 'default'
+        if self.requested_profile and profile not in profiles and profiles:
+            raise ValueError(f"Profil '{profile}' ga ada (ada: {', '.join(profiles)})")
+        overrides = profiles.get(profile) or {}
+        if not isinstance(overrides, dict):
+            raise ValueError(f"Profil '{profile}' harus object")
+
+        settings = {key: overrides.get(key, default) for key, default in self.DEFAULTS.items()}
+        settings['icons'] = {**self.DEFAULTS['icons'], **(overrides.get('icons') or {})}
+        watchlist = [str(c).strip().lower() for c in settings['watchlist'] if str(c).strip()]
+        settings['watchlist'] = list(dict.fromkeys(watchlist))
+        if not settings['watchlist']:
+            raise ValueError(f"Watchlist profil '{profile}' kosong")
+        for key in ('update_interval', 'min_interval', 'max_interval'):
+            value = settings[key]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"{key} harus angka > 0, bukan {value!r}")
+        if settings['min_interval'] > settings['max_interval']:
+            raise ValueError("min_interval lebih gede dari max_interval")
+        settings['currency'] = str(settings['currency']).lower()
+        settings['columns'] = [str(c).lower() for c in settings['columns']]
+        return profile, settings
+
+    def load(self):
+        """Baca ulang file; kalau rusak settings lama tetap dipakai, error-nya disimpen di `error` & dilempar"""
+        with self.lock:
+            signature = self.file_signature()
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    raise ValueError("Isi config harus object JSON")
+                self.profile, self.settings = self.resolve(data)
+            except (OSError, ValueError) as e:
+                self.error = f"Config {self.path} ga kepake: {e}"
+                raise
+            finally:
+                self.signature = signature
+            self.data = data
+            self.error = None
+            return self.settings
+
+    def changed(self, min_interval=1.0):
+        """True kalau file diubah dari luar sejak terakhir dibaca/ditulis (dicek max sekali per detik)"""
+        now = time.time()
+        if not self.path or now - self.last_check < min_interval:
+            return False
+        self.last_check = now
+        signature = self.file_signature()
+        return signature is not None and signature != self.signature
+
+    def save_watchlist(self, watchlist):
+        """Simpan watchlist ke profil aktif; editan luar yang belum kebaca ga ketimpa, file rusak ga ditimpa"""
+        if not self.path:
+            return
+        if self.error is not None:
+            raise ValueError(f"{self.error} (watchlist ga disimpan biar file-nya ga ketimpa)")
+        with self.lock:
+            external = self.file_signature() not in (None, self.signature)
+            if external:
+                try:
+                    with open(self.path) as f:
+                        data = json.load(f)
+                    if not isinstance(data, dict):
+                        raise ValueError("Isi config harus object JSON")
+                except (OSError, ValueError) as e:
+                    # editan luar setengah jadi: jangan ditimpa, tunggu hot reload baca versi benernya
+                    self.error = f"Config {self.path} ga kepake: {e}"
+                    raise ValueError(f"{self.error} (watchlist ga disimpan biar file-nya ga ketimpa)")
+                self.data = data
+            profile = self.data.setdefault('profiles', {}).setdefault(self.profile, {})
+            profile['watchlist'] = list(watchlist)
+            self.data.setdefault('active_profile', self.profile)
+            self.settings['watchlist'] = list(watchlist)
+
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            # editan luar yang ikut kegabung belum diterapin: biarin watcher baca ulang
+            self.signature = None if external else self.file_signature()
 
 class CryptoTrackerGenZ:
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, api_base_url="https://api.coingecko.com/api/v3", batch_size=50, max_workers=4,
+                 stream_url=None, history_depth=512, tick_dir=None,
+                 currencies=('usd', 'idr', 'eur', 'btc'), display_currency=None, alerts=None,
+                 universe_cache=None, portfolio=None, profiler=None, providers=('coingecko',),
+                 provider_deadline=3.0, quorum=2, backfill_days=30, remote=None, config=None,
+                 replay=None, memory_budget=None, cold_ttl=3600):
+        self._console = None
+        self.headless = False
+        self.first_data_at = None
+        self.first_frame_at = None
         self.running = True
-        self.watchlist = [
-            'bitcoin', 'ethereum', 'binancecoin', 'cardano', 'solana', 
-            'polkadot', 'dogecoin', 'avalanche-2', 'chainlink', 'polygon'
-        ]
-        self.crypto_data = {}
-        self.update_interval = 15  
+        self.config = config if config is not None else TrackerConfig()
+        settings = self.config.settings
+        self.replay = replay
+        self.clock = replay.clock if replay is not None else time.time
+        self.watchlist = list(replay.coins if replay is not None else settings['watchlist'])
+        self.profile_watchlist = list(settings['watchlist'])
+        self.crypto_data = CoinRecordStore()
+        self.update_interval = settings['update_interval']
+        self.scheduler = PollScheduler(base_interval=self.update_interval,
+                                       min_interval=settings['min_interval'],
+                                       max_interval=settings['max_interval'])
+        self.pending_fetch = set()
         self.loading = False
         self.animation_frame = 0
-        self.price_history = {}  
+        self.price_history = PriceHistoryStore(depth=history_depth)
+        self.candles = CandleStore()
+        self.indicators = IndicatorEngine()
+        self.memory_budget = memory_budget
+        self.cold_ttl = cold_ttl
+        self.coin_capacity = None
+        self.memory_report = None
+        self.last_eviction = 0
+        self.budget_warned = False
+        self.apply_memory_budget()
+        self.indicator_column_names = ('rsi', 'macd', 'bb', 'vwap')
+        self.indicator_columns = tuple(c for c in self.indicator_column_names if c in settings['columns'])
+        self.show_breadth = False
+        self.breadth_cache = None
+        self.backfill_days = backfill_days
+        self.backfill_pending = set()
+        self.backfill_in_flight = set()
+        self.backfill_retry = {}
+        self.trend_timeframes = ('tick',) + tuple(CandleStore.RESOLUTIONS)
+        self.trend_timeframe = '1h' if backfill_days else 'tick'
         self.last_prices = {}
+        self.api_base_url = api_base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.fetch_pool = None
+        self.state_lock = threading.RLock()
+        self.metrics = Metrics()
+        self.metrics_server = None
+        self.profiler = profiler
+        self.show_debug = False
+        self.http = PooledHttpClient(pool_size=max(4, max_workers), metrics=self.metrics)
+        self.last_fetch_timing = None
+        self.stream_source = None
+        self.quote_handoff = None
+        self.remote = remote
+        self.tick_store = TickStore(tick_dir) if tick_dir else None
+        self.fx = FxRates(self.http, self.api_base_url)
+        self.universe = CoinUniverse(self.http, self.api_base_url, universe_cache)
+        self.currencies = list(currencies)
+        display_currency = display_currency or settings['currency']
+        self.display_currency = display_currency if display_currency in self.currencies else self.currencies[0]
+        self.converted_cache = None
+        self.alerts = alerts
+        self.portfolio = portfolio
+        self.portfolio_cache = None
+        if portfolio is not None:
+            self.watchlist.extend(c for c in portfolio.coins if c not in self.watchlist)
+        self.data_version = 0
+        self.coin_versions = {}
+        self.dirty_coins = set()
+        self.sorted_keys = []
+        self.sort_keys = {}
+        self.sort_columns = ('market_cap', 'price', 'change_24h', 'volume_24h', 'volatility', 'name')
+        self.sort_column = 'market_cap'
+        self.sort_descending = True
+        self.table_offset = 0
+        self.table_rows = 10
+        self.row_cache = {}
+        self.changed_since_emit = set()
+        self.table_cache = None
+        self.market_status_cache = None
+        self.layout = None
         
-        self.crypto_icons = {
-            'bitcoin': 'BTC',
-            'ethereum': 'ETH',
-            'binancecoin': 'BNB',
-            'cardano': 'ADA',
-            'solana': 'SOL',
-            'polkadot': 'DOT',
-            'dogecoin': 'DOGE',
-            'avalanche-2': 'AVAX',
-            'chainlink': 'LINK',
-            'polygon': 'MATIC'
-        }
+        self.coin_names = {}
+        self.crypto_icons = dict(settings['icons'])
+        if replay is not None:
+            self.coin_names.update(replay.names)
+            self.crypto_icons.update(replay.icons)
         
+        self.price_source = self.create_price_source(providers, batch_size, provider_deadline, quorum)
+        if self.config.error is not None:
+            self.report_error(f"{self.config.error}, jalan pakai default", stage="config")
+        if backfill_days:
+            self.backfill_pending.update(self.watchlist)
+        if stream_url:
+            self.stream_source = BinanceStreamSource(lambda: list(self.watchlist), self.crypto_icons, stream_url)
+        if replay is not None:
+            self.stream_source = replay
+
         self.wave_chars = ['▁', '▂', '▃', '▄', '▅', '▆', '▇', '█']
+        self.escape_keys = {
+            '[A': 'up', '[B': 'down', '[5~': 'pgup', '[6~': 'pgdn',
+            '[H': 'home', '[F': 'end', '[1~': 'home', '[4~': 'end', 'OH': 'home', 'OF': 'end'
+        }
+        self.windows_keys = {b'H': 'up', b'P': 'down', b'I': 'pgup', b'Q': 'pgdn', b'G': 'home', b'O': 'end'}
         self.loading_chars = ['⣾', '⣽', '⣻', '⢿', '⡿', '⣟', '⣯', '⣷']
         
+    def create_price_source(self, providers, batch_size, deadline, quorum):
+        """Satu provider -> langsung source-nya; lebih dari satu -> digabung AggregatedPriceSource"""
+        sources = []
+        for name in providers:
+            if name == 'coingecko':
+                sources.append(CoinGeckoPriceSource(self.http, self.api_base_url, batch_size))
+            elif name == 'coincap':
+                sources.append(CoinCapPriceSource(self.http))
+            elif name == 'binance':
+                sources.append(ExchangeRestPriceSource(self.http, self.crypto_icons))
+            else:
+                raise ValueError(f"Provider '{name}' ga dikenal (coingecko, coincap, binance)")
+        if len(sources) == 1:
+            return sources[0]
+        return AggregatedPriceSource(sources, deadline=deadline, quorum=quorum, batch_size=batch_size)
+
+    @property
+    def console(self):
+        if self._console is None:
+            load_rich()
+            self._console = Console()
+        return self._console
+
+    @console.setter
+    def console(self, value):
+        self._console = value
+
+    def report_error(self, message, stage="fetch"):
+        """Catat error ke ring buffer metrics; headless juga ke stderr (di UI, print ke layar Live bakal ketiban)"""
+        self.metrics.record_error(stage, message)
+        if self.headless:
+            print(message, file=sys.stderr)
+
+    def startup_report(self):
+        """Ringkasan waktu startup (ms): import modul, Rich, data pertama, frame pertama"""
+        report = dict(STARTUP_TIMINGS)
+        if self.first_data_at is not None:
+            report['first_data_ms'] = (self.first_data_at - STARTUP_T0) * 1000
+        if self.first_frame_at is not None:
+            report['first_frame_ms'] = (self.first_frame_at - STARTUP_T0) * 1000
+        return report
+
     def get_trend_animation(self, coin_id):
         """Bikin grafik mini yang smooth"""
-        if coin_id not in self.price_history:
-            return "━━━"
-        
-        history = self.price_history[coin_id]
-        if len(history) < 2:
+        if self.price_history.count(coin_id) < 5:
             return "━━━"
 
-        if len(history) >= 5:
-            recent = history[-5:]
-            min_val = min(recent)
-            max_val = max(recent)
-            if max_val == min_val:
-                return "━━━━━"
-            
-            sparkline = ""
-            for val in recent:
-                normalized = (val - min_val) / (max_val - min_val)
-                char_idx = int(normalized * (len(self.wave_chars) - 1))
-                sparkline += self.wave_chars[char_idx]
-            return sparkline
-        
-        return "━━━"
+        recent = self.price_history.window(coin_id, 5)
+        min_val = recent.min()
+        max_val = recent.max()
+        if max_val == min_val:
+            return "━━━━━"
+
+        idx = ((recent - min_val) / (max_val - min_val) * (len(self.wave_chars) - 1)).astype(int)
+        return ''.join(self.wave_chars[i] for i in idx)
+
+    def get_trend_width(self):
+        return 5 if self.trend_timeframe == 'tick' else 16
+
+    def get_trend_animations(self, width=None, coin_ids=None):
+        """Sparkline banyak koin sekaligus (default semua), min/max & normalisasi dihitung vektor"""
+        width = width or self.get_trend_width()
+        if self.trend_timeframe != 'tick':
+            levels = self.candles.sparkline_levels(self.trend_timeframe, 240, width, len(self.wave_chars), coin_ids)
+            return {coin_id: ''.join(self.wave_chars[i] if i >= 0 else ' ' for i in idx)
+                    for coin_id, idx in levels.items()}
+        levels, flat = self.price_history.sparkline_levels(width, len(self.wave_chars), coin_ids)
+        sparklines = {coin_id: ''.join(self.wave_chars[i] for i in idx) for coin_id, idx in levels.items()}
+        for coin_id in flat:
+            sparklines[coin_id] = "━" * width
+        return sparklines
+
+    def cycle_trend_timeframe(self):
+        """Ganti timeframe sparkline (tick -> 1m -> 5m -> 1h -> 1d), cukup invalidasi cache render"""
+        index = self.trend_timeframes.index(self.trend_timeframe)
+        with self.state_lock:
+            self.trend_timeframe = self.trend_timeframes[(index + 1) % len(self.trend_timeframes)]
+            self.table_cache = None
+
+    def fetch_market_chart(self, coin_id):
+        """Histori harga & volume dari /coins/{id}/market_chart: (ts detik, harga, volume 24 jam)"""
+        data = self.http.get_json(f"{self.api_base_url}/coins/{coin_id}/market_chart",
+                                  params={'vs_currency': 'usd', 'days': self.backfill_days})
+        prices = np.array(data.get('prices') or [], dtype=np.float64).reshape(-1, 2)
+        volumes = np.array(data.get('total_volumes') or [], dtype=np.float64).reshape(-1, 2)
+        ts = prices[:, 0] / 1000
+        if len(volumes):
+            volume = np.interp(ts, volumes[:, 0] / 1000, volumes[:, 1])
+        else:
+            volume = np.zeros(len(ts))
+        return ts, prices[:, 1], volume
+
+    def maybe_backfill(self):
+        """Backfill histori koin yang belum punya, barengan di pool; nyisain token buat poll harga"""
+        if self.remote is not None or self.replay is not None or not self.backfill_days or not self.backfill_pending:
+            return
+        now = time.time()
+        with self.state_lock:
+            candidates = [c for c in self.backfill_pending
+                          if c not in self.backfill_in_flight and self.backfill_retry.get(c, 0) <= now]
+        for coin_id in candidates:
+            if self.scheduler.tokens < 2 or not self.scheduler.try_acquire():
+                break
+            with self.state_lock:
+                self.backfill_in_flight.add(coin_id)
+            future = self.get_fetch_pool().submit(self.fetch_market_chart, coin_id)
+            future.add_done_callback(lambda f, coin_id=coin_id: self._on_backfilled(coin_id, f))
+
+    def _on_backfilled(self, coin_id, future):
+        error = future.exception()
+        if error is not None:
+            response = getattr(error, 'response', None)
+            status = response.status_code if response is not None else None
+            retryable = isinstance(error, requests.exceptions.RequestException) and (
+                status is None or status == 429 or status >= 500)
+            if retryable:
+                # kuota/server bermasalah: ikut backoff scheduler bareng poll harga, bukan retry per koin
+                if status == 429:
+                    self.metrics.inc('rate_limited_total')
+                retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+                if time.time() >= self.scheduler.backoff_until or retry_after is not None:
+                    self.scheduler.record_result(status=status, retry_after=retry_after, failed=True)
+            with self.state_lock:
+                if not retryable:
+                    self.backfill_retry[coin_id] = time.time() + 120
+                # baru dilepas setelah backoff kecatat, biar maybe_backfill ga langsung nembak ulang
+                self.backfill_in_flight.discard(coin_id)
+            self.report_error(f"Gagal backfill {coin_id}: {error}", stage="backfill")
+            return
+        ts, prices, volumes = future.result()
+        with self.state_lock:
+            self.backfill_in_flight.discard(coin_id)
+            self.backfill_pending.discard(coin_id)
+            if coin_id not in self.watchlist or not self.admit_coins([coin_id]):
+                return
+            self.candles.backfill(coin_id, ts, prices, volumes)
+            if coin_id in self.crypto_data:
+                self.mark_coin_changed(coin_id)
+
+    def get_price_change_indicator(self, coin_id, current_price):
+        """Indikator perubahan harga yang clean, dibanding tick sebelumnya di price_history"""
+        if self.price_history.count(coin_id) >= 2:
+            last_price = self.price_history.window(coin_id, 2)[0]
+        elif coin_id in self.last_prices:
+            last_price = self.last_prices[coin_id]
+        else:
+            return "[dim]○[/dim]"
+
+        if current_price > last_price:
+            return "[bright_green]▲[/bright_green]"
+        elif current_price < last_price:
+            return "[bright_red]▼[/bright_red]"
+        else:
+            return "[yellow]●[/yellow]"
+
+    def get_poll_coins(self):
+        """Koin yang perlu dipoll REST: semua, kecuali yang lagi live dari stream (mode client & replay: ga ada)"""
+        if self.remote is not None or self.replay is not None:
+            return []
+        if self.stream_source is None:
+            return list(self.watchlist)
+        covered = self.stream_source.covered_coins()
+        return [coin_id for coin_id in self.watchlist if coin_id not in covered]
+
+    def get_fetch_batches(self):
+        """Pecah koin yang perlu dipoll jadi beberapa batch biar URL ga kepanjangan"""
+        return self.price_source.get_batches(self.get_poll_coins())
+
+    def fetch_price_batch(self, coins):
+        """Ambil harga satu batch koin dari price source"""
+        return self.price_source.fetch_batch(coins)
+
+    def apply_price_data(self, quotes, track_last=False, source=None):
+        """Masukin quote (format normal PriceSource) ke crypto_data & price_history"""
+        start = time.perf_counter()
+        now = self.clock()
+        default_sources = [source or self.price_source.name]
+        with self.state_lock:
+            if self.coin_capacity is not None:
+                admitted = self.admit_coins(list(quotes))
+                if len(admitted) < len(quotes):
+                    quotes = {coin_id: quotes[coin_id] for coin_id in admitted}
+            coin_ids = list(quotes)
+            records = self.crypto_data
+            fresh = {coin_id for coin_id in coin_ids if coin_id not in records}
+            rows = records.rows_for(coin_ids)
+            previous = records.read(rows)
+            columns = {field: [] for field in CoinRecordStore.NUMERIC}
+            sources = []
+            for i, coin_id in enumerate(coin_ids):
+                quote = quotes[coin_id]
+                last_price = previous['price'][i]
+                price = quote.get('price', last_price)
+                if track_last and coin_id not in fresh:
+                    self.last_prices[coin_id] = last_price
+
+                self.price_history.append(coin_id, price)
+
+                market_cap = quote.get('market_cap')
+                if market_cap is None:
+                    # quote stream ga bawa market cap: ikutin gerak harga, NaN (belum tau) sampai REST ngisi
+                    market_cap = np.nan
+                    if last_price and coin_id not in fresh:
+                        market_cap = previous['market_cap'][i] * price / last_price
+                change = quote.get('change_24h', previous['change_24h'][i])
+                volume = quote.get('volume_24h', previous['volume_24h'][i])
+
+                columns['price'].append(price)
+                columns['change_24h'].append(change)
+                columns['volume_24h'].append(volume)
+                columns['market_cap'].append(market_cap)
+                columns['updated_at'].append(quote.get('as_of', now))
+                sources.append(quote.get('sources', default_sources))
+                self.mark_coin_changed(coin_id)
+
+                if self.tick_store is not None:
+                    self.tick_store.append(now, coin_id, price, volume, market_cap, change)
+
+            records.write(rows, columns, sources)
+            for coin_id in fresh:
+                records.set_labels(coin_id, self.coin_name(coin_id), self.coin_icon(coin_id))
+            candle_prices, candle_volumes = columns['price'], columns['volume_24h']
+            if coin_ids and self.first_data_at is None:
+                self.first_data_at = time.perf_counter()
+
+            self.candles.update(list(quotes), now, candle_prices, candle_volumes)
+            self.indicators.update(list(quotes), candle_prices, candle_volumes, now)
+            if self.alerts is not None:
+                self.alerts.evaluate(list(quotes), self.crypto_data, self.price_history)
+            if self.portfolio is not None:
+                self.portfolio.update(quotes, self.crypto_data)
+        self.metrics.observe_since('apply_ms', start)
+
+    def warm_from_tick_store(self):
+        """Isi price_history, last_prices & crypto_data dari arsip tick (memmap, tanpa parsing)"""
+        if self.tick_store is None:
+            return 0
+        recent = self.tick_store.load_recent(self.watchlist, self.price_history.depth)
+        with self.state_lock:
+            recent = {coin_id: recent[coin_id] for coin_id in self.admit_coins(list(recent))}
+            for coin_id, columns in recent.items():
+                prices = columns['price']
+                self.price_history.extend(coin_id, prices)
+                self.candles.backfill(coin_id, columns['ts'], prices, columns['volume'])
+                self.last_prices[coin_id] = float(prices[-1])
+                self.crypto_data[coin_id] = {
+                    'name': self.coin_name(coin_id),
+                    'price': float(prices[-1]),
+                    'change_24h': float(columns['change'][-1]),
+                    'volume_24h': float(columns['volume'][-1]),
+                    'market_cap': float(columns['market_cap'][-1]),
+                    'icon': self.coin_icon(coin_id),
+                    'sources': ['arsip'],
+                    'updated_at': float(columns['ts'][-1])
+                }
+                self.mark_coin_changed(coin_id)
+            self.warm_indicators(list(recent))
+        return len(recent)
+
+    def warm_indicators(self, coin_ids):
+        """Hitung ulang state indikator koin-koin ini dari price_history (warm start / snapshot daemon)"""
+        with self.state_lock:
+            for coin_id in coin_ids:
+                if coin_id in self.indicators:
+                    del self.indicators[coin_id]
+            self.indicators.warm(*self.price_history.gather(self.price_history.depth, coin_ids))
 
-    def get_price_change_indicator(self, coin_id, current_price):
-        """Indikator perubahan harga yang clean"""
-        if coin_id in self.last_prices:
-            last_price = self.last_prices[coin_id]
-            if current_price > last_price:
-                return "[bright_green]▲[/bright_green]"
-            elif current_price < last_price:
-                return "[bright_red]▼[/bright_red]"
-            else:
-                return "[yellow]●[/yellow]"
-        return "[dim]○[/dim]"
+    def mark_coin_changed(self, coin_id):
+        """Tandai data satu koin berubah biar cache render-nya dibangun ulang"""
+        self.coin_versions[coin_id] = self.coin_versions.get(coin_id, 0) + 1
+        self.dirty_coins.add(coin_id)
+        self.changed_since_emit.add(coin_id)
+        self.data_version += 1
 
-    def fetch_crypto_data(self):
-        """Ambil data crypto dari API dengan handling yang proper"""
-        self.loading = True
+    def drain_changed(self):
+        """Ambil & kosongin daftar koin yang berubah sejak terakhir dipanggil"""
+        with self.state_lock:
+            changed, self.changed_since_emit = self.changed_since_emit, set()
+        return changed
+
+    def add_coin(self, coin_id):
+        """Tambah koin ke watchlist; mode client diteruskan ke daemon"""
+        if self.remote is not None:
+            return self.remote.send_command('add', coin_id)
+        with self.state_lock:
+            if coin_id in self.watchlist:
+                return False
+            if self.coin_capacity is not None and len(self.watchlist) >= self.coin_capacity:
+                return False
+            self.watchlist.append(coin_id)
+            if coin_id not in self.profile_watchlist:
+                self.profile_watchlist.append(coin_id)
+            self.track_new_coin(coin_id)
+        self.save_watchlist()
+        return True
+
+    def remove_coin(self, coin_id):
+        """Hapus koin dari watchlist; mode client diteruskan ke daemon"""
+        if self.remote is not None:
+            return self.remote.send_command('remove', coin_id)
+        with self.state_lock:
+            if coin_id not in self.watchlist:
+                return False
+            self.watchlist.remove(coin_id)
+            if coin_id in self.profile_watchlist:
+                self.profile_watchlist.remove(coin_id)
+            self.evict_coin(coin_id)
+        self.save_watchlist()
+        return True
+
+    def track_new_coin(self, coin_id):
+        """Antriin fetch harga (cuma koin ini, ga nunggu poll berikutnya) & backfill buat koin baru"""
+        self.pending_fetch.add(coin_id)
+        if self.backfill_days:
+            self.backfill_pending.add(coin_id)
+
+    def save_watchlist(self):
+        """Simpan watchlist profil aja; koin yang ikut cuma karena ada di portfolio ga ditulis ke config"""
+        if self.replay is not None:
+            return
+        try:
+            self.config.save_watchlist(list(self.profile_watchlist))
+        except (OSError, ValueError) as e:
+            self.report_error(f"Gagal nyimpen config: {e}", stage="config")
+
+    def maybe_fetch_new_coins(self):
+        """Fetch harga koin yang baru masuk watchlist di pool, poll koin lain ga diulang"""
+        if self.remote is not None or self.replay is not None or not self.pending_fetch:
+            return
+        with self.state_lock:
+            coins = [c for c in self.watchlist if c in self.pending_fetch]
+            self.pending_fetch.clear()
+        for batch in self.price_source.get_batches(coins):
+            if not self.scheduler.try_acquire():
+                self.pending_fetch.update(batch)
+                continue
+            future = self.get_fetch_pool().submit(self.fetch_price_batch, batch)
+            future.add_done_callback(lambda f, batch=batch: self._on_new_coins_fetched(batch, f))
+
+    def _on_new_coins_fetched(self, batch, future):
+        error = future.exception()
+        if error is not None:
+            self.pending_fetch.update(batch)
+            self.report_error(f"Gagal fetch koin baru {', '.join(batch)}: {error}", stage="fetch")
+            return
+        with self.state_lock:
+            quotes = {c: q for c, q in future.result().items() if c in self.watchlist}
+            self.apply_price_data(quotes, track_last=True)
+
+    def maybe_reload_config(self):
+        """Terapin editan file config begitu kedetect; config rusak dicatat, settings lama tetap jalan"""
+        if not self.config.changed():
+            return
         try:
-            coins = ','.join(self.watchlist)
-            url = f"https://api.coingecko.com/api/v3/simple/price"
-            params = {
-                'ids': coins,
-                'vs_currencies': 'usd',
-                'include_24hr_change': 'true',
-                'include_24hr_vol': 'true',
-                'include_market_cap': 'true'
+            settings = self.config.load()
+        except (OSError, ValueError) as e:
+            self.report_error(f"Config {self.config.path} ga kepake: {e}", stage="config")
+            return
+        self.apply_settings(settings)
+
+    def apply_settings(self, settings):
+        """Samain state sama settings: cuma koin yang ditambah/dihapus yang di-fetch/dibuang"""
+        with self.state_lock:
+            self.crypto_icons.update(settings['icons'])
+            self.relabel_coins()
+            if self.remote is None and self.replay is None:
+                self.profile_watchlist = list(settings['watchlist'])
+                watchlist = list(settings['watchlist'])
+                if self.portfolio is not None:
+                    watchlist.extend(c for c in self.portfolio.coins if c not in watchlist)
+                if self.coin_capacity is not None and len(watchlist) > self.coin_capacity:
+                    self.report_error(f"Watchlist {len(watchlist)} koin kepotong ke {self.coin_capacity} "
+                                      f"(budget memori)", stage="memory")
+                    watchlist = watchlist[:self.coin_capacity]
+                current = set(self.watchlist)
+                for coin_id in [c for c in self.watchlist if c not in set(watchlist)]:
+                    self.evict_coin(coin_id)
+                self.watchlist[:] = watchlist
+                for coin_id in watchlist:
+                    if coin_id not in current:
+                        self.track_new_coin(coin_id)
+            self.update_interval = settings['update_interval']
+            self.scheduler.configure(settings['update_interval'], settings['min_interval'], settings['max_interval'])
+            if settings['currency'] in self.currencies:
+                self.display_currency = settings['currency']
+            self.indicator_columns = tuple(c for c in self.indicator_column_names if c in settings['columns'])
+            for coin_id in self.crypto_data:
+                self.mark_coin_changed(coin_id)
+            self.table_cache = None
+            self.market_status_cache = None
+            self.portfolio_cache = None
+
+    def evict_coin(self, coin_id):
+        """Buang state satu koin: data, harga terakhir, histori, candle & antrian backfill"""
+        with self.state_lock:
+            self.last_prices.pop(coin_id, None)
+            self.pending_fetch.discard(coin_id)
+            if coin_id in self.crypto_data:
+                del self.crypto_data[coin_id]
+            if coin_id in self.price_history:
+                del self.price_history[coin_id]
+            if coin_id in self.candles:
+                del self.candles[coin_id]
+            if coin_id in self.indicators:
+                del self.indicators[coin_id]
+            self.backfill_pending.discard(coin_id)
+            self.backfill_retry.pop(coin_id, None)
+            self.mark_coin_changed(coin_id)
+
+    def coin_stores(self):
+        return (self.crypto_data, self.price_history, self.candles, self.indicators)
+
+    def apply_memory_budget(self):
+        """Budget memori (byte) -> jumlah slot koin maksimal; semua store dibatesin ke jumlah itu"""
+        if self.memory_budget is None:
+            return
+        per_coin = sum(store.row_nbytes() for store in self.coin_stores())
+        self.coin_capacity = max(1, int(self.memory_budget // per_coin))
+        for store in self.coin_stores():
+            store.max_rows = self.coin_capacity
+
+    def tracked_coin_count(self):
+        return max(len(store.rows) for store in self.coin_stores())
+
+    def admit_coins(self, coin_ids):
+        """Koin yang boleh dapet slot; kalau budget penuh koin non-watchlist paling lama dibuang dulu (LRU)"""
+        if self.coin_capacity is None:
+            return coin_ids
+        fresh = [c for c in coin_ids if c not in self.crypto_data and c not in self.price_history]
+        if not fresh:
+            return coin_ids
+        room = self.coin_capacity - self.tracked_coin_count()
+        if room < len(fresh):
+            room += self.evict_cold(len(fresh) - room)
+        if room >= len(fresh):
+            return coin_ids
+        watched = set(self.watchlist)
+        fresh.sort(key=lambda c: c not in watched)
+        rejected = set(fresh[max(0, room):])
+        if not self.budget_warned:
+            self.budget_warned = True
+            self.report_error(f"Budget memori penuh ({self.coin_capacity} koin), {len(rejected)} koin ga ditampung",
+                              stage="memory")
+        return [c for c in coin_ids if c not in rejected]
+
+    def evict_cold(self, needed=0):
+        """Buang koin yang udah ga di watchlist: semua yang lewat TTL, plus yang paling lama ga di-update kalau butuh slot"""
+        with self.state_lock:
+            watched = set(self.watchlist)
+            cold = {c for store in self.coin_stores() for c in store.rows if c not in watched}
+            cold.update(c for c in self.last_prices if c not in watched)
+            now = time.time()
+            evicted = 0
+            for coin_id in sorted(cold, key=lambda c: self.crypto_data.last_touched(c) or 0):
+                if evicted >= needed and now - (self.crypto_data.last_touched(coin_id) or 0) < self.cold_ttl:
+                    break
+                self.evict_coin(coin_id)
+                evicted += 1
+            if evicted:
+                self.metrics.inc('evicted_coins_total', evicted)
+            return evicted
+
+    def maybe_evict_cold(self, interval=30):
+        """Sapu koin dingin & hitung ulang footprint memori, max sekali per `interval` detik"""
+        now = time.time()
+        if now - self.last_eviction < interval:
+            return
+        self.last_eviction = now
+        with self.state_lock:
+            self.evict_cold()
+            # mode headless ga pernah render, jadi koin yang dibuang juga dibersihin dari index urut di sini
+            self.update_sort_order()
+            for coin_id in [c for c in self.coin_versions if c not in self.crypto_data]:
+                del self.coin_versions[coin_id]
+            self.memory_report = self.memory_footprint()
+        self.metrics.set_gauge('memory_bytes', self.memory_report['total'])
+        self.metrics.set_gauge('tracked_coins', self.memory_report['coins'])
+
+    def memory_footprint(self):
+        """Perkiraan memori state koin (byte) per store, total, budget & jumlah slot"""
+        with self.state_lock:
+            stores = {
+                'records': self.crypto_data.nbytes(),
+                'history': self.price_history.nbytes(),
+                'candles': self.candles.nbytes(),
+                'indicators': self.indicators.nbytes(),
+                'last_prices': sys.getsizeof(self.last_prices)
             }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            return {
+                'stores': stores,
+                'total': sum(stores.values()),
+                'budget': self.memory_budget,
+                'coins': self.tracked_coin_count(),
+                'capacity': self.coin_capacity
+            }
+
+    def sync_watchlist(self, watchlist, coins=()):
+        """Samain watchlist, nama & ikon koin sama punya daemon; koin yang udah dihapus dibuang"""
+        with self.state_lock:
+            for coin_id, name, icon in coins:
+                self.coin_names[coin_id] = name
+                self.crypto_icons[coin_id] = icon
+            for coin_id in [c for c in self.watchlist if c not in watchlist]:
+                self.evict_coin(coin_id)
+            self.watchlist[:] = watchlist
+            if coins:
+                self.relabel_coins()
+
+    def load_remote_state(self, records, last_prices, coins, full):
+        """Masukin snapshot dari daemon: histori & candle ditimpa, record & last price diganti"""
+        with self.state_lock:
+            if full:
+                for coin_id in [c for c in self.crypto_data if c not in records]:
+                    self.evict_coin(coin_id)
+            if self.coin_capacity is not None:
+                allowed = set(self.admit_coins(list({**records, **coins})))
+                records = {c: r for c, r in records.items() if c in allowed}
+                coins = {c: v for c, v in coins.items() if c in allowed}
+            for coin_id, (history, candles) in coins.items():
+                if coin_id in self.price_history:
+                    del self.price_history[coin_id]
+                self.price_history.extend(coin_id, history)
+                for res, series in candles.items():
+                    self.candles.load(coin_id, res, series)
+            self.warm_indicators(list(coins))
+            self.last_prices.update(last_prices)
+            for coin_id, record in records.items():
+                self.crypto_data[coin_id] = record
+                self.mark_coin_changed(coin_id)
+            if self.portfolio is not None:
+                self.portfolio.update(records, self.crypto_data)
+            if records and self.first_data_at is None:
+                self.first_data_at = time.perf_counter()
+
+    def on_stream_quotes(self, quotes):
+        """Callback dari thread stream: langsung apply, atau dioper ke engine async"""
+        if self.quote_handoff is not None:
+            self.quote_handoff(quotes)
+        else:
+            self.apply_price_data(quotes, track_last=True, source=self.stream_source.name)
+
+    def maybe_refresh_fx(self):
+        """Refresh tabel kurs di background kalau udah basi, cuma kalau ada mata uang non-USD"""
+        if self.remote is not None or self.replay is not None or self.currencies == ['usd'] or not self.fx.is_stale():
+            return
+        if not self.scheduler.try_acquire():
+            return
+        self.fx.in_flight = True
+        future = self.get_fetch_pool().submit(self.fx.refresh)
+        future.add_done_callback(self._on_fx_refreshed)
+
+    def _on_fx_refreshed(self, future):
+        error = future.exception()
+        if error is not None:
+            self.fx.updated_at = time.time() - self.fx.ttl + 60
+            self.report_error(f"Gagal ambil kurs FX: {error}", stage="fx")
+
+    def maybe_refresh_universe(self):
+        """Load daftar semua koin (cache disk / /coins/list) di background kalau belum ada atau basi"""
+        if self.replay is not None or not self.universe.is_stale():
+            return
+        offline = self.remote is not None
+        if not offline and not self.scheduler.try_acquire():
+            return
+        self.universe.in_flight = True
+        future = self.get_fetch_pool().submit(self.universe.refresh, offline)
+        future.add_done_callback(self._on_universe_refreshed)
+
+    def _on_universe_refreshed(self, future):
+        error = future.exception()
+        if error is not None:
+            self.universe.updated_at = time.time() - self.universe.ttl + 300
+            self.report_error(f"Gagal ambil daftar koin: {error}", stage="universe")
+            return
+        self.relabel_coins()
+
+    def relabel_coins(self):
+        """Samain nama & ikon semua record sama sumber terbarunya (daftar koin, daemon, config)"""
+        with self.state_lock:
+            for coin_id in self.crypto_data:
+                if self.crypto_data.set_labels(coin_id, self.coin_name(coin_id), self.coin_icon(coin_id)):
+                    self.mark_coin_changed(coin_id)
+
+    def coin_name(self, coin_id):
+        """Nama asli dari daemon / daftar koin; fallback dari id (avalanche-2 -> Avalanche)"""
+        name = self.coin_names.get(coin_id) or self.universe.name(coin_id)
+        if name:
+            return name
+        words = coin_id.split('-')
+        if len(words) > 1 and words[-1].isdigit():
+            words = words[:-1]
+        return ' '.join(words).title()
+
+    def coin_icon(self, coin_id):
+        if coin_id in self.crypto_icons:
+            return self.crypto_icons[coin_id]
+        symbol = self.universe.symbol(coin_id)
+        return symbol.upper()[:5] if symbol else 'COIN'
+
+    def get_display_currency(self):
+        """Mata uang tampilan; balik ke USD kalau kursnya belum ada"""
+        if self.fx.rate(self.display_currency) is None:
+            return 'usd'
+        return self.display_currency
+
+    def cycle_display_currency(self):
+        """Ganti mata uang tampilan tanpa refetch, cukup invalidasi cache render"""
+        index = self.currencies.index(self.display_currency) if self.display_currency in self.currencies else -1
+        with self.state_lock:
+            self.display_currency = self.currencies[(index + 1) % len(self.currencies)]
+            self.table_cache = None
+            self.market_status_cache = None
+
+    def get_converted(self):
+        """Harga, volume & market cap semua koin di semua mata uang, satu pass vektor"""
+        key = (self.data_version, self.fx.version)
+        if self.converted_cache is not None and self.converted_cache[0] == key:
+            return self.converted_cache[1]
+
+        with self.state_lock:
+            coin_ids = list(self.crypto_data)
+            usd = np.column_stack([self.crypto_data.column(field, coin_ids)
+                                   for field in ('price', 'volume_24h', 'market_cap')]).reshape(len(coin_ids), 3)
+        # USD selalu ikut: itu fallback get_display_currency selama kurs belum datang
+        currencies = self.currencies if 'usd' in self.currencies else self.currencies + ['usd']
+        rates = np.array([self.fx.rate(c) or np.nan for c in currencies], dtype=np.float64)
+        converted = {
+            'index': {coin_id: i for i, coin_id in enumerate(coin_ids)},
+            'currencies': {c: i for i, c in enumerate(currencies)},
+            'values': usd[:, :, None] * rates[None, None, :]
+        }
+        self.converted_cache = (key, converted)
+        return converted
+
+    def convert(self, coin_id, currency):
+        """(price, volume, market_cap) satu koin di mata uang tertentu, ga perlu konversi koin lain"""
+        data = self.crypto_data[coin_id]
+        rate = self.fx.rate(currency) or float('nan')
+        return data['price'] * rate, data['volume_24h'] * rate, data['market_cap'] * rate
 
+    def get_fetch_pool(self):
+        if self.fetch_pool is None:
+            self.fetch_pool = ThreadPoolExecutor(max_workers=max(1, self.max_workers))
+        return self.fetch_pool
+
+    def begin_fetch(self):
+        """Mulai satu tick: simpen harga lama buat indikator ▲/▼"""
+        self.loading = True
+        with self.state_lock:
             for coin_id in self.crypto_data:
                 self.last_prices[coin_id] = self.crypto_data[coin_id].get('price', 0)
+        return {
+            'failed': False,
+            'status': None,
+            'retry_after': None,
+            'timing_mark': self.http.request_count,
+            'started': time.perf_counter()
+        }
+
+    def handle_batch_result(self, outcome, batch, data=None, error=None):
+        """Proses hasil satu batch, error dicatat ke outcome tanpa ganggu batch lain"""
+        try:
+            if error is not None:
+                raise error
+            self.apply_price_data(data)
+        except requests.exceptions.RequestException as e:
+            outcome['failed'] = True
+            response = getattr(e, 'response', None)
+            if response is not None:
+                outcome['status'] = max(outcome['status'] or 0, response.status_code)
+                if response.status_code == 429:
+                    self.metrics.inc('rate_limited_total')
+                wait = parse_retry_after(response.headers.get('Retry-After'))
+                if wait is not None:
+                    outcome['retry_after'] = max(outcome['retry_after'] or 0, wait)
+            self.report_error(f"Koneksi bermasalah nih ({len(batch)} koin): {e}")
+        except Exception as e:
+            self.report_error(f"Ada error ({len(batch)} koin): {e}")
 
-            for coin_id, info in data.items():
-                price = info.get('usd', 0)
+    def finish_fetch(self, outcome):
+        """Tutup satu tick: lapor ke scheduler & simpen timing HTTP"""
+        self.scheduler.record_result(
+            status=outcome['status'],
+            retry_after=outcome['retry_after'],
+            failed=outcome['failed'],
+            volatility=None if outcome['failed'] else self.get_market_volatility()
+        )
+        self.last_fetch_timing = self.http.summarize(self.http.timings_since(outcome['timing_mark']))
+        self.metrics.observe_since('fetch_tick_ms', outcome['started'])
+        self.metrics.inc('fetch_ticks_total', result="failed" if outcome['failed'] else "ok")
+        if self.tick_store is not None:
+            self.tick_store.flush()
+        self.loading = False
 
-                if coin_id not in self.price_history:
-                    self.price_history[coin_id] = []
-                self.price_history[coin_id].append(price)
-                if len(self.price_history[coin_id]) > 20:  
-                    self.price_history[coin_id].pop(0)
-                
-                self.crypto_data[coin_id] = {
-                    'name': coin_id.replace('-', ' ').title().replace('2', ''),
-                    'price': price,
-                    'change_24h': info.get('usd_24h_change', 0),
-                    'volume_24h': info.get('usd_24h_vol', 0),
-                    'market_cap': info.get('usd_market_cap', 0),
-                    'icon': self.crypto_icons.get(coin_id, 'COIN')
-                }
+    def fetch_crypto_data(self):
+        """Ambil data crypto dari API per batch secara paralel, batch yang gagal ga ngerusak yang lain"""
+        try:
+            batches = self.get_fetch_batches()
+            if not batches:
+                return
+
+            outcome = self.begin_fetch()
+            futures = {self.get_fetch_pool().submit(self.fetch_price_batch, batch): batch for batch in batches}
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    self.handle_batch_result(outcome, batch, error=e)
+                else:
+                    self.handle_batch_result(outcome, batch, data)
+            self.finish_fetch(outcome)
                 
-        except requests.exceptions.RequestException as e:
-            self.console.print(f"[red]Koneksi bermasalah nih: {e}[/red]")
         except Exception as e:
-            self.console.print(f"[red]Ada error: {e}[/red]")
+            self.report_error(f"Ada error: {e}")
         finally:
             self.loading = False
 
-    def format_number(self, num):
+    def get_market_volatility(self):
+        """Rata-rata perubahan harga (%) antar tick terakhir di semua koin"""
+        with self.state_lock:
+            _, moves = self.price_history.returns(1)
+        moves = np.abs(moves[~np.isnan(moves)])
+        return float(moves.mean()) if len(moves) else None
+
+    def get_market_momentum(self, window=20):
+        """Breadth (berapa koin di atas EMA) + rata-rata return window, buat verdict market"""
+        with self.state_lock:
+            coin_ids, ema = self.price_history.ema_values()
+            _, last = self.price_history.latest()
+            _, returns = self.price_history.returns(window - 1)
+        if not coin_ids:
+            return None
+        above = int((last > ema).sum())
+        below = int((last < ema).sum())
+        valid_returns = returns[~np.isnan(returns)]
+        return {
+            'coins': len(coin_ids),
+            'above_ema': above,
+            'below_ema': below,
+            'avg_return': float(valid_returns.mean()) if len(valid_returns) else 0.0
+        }
+
+    def format_number(self, num, currency=None):
         """Format angka besar jadi lebih readable"""
+        if num != num:
+            return "[dim]-[/dim]"
+        symbol = self.fx.symbol(currency) if currency else ""
         if num >= 1e12:
-            return f"[bright_blue]{num/1e12:.2f}T[/bright_blue]"
+            return f"[bright_blue]{symbol}{num/1e12:.2f}T[/bright_blue]"
         elif num >= 1e9:
-            return f"[bright_cyan]{num/1e9:.2f}B[/bright_cyan]"
+            return f"[bright_cyan]{symbol}{num/1e9:.2f}B[/bright_cyan]"
         elif num >= 1e6:
-            return f"[bright_magenta]{num/1e6:.2f}M[/bright_magenta]"
+            return f"[bright_magenta]{symbol}{num/1e6:.2f}M[/bright_magenta]"
         elif num >= 1e3:
-            return f"[bright_yellow]{num/1e3:.2f}K[/bright_yellow]"
+            return f"[bright_yellow]{symbol}{num/1e3:.2f}K[/bright_yellow]"
         else:
-            return f"[white]{num:.2f}[/white]"
+            return f"[white]{symbol}{num:.2f}[/white]"
+
+    def format_price(self, price, currency='usd'):
+        """Format harga sesuai mata uang (BTC 8 desimal, IDR tanpa desimal)"""
+        symbol = self.fx.symbol(currency)
+        if price < 0:
+            symbol = "-" + symbol
+            price = -price
+        if currency in ('btc', 'eth'):
+            return f"{symbol}{price:.8f}"
+        if currency == 'idr' and price >= 1:
+            return f"{symbol}{price:,.0f}"
+        if price < 1:
+            return f"{symbol}{price:.6f}"
+        return f"{symbol}{price:,.2f}"
 
     def create_animated_header(self):
         """Headers"""
@@ -169,9 +4413,28 @@ class CryptoTrackerGenZ:
         else:
             status_line.append("● ", style="bright_green")
             status_line.append("LIVE", style="bold bright_green")
+
+        last_error = self.metrics.errors[-1] if self.metrics.errors else None
+        if last_error is not None and time.time() - last_error['ts'] < 30 and not self.show_debug:
+            status_line.append(f" | ERROR: {last_error['message'][:60]} (M = detail)", style="bright_red")
+
+        alert = self.alerts.latest() if self.alerts is not None else None
+        if alert is not None and time.time() - alert['ts'] < 30:
+            status_line.append(f" | ALERT: {alert['message']}", style="bold bright_red")
+
+        if self.stream_source is not None:
+            if self.stream_source.connected:
+                streamed = len(self.stream_source.covered_coins())
+                status_line.append(f" | STREAM {streamed} koin", style="bold bright_yellow")
+            else:
+                status_line.append(" | STREAM putus, pakai REST", style="bright_red")
         
         status_line.append(f" | {current_time} | ", style="dim white")
         status_line.append(f"{len(self.watchlist)} koin ditrack", style="bright_cyan")
+        currency = self.get_display_currency()
+        status_line.append(f" | {currency.upper()}", style="bold bright_yellow")
+        if currency != self.display_currency:
+            status_line.append(f" (kurs {self.display_currency.upper()} belum ada)", style="dim white")
         
         header_content = Align.center(
             Text.assemble(title_text, "\n", status_line)
@@ -184,105 +4447,532 @@ class CryptoTrackerGenZ:
             box=DOUBLE
         )
 
+    def sort_values(self, coin_ids):
+        """Nilai kolom urut buat koin-koin ini; NaN jadi -inf biar bisect tetap konsisten"""
+        column = self.sort_column
+        if column == 'name':
+            return {coin_id: self.crypto_data[coin_id]['name'].lower() for coin_id in coin_ids}
+        if column == 'volatility':
+            ids, values = self.price_history.volatility(20, coin_ids)
+            values = dict(zip(ids, np.nan_to_num(values, nan=-np.inf).tolist()))
+            return {coin_id: values.get(coin_id, -np.inf) for coin_id in coin_ids}
+        values = np.nan_to_num(self.crypto_data.column(column, coin_ids), nan=-np.inf)
+        return dict(zip(coin_ids, values.tolist()))
+
+    def rebuild_sort_index(self):
+        """Bangun ulang index urut dari nol (pas ganti kolom urut)"""
+        values = self.sort_values(list(self.crypto_data))
+        self.sort_keys = {coin_id: (value, coin_id) for coin_id, value in values.items()}
+        self.sorted_keys = sorted(self.sort_keys.values())
+        for coin_id in self.dirty_coins:
+            if coin_id not in self.crypto_data:
+                self.row_cache.pop(coin_id, None)
+                self.coin_versions.pop(coin_id, None)
+        self.dirty_coins.clear()
+
+    def update_sort_order(self):
+        """Index urut (naik, dibaca kebalik kalau turun) dijaga incremental: cuma koin yang berubah yang dipindah"""
+        if not self.dirty_coins:
+            return
+        values = self.sort_values([c for c in self.dirty_coins if c in self.crypto_data])
+        for coin_id in self.dirty_coins:
+            old_key = self.sort_keys.pop(coin_id, None)
+            if old_key is not None:
+                index = bisect.bisect_left(self.sorted_keys, old_key)
+                if index < len(self.sorted_keys) and self.sorted_keys[index] == old_key:
+                    del self.sorted_keys[index]
+            if coin_id in values:
+                new_key = (values[coin_id], coin_id)
+                bisect.insort(self.sorted_keys, new_key)
+                self.sort_keys[coin_id] = new_key
+            else:
+                self.row_cache.pop(coin_id, None)
+                self.coin_versions.pop(coin_id, None)
+        self.dirty_coins.clear()
+
+    def toggle_indicator_columns(self):
+        """Kolom indikator (RSI, MACD, %B Bollinger, jarak ke VWAP) di tabel: semua / ga ada"""
+        with self.state_lock:
+            self.indicator_columns = () if self.indicator_columns else self.indicator_column_names
+            self.table_cache = None
+
+    def cycle_sort_column(self):
+        """Ganti kolom urut (market cap -> harga -> 24h -> volume -> volatilitas -> nama)"""
+        with self.state_lock:
+            index = self.sort_columns.index(self.sort_column)
+            self.sort_column = self.sort_columns[(index + 1) % len(self.sort_columns)]
+            self.sort_descending = self.sort_column != 'name'
+            self.rebuild_sort_index()
+            self.table_offset = 0
+            self.table_cache = None
+
+    def toggle_sort_order(self):
+        with self.state_lock:
+            self.sort_descending = not self.sort_descending
+            self.table_offset = 0
+            self.table_cache = None
+
+    def scroll_table(self, rows=0, to=None):
+        """Geser viewport tabel sekian baris, atau langsung ke 'home'/'end'"""
+        with self.state_lock:
+            last = max(0, len(self.sort_keys) - self.table_rows)
+            if to == 'home':
+                offset = 0
+            elif to == 'end':
+                offset = last
+            else:
+                offset = self.table_offset + rows
+            self.table_offset = max(0, min(offset, last))
+
+    def get_table_viewport(self):
+        """Jumlah baris koin yang muat di slot tabel (tinggi terminal dikurangin panel lain)"""
+        height = self.console.size.height
+        if self.layout is not None:
+            height -= sum(child.size or 0 for child in self.layout.children if child.name != 'main' and child.visible)
+        # judul, border atas, header, garis header, border bawah, caption; tiap koin = baris + garis pemisah
+        return max(1, (height - 5) // 2)
+
+    def build_indicator_cells(self, index, values):
+        """Sel kolom indikator satu koin dari hasil IndicatorEngine.values"""
+        cells = []
+        for column in self.indicator_columns:
+            if column == 'rsi':
+                rsi = values['rsi'][index]
+                style = "bright_red" if rsi > 70 else "bright_green" if rsi < 30 else "white"
+                cells.append(f"[{style}]{rsi:.0f}[/{style}]" if rsi == rsi else "[dim]-[/dim]")
+            elif column == 'macd':
+                histogram = values['histogram'][index] / values['price'][index] * 100
+                style = "bright_green" if histogram > 0 else "bright_red"
+                cells.append(f"[{style}]{histogram:+.2f}%[/{style}]" if histogram == histogram else "[dim]-[/dim]")
+            elif column == 'bb':
+                percent_b = values['percent_b'][index]
+                style = "bright_red" if percent_b > 1 else "bright_green" if percent_b < 0 else "white"
+                cells.append(f"[{style}]{percent_b:.2f}[/{style}]" if percent_b == percent_b else "[dim]-[/dim]")
+            elif column == 'vwap':
+                distance = (values['price'][index] / values['vwap'][index] - 1) * 100
+                style = "bright_green" if distance >= 0 else "bright_red"
+                cells.append(f"[{style}]{distance:+.2f}%[/{style}]" if distance == distance else "[dim]-[/dim]")
+        return tuple(cells)
+
+    def build_row_cells(self, coin_id, data, trends, currency='usd'):
+        """Format sel satu baris (selain rank & indikator), hasilnya di-cache per versi koin & mata uang"""
+        change_indicator = self.get_price_change_indicator(coin_id, data['price'])
+        price, volume, market_cap = self.convert(coin_id, currency)
+        price_text = self.format_price(price, currency)
+        
+        change = data['change_24h']
+        if change > 5:
+            change_style = "bold bright_green"
+            change_icon = "PUMP"
+        elif change > 0:
+            change_style = "bright_green"
+            change_icon = "UP"
+        elif change > -5:
+            change_style = "bright_red"
+            change_icon = "DOWN"
+        else:
+            change_style = "bold bright_red"
+            change_icon = "DUMP"
+        
+        change_text = f"[{change_style}]{change_icon} {change:+.2f}%[/{change_style}]"
+        trend = trends.get(coin_id, "━━━")
+        
+        return (
+            f"{price_text} {change_indicator}",
+            f"[dim]{trend}[/dim]",
+            change_text,
+            self.format_number(volume, currency),
+            self.format_number(market_cap, currency)
+        )
+
     def create_crypto_table(self):
-        """Table crypto yang clean dan informatif"""
+        """Table crypto virtual: cuma baris yang keliatan di layar yang dibangun, dipakai ulang kalau ga berubah"""
+        currency = self.get_display_currency()
+        self.table_rows = self.get_table_viewport()
+        self.update_sort_order()
+        total = len(self.sorted_keys)
+        self.table_offset = max(0, min(self.table_offset, total - self.table_rows))
+        cache_key = (self.data_version, currency, self.fx.version, self.trend_timeframe, self.indicator_columns,
+                     self.sort_column, self.sort_descending, self.table_offset, self.table_rows)
+        if self.table_cache is not None and self.table_cache[0] == cache_key:
+            return self.table_cache[1]
+
+        start = time.perf_counter()
+        first, last = self.table_offset, min(total, self.table_offset + self.table_rows)
+        arrow = "▼" if self.sort_descending else "▲"
+        sort_labels = {
+            'market_cap': "market cap", 'price': "harga", 'change_24h': "24h",
+            'volume_24h': "volume", 'volatility': "volatilitas", 'name': "nama"
+        }
         table = Table(
             title="[bold bright_cyan]DATA MARKET REAL-TIME[/bold bright_cyan]",
             title_style="bold",
+            caption=f"[dim]{first + 1 if total else 0}-{last} dari {total} koin | urut {sort_labels[self.sort_column]} "
+                    f"{arrow} | J/K gulir, N/P halaman, S urut, O balik[/dim]",
             box=ROUNDED,
             header_style="bold bright_white on blue",
             show_lines=True
         )
-        
-        table.add_column("KOIN", style="bright_cyan", no_wrap=True, width=12)
-        table.add_column("HARGA", justify="right", style="bright_green", width=15)
-        table.add_column("TREND", justify="center", width=8)
-        table.add_column("24H", justify="right", width=12)
-        table.add_column("VOLUME", justify="right", style="bright_blue", width=12)
-        table.add_column("MARKET CAP", justify="right", style="bright_yellow", width=12)
-
-        sorted_coins = sorted(
-            self.crypto_data.items(),
-            key=lambda x: x[1].get('market_cap', 0),
-            reverse=True
-        )
-        
-        for i, (coin_id, data) in enumerate(sorted_coins):
 
-            rank_indicators = ["#1", "#2", "#3"] + [f"#{i+1}" for i in range(3, 10)]
-            rank = rank_indicators[i] if i < len(rank_indicators) else f"#{i+1}"
+        def header(label, column):
+            return f"{label} {arrow}" if self.sort_column == column else label
+
+        table.add_column(header("KOIN", 'name'), style="bright_cyan", no_wrap=True, width=12)
+        table.add_column(header(f"HARGA ({currency.upper()})", 'price'), justify="right", style="bright_green", width=17, no_wrap=True)
+        trend_label = "TREND" if self.trend_timeframe == 'tick' else f"TREND {self.trend_timeframe}"
+        table.add_column(trend_label, justify="center", width=self.get_trend_width() + 3, no_wrap=True)
+        table.add_column(header("24H", 'change_24h'), justify="right", width=12, no_wrap=True)
+        table.add_column(header("VOLUME", 'volume_24h'), justify="right", style="bright_blue", width=12, no_wrap=True)
+        table.add_column(header("MARKET CAP", 'market_cap'), justify="right", style="bright_yellow", width=12, no_wrap=True)
+        indicator_labels = {'rsi': "RSI", 'macd': "MACD", 'bb': "%B", 'vwap': "VWAP"}
+        for column in self.indicator_columns:
+            table.add_column(indicator_labels[column], justify="right", width=8, no_wrap=True)
+        if self.sort_column == 'volatility':
+            table.add_column(header("VOLATIL", 'volatility'), justify="right", style="bright_magenta", width=10, no_wrap=True)
+
+        if self.sort_descending:
+            visible = self.sorted_keys[total - last:total - first][::-1]
+        else:
+            visible = self.sorted_keys[first:last]
+        render_key = (currency, self.fx.version, self.trend_timeframe, self.indicator_columns)
+        stale = [c for _, c in visible
+                 if self.row_cache.get(c, (None,))[0] != (self.coin_versions.get(c, 0),) + render_key]
+        trends = self.get_trend_animations(coin_ids=stale) if stale else None
+        if stale and self.indicator_columns:
+            indicator_ids, indicator_values = self.indicators.values(stale)
+            indicator_index = {coin_id: i for i, coin_id in enumerate(indicator_ids)}
+
+        for i, (value, coin_id) in enumerate(visible, first + 1):
+            data = self.crypto_data[coin_id]
+            version = (self.coin_versions.get(coin_id, 0),) + render_key
+            cached = self.row_cache.get(coin_id)
+            if cached is None or cached[0] != version:
+                cells = self.build_row_cells(coin_id, data, trends, currency)
+                if self.indicator_columns:
+                    if coin_id in indicator_index:
+                        cells += self.build_indicator_cells(indicator_index[coin_id], indicator_values)
+                    else:
+                        cells += ("[dim]-[/dim]",) * len(self.indicator_columns)
+                cached = (version, cells)
+                self.row_cache[coin_id] = cached
+
+            cells = cached[1]
+            if self.sort_column == 'volatility':
+                cells += (f"{value:.2f}%" if value > -np.inf else "-",)
+            table.add_row(f"#{i} {data['icon']}", *cells)
         
-            price = data['price']
-            change_indicator = self.get_price_change_indicator(coin_id, price)
-            
-            if price < 1:
-                price_text = f"${price:.6f}"
-            else:
-                price_text = f"${price:,.2f}"
-            
-            change = data['change_24h']
-            if change > 5:
-                change_style = "bold bright_green"
-                change_icon = "PUMP"
-            elif change > 0:
-                change_style = "bright_green"
-                change_icon = "UP"
-            elif change > -5:
-                change_style = "bright_red"
-                change_icon = "DOWN"
+        self.table_cache = (cache_key, table)
+        self.metrics.observe_since('table_build_ms', start)
+        return table
+
+    def create_portfolio_panel(self, max_rows=6):
+        """Panel portfolio: total nilai & P&L plus posisi terbesar, cache per versi portfolio"""
+        currency = self.get_display_currency()
+        cache_key = (self.portfolio.version, currency, self.fx.version)
+        if self.portfolio_cache is not None and self.portfolio_cache[0] == cache_key:
+            return self.portfolio_cache[1]
+
+        rate = self.fx.rate(currency) or 1.0
+        summary = self.portfolio.summary()
+        pnl_style = "bright_green" if summary['unrealized'] >= 0 else "bright_red"
+        title = (f"[bold bright_cyan]PORTFOLIO[/bold bright_cyan] "
+                 f"{self.format_price(summary['value'] * rate, currency)} | "
+                 f"[{pnl_style}]P&L {self.format_price(summary['unrealized'] * rate, currency)}[/{pnl_style}]")
+        if summary['realized']:
+            title += f" | realized {self.format_price(summary['realized'] * rate, currency)}"
+
+        table = Table(box=MINIMAL, header_style="bold bright_white", expand=True, show_edge=False)
+        table.add_column("KOIN", style="bright_cyan", no_wrap=True)
+        table.add_column("JUMLAH", justify="right")
+        table.add_column(f"NILAI ({currency.upper()})", justify="right", style="bright_green")
+        table.add_column("P&L", justify="right")
+        table.add_column("P&L %", justify="right")
+        table.add_column("BOBOT", justify="right", style="bright_yellow")
+
+        unrealized = self.portfolio.unrealized()
+        weights = self.portfolio.weights()
+        order = np.argsort(-self.portfolio.value, kind='stable')[:max_rows]
+        for row in order.tolist():
+            coin_id = self.portfolio.coins[row]
+            data = self.crypto_data.get(coin_id)
+            icon = data['icon'] if data else self.coin_icon(coin_id)
+            cost = self.portfolio.cost[row]
+            if np.isnan(unrealized[row]):
+                value_cell = pnl_cell = pct_cell = "[dim]-[/dim]"
             else:
-                change_style = "bold bright_red"
-                change_icon = "DUMP"
-            
-            change_text = f"[{change_style}]{change_icon} {change:+.2f}%[/{change_style}]"
-            trend = self.get_trend_animation(coin_id)
-            
+                style = "bright_green" if unrealized[row] >= 0 else "bright_red"
+                pnl_cell = f"[{style}]{self.format_price(unrealized[row] * rate, currency)}[/{style}]"
+                pct_cell = f"[{style}]{unrealized[row] / cost * 100:+.2f}%[/{style}]" if cost else "-"
+                value_cell = self.format_price(self.portfolio.value[row] * rate, currency)
             table.add_row(
-                f"{rank} {data['icon']}",
-                f"{price_text} {change_indicator}",
-                f"[dim]{trend}[/dim]",
-                change_text,
-                self.format_number(data['volume_24h']),
-                self.format_number(data['market_cap'])
+                icon,
+                f"{self.portfolio.quantity[row]:,.6g}",
+                value_cell,
+                pnl_cell,
+                pct_cell,
+                f"{weights[row] * 100:.1f}%"
             )
-        
-        return table
+
+        panel = Panel(table, title=title, box=ROUNDED, style="bright_cyan")
+        self.portfolio_cache = (cache_key, panel)
+        return panel
 
     def create_progress_panel(self):
         """Panel progress yang smooth"""
-        elapsed = time.time() % self.update_interval
-        progress_percent = (elapsed / self.update_interval) * 100
+        if self.remote is not None or self.replay is not None:
+            status = self.create_remote_status() if self.remote is not None else self.create_replay_status()
+            return Panel(
+                Align.center(Text.assemble(status, "\n", self.create_market_status())),
+                title="[bold bright_blue]Status Market & Daemon[/bold bright_blue]" if self.remote is not None
+                else "[bold bright_blue]Status Market & Replay[/bold bright_blue]",
+                border_style="bright_blue",
+                box=MINIMAL
+            )
+        fraction, remaining = self.scheduler.progress()
+        progress_percent = fraction * 100
+        status = self.scheduler.status()
 
         bar_length = 30
         filled_length = int(bar_length * progress_percent // 100)
         bar = '█' * filled_length + '░' * (bar_length - filled_length)
+        bar_style = "bright_red" if status['backoff'] else "bright_green"
         
         progress_text = Text()
         progress_text.append("Next Update: ", style="bright_white")
-        progress_text.append(f"[bright_green]{bar}[/bright_green] ")
-        progress_text.append(f"{progress_percent:.0f}%", style="bright_yellow")
+        progress_text.append(f"{bar} ", style=bar_style)
+        progress_text.append(f"{remaining:.0f}s", style="bright_yellow")
+        progress_text.append(f" | {status['decision']}", style="bright_cyan")
+
+        quota_text = Text(f"Kuota {status['tokens']:.1f}/{status['capacity']} | ", style="dim white")
+        content = Text.assemble(progress_text, "\n", self.create_market_status(), "\n", quota_text, self.create_http_status())
+        if isinstance(self.price_source, AggregatedPriceSource):
+            content = Text.assemble(content, "\n", self.create_provider_status())
+        
+        return Panel(
+            Align.center(content),
+            title="[bold bright_blue]Status Market & Update[/bold bright_blue]",
+            border_style="bright_blue",
+            box=MINIMAL
+        )
+
+    def create_market_status(self):
+        """Verdict market + total volume; agregat semua koin, jadi dihitung ulang maksimal sekali per detik"""
+        currency = self.get_display_currency()
+        cache_key = (self.data_version, currency, self.fx.version)
+        cached = self.market_status_cache
+        if cached is not None and (cached[0] == cache_key or
+                                   (cached[0][1:] == cache_key[1:] and time.time() - cached[2] < 1.0)):
+            return cached[1]
 
-        total_volume = sum(data.get('volume_24h', 0) for data in self.crypto_data.values())
-        avg_change = sum(data.get('change_24h', 0) for data in self.crypto_data.values()) / len(self.crypto_data) if self.crypto_data else 0
+        converted = self.get_converted()
+        total_volume = float(converted['values'][:, 1, converted['currencies'][currency]].sum())
+        with self.state_lock:
+            avg_change = float(self.crypto_data.column('change_24h').mean()) if self.crypto_data else 0
         
+        momentum = self.get_market_momentum()
+        bullish_trend = bearish_trend = False
+        if momentum:
+            bullish_trend = momentum['above_ema'] >= 0.7 * momentum['coins'] and momentum['avg_return'] > 0
+            bearish_trend = momentum['below_ema'] >= 0.7 * momentum['coins'] and momentum['avg_return'] < 0
+
         market_status = Text()
-        if avg_change > 2:
+        if avg_change > 2 or (bullish_trend and avg_change > -2):
             market_status.append("MARKET BULLISH", style="bold bright_green")
-        elif avg_change < -2:
+        elif avg_change < -2 or (bearish_trend and avg_change < 2):
             market_status.append("MARKET BEARISH", style="bold bright_red")
         else:
             market_status.append("MARKET SIDEWAYS", style="bright_yellow")
+
+        if momentum:
+            market_status.append(f" | Di atas EMA: {momentum['above_ema']}/{momentum['coins']}", style="bright_cyan")
         
-        market_status.append(f" | Total Volume: {self.format_number(total_volume)}", style="dim white")
-        
-        content = Text.assemble(progress_text, "\n", market_status)
-        
-        return Panel(
-            Align.center(content),
-            title="[bold bright_blue]Status Market & Update[/bold bright_blue]",
-            border_style="bright_blue",
+        market_status.append(f" | Total Volume: {self.format_number(total_volume, currency)}", style="dim white")
+        self.market_status_cache = (cache_key, market_status, time.time())
+        return market_status
+
+    def create_breadth_panel(self, top=8, window=60):
+        """Market breadth dari indikator semua koin + korelasi return koin-koin terbesar, maksimal sekali per detik"""
+        cached = self.breadth_cache
+        if cached is not None and (cached[0] == self.data_version or time.time() - cached[2] < 1.0):
+            return cached[1]
+
+        with self.state_lock:
+            coin_ids, values = self.indicators.values()
+            changes = self.crypto_data.column('change_24h')
+            market_caps = np.nan_to_num(self.crypto_data.column('market_cap'), nan=-np.inf)
+            market_caps = dict(zip(self.crypto_data, market_caps.tolist()))
+            largest = heapq.nlargest(top, market_caps, key=market_caps.get)
+            correlated_ids, matrix = self.price_history.correlation(window, largest)
+
+        advancing, declining = int((changes > 0).sum()), int((changes < 0).sum())
+        breadth_text = Text()
+        breadth_text.append(f"Naik 24h: {advancing}", style="bright_green")
+        breadth_text.append(f" | Turun: {declining}", style="bright_red")
+        breadth_text.append(f" | Rasio A/D: {advancing / declining:.2f}" if declining else " | Rasio A/D: -", style="bright_cyan")
+
+        rsi = values['rsi'][~np.isnan(values['rsi'])]
+        indicator_text = Text()
+        if len(rsi):
+            indicator_text.append(f"RSI >70: {int((rsi > 70).sum())}", style="bright_red")
+            indicator_text.append(f" | RSI <30: {int((rsi < 30).sum())}", style="bright_green")
+            indicator_text.append(f" | rata-rata RSI {rsi.mean():.1f}", style="white")
+        else:
+            indicator_text.append("RSI: nunggu 14 tick", style="dim white")
+        histogram = values['histogram'][~np.isnan(values['histogram'])]
+        if len(histogram):
+            indicator_text.append(f" | MACD bullish: {int((histogram > 0).sum())}/{len(histogram)}", style="bright_cyan")
+        with np.errstate(invalid='ignore'):
+            above_vwap = int((values['price'] > values['vwap']).sum())
+            outside = values['percent_b'][~np.isnan(values['percent_b'])]
+        indicator_text.append(f" | Di atas VWAP: {above_vwap}/{len(coin_ids)}", style="bright_yellow")
+        if len(outside):
+            indicator_text.append(f" | Keluar band: ▲{int((outside > 1).sum())} ▼{int((outside < 0).sum())}",
+                                  style="bright_magenta")
+
+        correlation_text = Text()
+        if len(correlated_ids) >= 2:
+            upper = np.triu_indices(len(correlated_ids), k=1)
+            pairs = matrix[upper]
+            high, low = int(np.argmax(pairs)), int(np.argmin(pairs))
+            icons = [self.crypto_data[c]['icon'] for c in correlated_ids]
+            correlation_text.append(f"Korelasi top {len(correlated_ids)} ({window} tick): rata-rata {pairs.mean():+.2f}",
+                                    style="white")
+            correlation_text.append(f" | paling nempel {icons[upper[0][high]]}/{icons[upper[1][high]]} {pairs[high]:+.2f}",
+                                    style="bright_green")
+            correlation_text.append(f" | paling beda {icons[upper[0][low]]}/{icons[upper[1][low]]} {pairs[low]:+.2f}",
+                                    style="bright_red")
+        else:
+            correlation_text.append(f"Korelasi: nunggu {window + 1} tick histori", style="dim white")
+
+        panel = Panel(
+            Align.center(Text.assemble(breadth_text, "\n", indicator_text, "\n", correlation_text)),
+            title="[bold bright_magenta]Market Breadth[/bold bright_magenta]",
+            border_style="bright_magenta",
             box=MINIMAL
         )
+        self.breadth_cache = (self.data_version, panel, time.time())
+        return panel
+
+    def create_debug_panel(self):
+        """Panel debug: p50/p99 tiap stage, counter error/429, dan error terakhir"""
+        stages = [
+            ('http_request_ms', "HTTP"), ('json_parse_ms', "parse"), ('fetch_tick_ms', "tick"),
+            ('apply_ms', "apply"), ('table_build_ms', "tabel"), ('layout_build_ms', "layout"), ('frame_ms', "frame")
+        ]
+        timing_text = Text()
+        for name, label in stages:
+            p50 = self.metrics.percentile(name, 0.5)
+            if p50 is None:
+                continue
+            p99 = self.metrics.percentile(name, 0.99)
+            timing_text.append(f"{label} ", style="bright_cyan")
+            timing_text.append(f"{p50:.1f}/{p99:.1f}ms  ", style="white")
+        bytes_p50 = self.metrics.percentile('http_response_bytes', 0.5)
+        if bytes_p50 is not None:
+            timing_text.append("body ", style="bright_cyan")
+            timing_text.append(f"{bytes_p50 / 1024:.1f}KB", style="white")
+
+        counter_text = Text()
+        counter_text.append(f"Request {self.metrics.counter('http_requests_total')}", style="dim white")
+        counter_text.append(f" | Error {self.metrics.counter('errors_total')}",
+                            style="bright_red" if self.metrics.counter('errors_total') else "dim white")
+        counter_text.append(f" | 429 {self.metrics.counter('rate_limited_total')}",
+                            style="bright_red" if self.metrics.counter('rate_limited_total') else "dim white")
+        if self.metrics_server is not None:
+            counter_text.append(f" | {self.metrics_server.address}", style="dim white")
+        if self.profiler is not None:
+            counter_text.append(f" | profil {self.profiler.frames} frame", style="dim white")
+        report = self.memory_report
+        if report is not None:
+            budget = f"/{report['budget'] / 2**20:.0f}" if report['budget'] else ""
+            capacity = f"/{report['capacity']}" if report['capacity'] else ""
+            counter_text.append(f" | memori {report['total'] / 2**20:.1f}{budget}MB ({report['coins']}{capacity} koin)",
+                                style="dim white")
+
+        lines = [timing_text, counter_text]
+        for error in list(self.metrics.errors)[-3:]:
+            error_text = Text()
+            error_text.append(datetime.fromtimestamp(error['ts']).strftime("%H:%M:%S "), style="dim white")
+            error_text.append(f"[{error['stage']}] ", style="bright_yellow")
+            error_text.append(error['message'][:100], style="bright_red")
+            lines.append(error_text)
+
+        return Panel(
+            Text("\n").join(lines),
+            title="[bold bright_cyan]DEBUG[/bold bright_cyan] [dim](p50/p99)[/dim]",
+            border_style="bright_yellow"
+        )
+
+    def create_provider_status(self):
+        """Health tiap provider + berapa koin yang datanya basi (ga ke-update 2x interval)"""
+        provider_text = Text("Provider: ", style="dim white")
+        last_tick = self.price_source.last_tick
+        for health in self.price_source.status():
+            name = health['name']
+            if name in last_tick.get('providers', {}):
+                provider_text.append(f"{name} {last_tick['providers'][name]:.0f}ms ", style="bright_green")
+            elif name in last_tick.get('late', []):
+                provider_text.append(f"{name} telat ", style="bright_yellow")
+            elif not health['healthy']:
+                provider_text.append(f"{name} off ", style="bright_red")
+            else:
+                provider_text.append(f"{name} ", style="dim white")
+            provider_text.append(f"({health['score']:.0%}) ", style="dim white")
+
+        limit = self.clock() - 2 * self.scheduler.interval
+        with self.state_lock:
+            stale = int((self.crypto_data.column('updated_at') < limit).sum())
+        if stale:
+            provider_text.append(f"| basi {stale} koin", style="bright_red")
+        return provider_text
+
+    def create_remote_status(self):
+        """Status koneksi ke daemon: nyambung/putus, tick terakhir & total byte yang diterima"""
+        remote = self.remote
+        remote_text = Text("Daemon: ", style="bright_white")
+        if remote.connected:
+            remote_text.append(f"{remote.label} ", style="bright_green")
+        else:
+            remote_text.append(f"{remote.label} putus, nyambung ulang... ", style="bright_red")
+        if remote.last_message_at is not None:
+            remote_text.append(f"| tick #{remote.seq} {time.time() - remote.last_message_at:.0f}s lalu ",
+                               style="bright_cyan")
+        remote_text.append(f"| diterima {remote.received_bytes / 1024:.0f} KB", style="dim white")
+        return remote_text
+
+    def create_replay_status(self):
+        """Status replay: sumber, speed, posisi jam replay & throughput quote"""
+        replay = self.replay
+        stats = replay.stats()
+        speed = f"{replay.speed:g}x" if replay.speed else "max"
+        replay_text = Text("Replay: ", style="bright_white")
+        replay_text.append(f"{replay.label} {speed} ", style="bright_green" if not replay.finished else "bright_yellow")
+        if replay.sim_time is not None:
+            replay_text.append(f"| {datetime.fromtimestamp(replay.sim_time).strftime('%Y-%m-%d %H:%M:%S')} ",
+                               style="bright_cyan")
+        replay_text.append(f"| {stats['ticks']} tick {stats['quotes_per_s']:,.0f} quote/s", style="dim white")
+        if replay.finished:
+            replay_text.append(" | selesai", style="bright_yellow")
+        return replay_text
+
+    def create_http_status(self):
+        """Info timing HTTP refresh terakhir, biar keliatan hemat handshake-nya"""
+        http_text = Text()
+        timing = self.last_fetch_timing
+        if not timing or not timing['requests']:
+            http_text.append("HTTP: belum ada request", style="dim white")
+            return http_text
+
+        http_text.append(f"HTTP: {timing['requests']} req {timing['total_ms']:.0f}ms", style="dim white")
+        http_text.append(f" | reuse {timing['reused']}/{timing['requests']}", style="bright_cyan")
+        if timing['avg_reused_ms'] is not None and timing['avg_new_ms'] is not None:
+            saved = timing['avg_new_ms'] - timing['avg_reused_ms']
+            http_text.append(f" | hemat ~{saved:.0f}ms/req", style="bright_green")
+        elif timing['avg_reused_ms'] is not None:
+            http_text.append(f" | avg {timing['avg_reused_ms']:.0f}ms", style="bright_green")
+        if timing['cached']:
+            http_text.append(f" | cache {timing['cached']}", style="bright_yellow")
+        return http_text
 
     def create_controls_panel(self):
         """Panel kontrol yang clean"""
@@ -290,7 +4980,13 @@ class CryptoTrackerGenZ:
             ("KELUAR", "Tekan 'Q'", "bright_red"),
             ("REFRESH", "Tekan 'R'", "bright_green"),
             ("TAMBAH", "Tekan 'A'", "bright_yellow"),
-            ("HAPUS", "Tekan 'D'", "bright_magenta")
+            ("HAPUS", "Tekan 'D'", "bright_magenta"),
+            ("MATA UANG", "Tekan 'C'", "bright_blue"),
+            ("TREND", "Tekan 'T'", "bright_green"),
+            ("URUT", "'S' / 'O'", "bright_cyan"),
+            ("GULIR", "J/K N/P", "bright_yellow"),
+            ("INDIKATOR", "'I' / 'B'", "bright_magenta"),
+            ("DEBUG", "Tekan 'M'", "bright_white")
         ]
         
         controls_columns = []
@@ -315,6 +5011,14 @@ class CryptoTrackerGenZ:
         footer_text.append("Real-time Crypto Tracker", style="bright_cyan")
         footer_text.append(" | ", style="dim white")
         footer_text.append("Dibuat dengan Python", style="dim white")
+
+        report = self.startup_report()
+        if 'first_frame_ms' in report:
+            footer_text.append(
+                f" | Startup: import {report['import_ms'] + report.get('rich_import_ms', 0):.0f}ms, "
+                f"data {report['first_data_ms']:.0f}ms",
+                style="dim bright_cyan"
+            )
         
         return Panel(
             Align.center(footer_text),
@@ -323,71 +5027,165 @@ class CryptoTrackerGenZ:
         )
 
     def create_layout(self):
-        """Layout utama yang terorganisir"""
-        layout = Layout()
-        
-        layout.split_column(
-            Layout(self.create_animated_header(), size=5, name="header"),
-            Layout(self.create_crypto_table(), name="main"),
-            Layout(self.create_progress_panel(), size=4, name="progress"),
-            Layout(self.create_controls_panel(), size=6, name="controls"),
-            Layout(self.create_footer_panel(), size=3, name="footer")
-        )
-        
-        return layout
+        """Layout utama yang terorganisir; dibangun sekali, slot-nya di-update per frame"""
+        load_rich()
+        start = time.perf_counter()
+        with self.state_lock:
+            if self.layout is None:
+                self.layout = Layout()
+                sections = [
+                    Layout(name="header", size=5),
+                    Layout(name="main"),
+                    Layout(name="progress", size=6 if isinstance(self.price_source, AggregatedPriceSource) else 5),
+                    Layout(self.create_controls_panel(), size=6, name="controls"),
+                    Layout(self.create_footer_panel(), size=3, name="footer")
+                ]
+                if self.portfolio is not None:
+                    sections.insert(2, Layout(name="portfolio", size=min(len(self.portfolio.coins), 6) + 4))
+                sections.insert(-2, Layout(name="breadth", size=5, visible=self.show_breadth))
+                sections.insert(-2, Layout(name="debug", size=7, visible=self.show_debug))
+                self.layout.split_column(*sections)
+
+            self.layout["breadth"].visible = self.show_breadth
+            self.layout["debug"].visible = self.show_debug
+            self.layout["header"].update(self.create_animated_header())
+            self.layout["main"].update(self.create_crypto_table())
+            if self.portfolio is not None:
+                self.layout["portfolio"].update(self.create_portfolio_panel())
+            if self.show_breadth:
+                self.layout["breadth"].update(self.create_breadth_panel())
+            if self.show_debug:
+                self.layout["debug"].update(self.create_debug_panel())
+            self.layout["progress"].update(self.create_progress_panel())
+
+            if self.first_data_at is not None and self.first_frame_at is None:
+                self.first_frame_at = time.perf_counter()
+                self.layout["footer"].update(self.create_footer_panel())
+
+        self.metrics.observe_since('layout_build_ms', start)
+        return self.layout
+
+    def render_frame(self, live):
+        """Bangun layout + gambar ke terminal, dicatat sebagai frame_ms (opsional di-profile)"""
+        if self.profiler is not None:
+            self.profiler.start()
+        start = time.perf_counter()
+        live.update(self.create_layout(), refresh=True)
+        elapsed_ms = self.metrics.observe_since('frame_ms', start)
+        if self.profiler is not None:
+            self.profiler.stop(elapsed_ms)
+
+    def read_key(self, timeout=0.1):
+        """Baca satu tombol tanpa nge-block lama - compatible Windows & Linux"""
+        if os.name == 'nt':
+            if msvcrt.kbhit():
+                key = msvcrt.getch()
+                if key in (b'\x00', b'\xe0'):
+                    return self.windows_keys.get(msvcrt.getch())
+                return key.decode('utf-8', 'ignore').lower()
+            return None
+        if select.select([sys.stdin], [], [], timeout)[0]:
+            key = sys.stdin.read(1)
+            if key != '\x1b':
+                return key.lower()
+            sequence = ''
+            while len(sequence) < 4 and select.select([sys.stdin], [], [], 0.01)[0]:
+                sequence += sys.stdin.read(1)
+                if sequence[-1].isalpha() or sequence[-1] == '~':
+                    break
+            return self.escape_keys.get(sequence)
+        return None
+
+    def handle_key(self, key):
+        """Jalankan aksi tombol, return False kalau user mau keluar"""
+        if key == 'q':
+            self.running = False
+            return False
+        elif key == 'r':
+            if self.remote is not None:
+                self.remote.send_command('refresh')
+            else:
+                self.scheduler.request_refresh()
+        elif key == 'a':
+            self.add_coin_interactive()
+        elif key == 'd':
+            self.remove_coin_interactive()
+        elif key == 'c':
+            self.cycle_display_currency()
+        elif key == 't':
+            self.cycle_trend_timeframe()
+        elif key == 'm':
+            self.show_debug = not self.show_debug
+        elif key in ('j', 'down'):
+            self.scroll_table(1)
+        elif key in ('k', 'up'):
+            self.scroll_table(-1)
+        elif key in ('n', 'pgdn'):
+            self.scroll_table(self.table_rows)
+        elif key in ('p', 'pgup'):
+            self.scroll_table(-self.table_rows)
+        elif key in ('home', 'end'):
+            self.scroll_table(to=key)
+        elif key == 's':
+            self.cycle_sort_column()
+        elif key == 'o':
+            self.toggle_sort_order()
+        elif key == 'i':
+            self.toggle_indicator_columns()
+        elif key == 'b':
+            self.show_breadth = not self.show_breadth
+        return True
 
     def handle_input(self):
         """Handle input keyboard - compatible Windows & Linux"""
         while self.running:
             try:
-                if os.name == 'nt': 
-                    if msvcrt.kbhit():
-                        key = msvcrt.getch().decode('utf-8').lower()
-                        if key == 'q':
-                            self.running = False
-                            break
-                        elif key == 'r':
-                            self.fetch_crypto_data()
-                            time.sleep(0.5)
-                        elif key == 'a':
-                            self.add_coin_interactive()
-                            time.sleep(0.5)
-                        elif key == 'd':
-                            self.remove_coin_interactive()
-                            time.sleep(0.5)
-                else: 
-                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                        key = sys.stdin.read(1).lower()
-                        if key == 'q':
-                            self.running = False
-                            break
-                        elif key == 'r':
-                            self.fetch_crypto_data()
-                        elif key == 'a':
-                            self.add_coin_interactive()
-                        elif key == 'd':
-                            self.remove_coin_interactive()
-                
+                key = self.read_key()
+                if key and not self.handle_key(key):
+                    break
                 time.sleep(0.1)
             except:
                 break
 
     def add_coin_interactive(self):
-        """Tambah koin baru ke watchlist"""
-        with self.console.capture() as capture:
-            self.console.print("\n[bold bright_yellow]Tambah Crypto Baru[/bold bright_yellow]")
-            self.console.print("[dim]Contoh: ripple, litecoin, uniswap, cosmos, algorand[/dim]")
-            
+        """Tambah koin baru ke watchlist, divalidasi & dikasih saran dari daftar semua koin"""
+        self.console.print("\n[bold bright_yellow]Tambah Crypto Baru[/bold bright_yellow]")
+        self.console.print("[dim]Ketik ID, simbol, atau nama (contoh: ripple, avax, cosmos)[/dim]")
+
         try:
-            self.console.print("[bright_green]Masukkan ID koin: [/bright_green]", end="")
-            coin_id = input().lower().strip()
-            
-            if coin_id and coin_id not in self.watchlist:
-                self.watchlist.append(coin_id)
-                self.console.print(f"[bold bright_green]Berhasil ditambah: {coin_id}[/bold bright_green]")
-                self.fetch_crypto_data()
-            else:
-                self.console.print("[bright_red]Koin udah ada atau input salah![/bright_red]")
+            self.console.print("[bright_green]Cari koin: [/bright_green]", end="")
+            query = input().lower().strip()
+
+            while query:
+                if query in self.watchlist:
+                    self.console.print("[bright_red]Koin udah ada di watchlist![/bright_red]")
+                    return
+                if query in self.universe or not self.universe.ready:
+                    if not self.universe.ready:
+                        self.console.print("[dim]Daftar koin belum ke-load, ID ga divalidasi[/dim]")
+                    if self.add_coin(query):
+                        self.console.print(f"[bold bright_green]Berhasil ditambah: {query}[/bold bright_green]")
+                    elif self.remote is not None:
+                        self.console.print("[bright_red]Gagal nambah - koneksi ke daemon lagi putus[/bright_red]")
+                    else:
+                        self.console.print(f"[bright_red]Gagal nambah - budget memori cuma muat "
+                                           f"{self.coin_capacity} koin[/bright_red]")
+                    return
+
+                suggestions = self.universe.search(query, prefer=self.crypto_icons)
+                if not suggestions:
+                    self.console.print(f"[bright_red]Ga nemu koin yang mirip '{query}'[/bright_red]")
+                    return
+                for number, (coin_id, symbol, name) in enumerate(suggestions, 1):
+                    mark = " [dim](udah ada)[/dim]" if coin_id in self.watchlist else ""
+                    self.console.print(f"  [bright_cyan]{number}.[/bright_cyan] {coin_id} "
+                                       f"[bright_yellow]{symbol.upper()}[/bright_yellow] {name}{mark}")
+                self.console.print("[bright_green]Pilih nomor, ketik lagi, atau Enter buat batal: [/bright_green]", end="")
+                answer = input().lower().strip()
+                if answer.isdigit() and 1 <= int(answer) <= len(suggestions):
+                    query = suggestions[int(answer) - 1][0]
+                else:
+                    query = answer
         except:
             pass
 
@@ -404,65 +5202,255 @@ class CryptoTrackerGenZ:
             coin_id = input().lower().strip()
             
             if coin_id in self.watchlist:
-                self.watchlist.remove(coin_id)
-                if coin_id in self.crypto_data:
-                    del self.crypto_data[coin_id]
-                if coin_id in self.price_history:
-                    del self.price_history[coin_id]
-                self.console.print(f"[bold bright_green]Berhasil dihapus: {coin_id}[/bold bright_green]")
+                if self.remove_coin(coin_id):
+                    self.console.print(f"[bold bright_green]Berhasil dihapus: {coin_id}[/bold bright_green]")
+                else:
+                    self.console.print("[bright_red]Gagal hapus - koneksi ke daemon lagi putus[/bright_red]")
             else:
                 self.console.print("[bright_red]Koin ga ditemukan di watchlist![/bright_red]")
         except:
             pass
 
-    def run(self):
-        """Main loop dengan startup yang smooth"""
+    async def fetch_task(self, updates):
+        """Task fetch: network jalan di thread pool, hasilnya cuma dioper lewat queue"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+
+        async def fetch_batch(batch):
+            try:
+                data = await loop.run_in_executor(self.get_fetch_pool(), self.fetch_price_batch, batch)
+                return batch, data, None
+            except Exception as e:
+                return batch, None, e
+
+        while self.running:
+            self.maybe_refresh_fx()
+            self.maybe_refresh_universe()
+            self.maybe_backfill()
+            self.maybe_reload_config()
+            self.maybe_fetch_new_coins()
+            self.maybe_evict_cold()
+            batches = self.get_fetch_batches()
+            if batches and self.scheduler.should_fetch(cost=len(batches)):
+                await updates.put(('begin', None, None, None))
+                for next_done in asyncio.as_completed([fetch_batch(batch) for batch in batches]):
+                    batch, data, error = await next_done
+                    await updates.put(('batch', batch, data, error))
+                await updates.put(('end', None, None, None))
+            await asyncio.sleep(0.2)
+
+    async def state_task(self, updates):
+        """Task state: satu-satunya yang nulis hasil fetch ke crypto_data, urut sesuai queue"""
+        outcome = None
+        while True:
+            kind, batch, data, error = await updates.get()
+            if kind == 'begin':
+                outcome = self.begin_fetch()
+            elif kind == 'batch':
+                self.handle_batch_result(outcome, batch, data, error)
+            elif kind == 'end':
+                self.finish_fetch(outcome)
+            elif kind == 'quotes':
+                self.apply_price_data(data, track_last=True, source=self.stream_source.name)
+
+    async def input_task(self):
+        """Task input: polling keyboard, prompt tambah/hapus jalan di thread biar frame ga ketahan"""
+        import asyncio
+        while self.running:
+            key = self.read_key(timeout=0)
+            if key in ('a', 'd'):
+                await asyncio.to_thread(self.handle_key, key)
+            elif key and not self.handle_key(key):
+                break
+            await asyncio.sleep(0.05)
+
+    async def render_task(self, live):
+        """Task render: gambar frame dari state terakhir, ga pernah nunggu network"""
+        import asyncio
+        while self.running:
+            self.animation_frame += 1
+            self.render_frame(live)
+            await asyncio.sleep(0.5)
+
+    async def run_async_engine(self, live):
+        """Engine asyncio: fetch, state, input & render jalan sebagai task terpisah"""
+        import asyncio
+        updates = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        if self.replay is None:
+            # replay ga dioper: max speed bisa jauh lebih cepat dari state_task, queue-nya numpuk
+            self.quote_handoff = lambda quotes: loop.call_soon_threadsafe(
+                updates.put_nowait, ('quotes', None, quotes, None)
+            )
+        tasks = [
+            asyncio.create_task(self.fetch_task(updates)),
+            asyncio.create_task(self.state_task(updates)),
+            asyncio.create_task(self.input_task()),
+            asyncio.create_task(self.render_task(live))
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            self.running = False
+            self.quote_handoff = None
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def shutdown(self):
+        """Beresin thread, pool, arsip tick & session HTTP"""
+        if self.stream_source is not None:
+            self.stream_source.stop()
+        if self.replay is not None and self.headless:
+            stats = self.replay.stats()
+            print(f"[replay] {stats['ticks']} tick, {stats['quotes']} quote dalam {stats['elapsed_s']:.2f}s "
+                  f"({stats['quotes_per_s']:,.0f} quote/s)", file=sys.stderr)
+        if self.headless:
+            report = self.memory_footprint()
+            print(f"[memori] {report['total'] / 2**20:.1f} MB buat {report['coins']} koin "
+                  f"({', '.join(f'{k} {v / 2**20:.1f}' for k, v in report['stores'].items())})", file=sys.stderr)
+        if self.remote is not None:
+            self.remote.stop()
+        self.price_source.stop()
+        if self.fetch_pool is not None:
+            self.fetch_pool.shutdown(wait=False, cancel_futures=True)
+        if self.tick_store is not None:
+            self.tick_store.flush()
+        if self.alerts is not None:
+            self.alerts.close()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.profiler is not None:
+            for path in self.profiler.dump():
+                print(f"[profile] {path}", file=sys.stderr)
+            self.profiler = None
+        self.http.close()
+
+    def run_headless(self, writer, max_ticks=None):
+        """Mode tanpa UI: fetch sesuai scheduler, tiap tick langsung ditulis ke writer"""
+        self.headless = True
+        self.warm_from_tick_store()
+        self.drain_changed()
+        if self.stream_source is not None:
+            self.stream_source.start(self.on_stream_quotes)
+
+        ticks = 0
+        try:
+            while self.running:
+                self.maybe_refresh_fx()
+                self.maybe_refresh_universe()
+                self.maybe_reload_config()
+                self.maybe_fetch_new_coins()
+                self.maybe_evict_cold()
+                batches = self.get_fetch_batches()
+                if batches and self.scheduler.should_fetch(cost=len(batches)):
+                    self.fetch_crypto_data()
+                    ticks += 1
+
+                finished = self.replay is not None and self.replay.finished
+                changed = self.drain_changed()
+                with self.state_lock:
+                    writer.write_snapshot(self.clock(), self.crypto_data, sorted(changed))
+                writer.maybe_flush()
+
+                # changed juga diisi evict/relabel, laporan startup nunggu data beneran masuk
+                if changed and self.first_data_at is not None and self.first_frame_at is None:
+                    self.first_frame_at = time.perf_counter()
+                    report = self.startup_report()
+                    print(f"[startup] import {report['import_ms']:.0f}ms, "
+                          f"data pertama {report['first_data_ms']:.0f}ms", file=sys.stderr)
+
+                if finished or (max_ticks and ticks >= max_ticks):
+                    break
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            writer.flush()
+            self.shutdown()
+        return ticks
+
+    def run_daemon(self, daemon, max_ticks=None):
+        """Mode daemon: satu loop fetch buat semua dashboard, tiap tick dipublish lewat StateDaemon"""
+        self.headless = True
+        self.warm_from_tick_store()
+        if self.stream_source is not None:
+            self.stream_source.start(self.on_stream_quotes)
+        daemon.start()
+        print(f"[daemon] listen di {daemon.label}", file=sys.stderr)
+
+        ticks = 0
+        try:
+            while self.running:
+                daemon.apply_commands()
+                self.maybe_refresh_fx()
+                self.maybe_refresh_universe()
+                self.maybe_backfill()
+                self.maybe_reload_config()
+                self.maybe_fetch_new_coins()
+                self.maybe_evict_cold()
+                batches = self.get_fetch_batches()
+                if batches and self.scheduler.should_fetch(cost=len(batches)):
+                    self.fetch_crypto_data()
+                    ticks += 1
+                daemon.publish()
+
+                if max_ticks and ticks >= max_ticks:
+                    break
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            daemon.stop()
+            self.shutdown()
+        return ticks
+
+    def run(self, engine="sync"):
+        """Main loop: Live langsung jalan, tabel keisi begitu fetch pertama selesai"""
+        load_rich()
         self.console.clear()
-        
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TimeElapsedColumn(),
-            console=self.console
-        ) as progress:
-            startup_task = progress.add_task("[bright_green]Memulai Crypto Tracker...", total=100)
-            
-            for i in range(100):
-                if i < 30:
-                    progress.update(startup_task, description="[bright_blue]Loading modules...", advance=1)
-                elif i < 60:
-                    progress.update(startup_task, description="[bright_yellow]Koneksi ke API...", advance=1)
-                elif i < 90:
-                    progress.update(startup_task, description="[bright_green]Ambil data market...", advance=1)
-                else:
-                    progress.update(startup_task, description="[bright_magenta]Siap diluncurkan!", advance=1)
-                time.sleep(0.02)
 
-        self.console.print("[bold bright_green]Loading data market awal...[/bold bright_green]")
-        self.fetch_crypto_data()
+        self.warm_from_tick_store()
+        if self.stream_source is not None:
+            self.stream_source.start(self.on_stream_quotes)
+        if self.remote is not None:
+            self.remote.start(self)
 
-        input_thread = threading.Thread(target=self.handle_input, daemon=True)
-        input_thread.start()
+        if engine != "async":
+            input_thread = threading.Thread(target=self.handle_input, daemon=True)
+            input_thread.start()
         
         try:
-            with Live(self.create_layout(), refresh_per_second=2, screen=True) as live: 
-                last_update = time.time()
-                
-                while self.running:
-                    current_time = time.time()
+            with Live(self.create_layout(), auto_refresh=False, screen=True) as live: 
+                if engine == "async":
+                    import asyncio
+                    asyncio.run(self.run_async_engine(live))
 
+                while self.running:
                     self.animation_frame += 1
 
-                    if current_time - last_update >= self.update_interval:
+                    self.maybe_refresh_fx()
+                    self.maybe_refresh_universe()
+                    self.maybe_backfill()
+                    self.maybe_reload_config()
+                    self.maybe_fetch_new_coins()
+                    self.maybe_evict_cold()
+                    batches = self.get_fetch_batches()
+                    if batches and self.scheduler.should_fetch(cost=len(batches)):
+                        self.loading = True
+                        self.render_frame(live)
                         self.fetch_crypto_data()
-                        last_update = current_time
 
-                    live.update(self.create_layout())
+                    self.render_frame(live)
                     time.sleep(0.5)
                     
         except KeyboardInterrupt:
             pass
+        finally:
+            self.shutdown()
 
         self.console.clear()
         self.console.print("\n[bold bright_magenta]Thanks udah pake Crypto Tracker![/bold bright_magenta]")
@@ -473,15 +5461,14 @@ def check_and_install_dependencies():
     """Check dan auto-install dependencies yang dibutuhkan"""
     required_packages = {
         'requests': 'requests',
-        'rich': 'rich'
+        'rich': 'rich',
+        'numpy': 'numpy'
     }
     
     missing_packages = []
 
     for module_name, package_name in required_packages.items():
-        try:
-            __import__(module_name)
-        except ImportError:
+        if importlib.util.find_spec(module_name) is None:
             missing_packages.append(package_name)
     
     if not missing_packages:
@@ -541,7 +5528,6 @@ def check_and_install_dependencies():
     
     print("\nSemua package berhasil diinstall!")
     print("Starting Crypto Tracker...\n")
-    time.sleep(1)
     return True
 
 def show_welcome_screen():
@@ -551,7 +5537,6 @@ def show_welcome_screen():
         from rich.panel import Panel
         from rich.text import Text
         from rich.align import Align
-        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
         
         console = Console()
         console.clear()
@@ -572,25 +5557,6 @@ def show_welcome_screen():
         )
         
         console.print(welcome_panel)
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            console=console
-        ) as progress:
-            init_task = progress.add_task("[bright_green]Memulai aplikasi...", total=50)
-            
-            for i in range(50):
-                if i < 15:
-                    progress.update(init_task, description="[bright_blue]Loading dependencies...", advance=1)
-                elif i < 30:
-                    progress.update(init_task, description="[bright_yellow]Setup interface...", advance=1)
-                elif i < 45:
-                    progress.update(init_task, description="[bright_green]Setup koneksi...", advance=1)
-                else:
-                    progress.update(init_task, description="[bright_magenta]Siap launch!", advance=1)
-                time.sleep(0.04)
         
     except ImportError:
  
@@ -598,26 +5564,187 @@ def show_welcome_screen():
         print("Dibuat oleh: M. Imam Iryunullah")
         print("Initializing...")
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Real-time Crypto Tracker")
+    parser.add_argument("--engine", choices=["sync", "async"], default="sync",
+                        help="sync = loop klasik, async = fetch/input/render jalan sebagai task asyncio")
+    parser.add_argument("--api-url", default="https://api.coingecko.com/api/v3",
+                        help="base URL API CoinGecko (bisa diarahkan ke server lokal)")
+    parser.add_argument("--currencies", default="usd,idr,eur,btc",
+                        help="daftar mata uang tampilan, dihitung lokal dari USD + kurs FX")
+    parser.add_argument("--currency", default=None,
+                        help="mata uang tampilan awal, default dari profil config (ganti pas jalan pakai tombol C)")
+    parser.add_argument("--config", default=os.path.join(os.path.expanduser("~"), ".crypto-tracker", "config.json"),
+                        help="file config profil (watchlist, interval, currency, kolom); diedit pas jalan langsung kepake")
+    parser.add_argument("--profile", default=None,
+                        help="nama profil di file config (default: active_profile di file)")
+    parser.add_argument("--history-depth", type=int, default=512,
+                        help="jumlah tick histori harga per koin (ring buffer)")
+    parser.add_argument("--tick-dir", default=os.path.join(os.path.expanduser("~"), ".crypto-tracker", "ticks"),
+                        help="folder arsip tick harian (dipakai buat warm start)")
+    parser.add_argument("--coin-list-cache", default=os.path.join(os.path.expanduser("~"), ".crypto-tracker", "coins-list.json"),
+                        help="cache daftar semua koin (/coins/list) buat validasi & saran pas tambah koin")
+    parser.add_argument("--no-record", action="store_true",
+                        help="jangan simpan tick ke disk")
+    parser.add_argument("--stream", action="store_true",
+                        help="harga tick-level dari websocket miniTicker, fallback ke REST kalau putus")
+    parser.add_argument("--stream-url", default="wss://stream.binance.com:9443",
+                        help="base URL websocket stream (bisa diarahkan ke server lokal)")
+    parser.add_argument("--alerts", default=None,
+                        help="file config rule alert (JSON)")
+    parser.add_argument("--portfolio", default=None,
+                        help="file holdings JSON (koin, jumlah, cost basis / lot) buat panel P&L")
+    parser.add_argument("--providers", default="coingecko",
+                        help="provider harga dipisah koma (coingecko,coincap,binance); >1 = median + failover")
+    parser.add_argument("--provider-deadline", type=float, default=3.0,
+                        help="batas tunggu (detik) per batch sebelum pakai provider yang udah jawab")
+    parser.add_argument("--quorum", type=int, default=2,
+                        help="jumlah provider sehat tercepat yang ditunggu per batch")
+    parser.add_argument("--backfill-days", type=int, default=30,
+                        help="histori /market_chart yang diambil per koin buat candle & sparkline (0 = matiin)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve metric format Prometheus di http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--memory-budget", type=float, default=0,
+                        help="batas memori state koin dalam MB (record, histori, candle, indikator; ±140 KB per koin, "
+                             "hampir semuanya candle); default 0 = ga dibatesin")
+    parser.add_argument("--cold-ttl", type=float, default=3600,
+                        help="detik sebelum koin yang udah ga di watchlist dibuang dari memori")
+    parser.add_argument("--debug", action="store_true",
+                        help="tampilkan panel debug (timing per stage & error terakhir) dari awal")
+    parser.add_argument("--profile-frames", type=int, default=0,
+                        help="cProfile tiap frame, dump N frame paling lambat pas keluar")
+    parser.add_argument("--profile-dir", default="profiles",
+                        help="folder output file .prof")
+    parser.add_argument("--serve", default=None, metavar="ALAMAT",
+                        help="mode daemon: satu fetch loop, state dipublish ke client (unix:/path/sock atau host:port)")
+    parser.add_argument("--connect", default=None, metavar="ALAMAT",
+                        help="mode client: cuma render, data dari daemon --serve (ga poll API sendiri)")
+    parser.add_argument("--token", default=os.environ.get("CRYPTO_TRACKER_TOKEN"),
+                        help="token bareng daemon & client (default env CRYPTO_TRACKER_TOKEN); "
+                             "wajib kalau --serve di alamat selain loopback")
+    parser.add_argument("--replay", default=None, metavar="FILE",
+                        help="replay rekaman NDJSON (output --headless) lewat jalur update yang sama kayak data live")
+    parser.add_argument("--simulate", action="store_true",
+                        help="harga sintetis random walk, ga nembak API (buat ngetes UI/alert pas market kenceng)")
+    parser.add_argument("--speed", type=parse_speed, default=1.0,
+                        help="kecepatan replay/simulasi: 1-1000 (kali jam asli) atau 'max' = secepat mungkin")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed random walk, seed sama = harga sama")
+    parser.add_argument("--volatility", type=float, default=0.5,
+                        help="standar deviasi gerak harga per tick simulasi (persen)")
+    parser.add_argument("--sim-coins", type=int, default=0,
+                        help="jumlah koin sintetis (0 = pakai watchlist)")
+    parser.add_argument("--sim-interval", type=float, default=1.0,
+                        help="jarak antar tick simulasi (detik jam replay)")
+    parser.add_argument("--sim-steps", type=int, default=None,
+                        help="berhenti setelah N tick simulasi (default: jalan terus)")
+    parser.add_argument("--headless", action="store_true",
+                        help="tanpa UI: tulis tiap tick ke stdout/file, buat pipeline di server")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson",
+                        help="format output mode headless")
+    parser.add_argument("--output", default="-",
+                        help="file output mode headless ('-' = stdout)")
+    parser.add_argument("--ticks", type=int, default=None,
+                        help="berhenti setelah N fetch (mode headless)")
+    args = parser.parse_args(argv)
+    if args.serve and not args.token and not is_loopback(*parse_address(args.serve)):
+        parser.error(f"--serve {args.serve} bisa diakses dari luar mesin ini, wajib pakai --token "
+                     "(atau env CRYPTO_TRACKER_TOKEN)")
+    return args
+
+def parse_speed(value):
+    """'max' = secepat mungkin (0.0), selain itu kelipatan jam asli 1-1000 ('100' / '100x')"""
+    value = str(value).strip().lower()
+    if value == 'max':
+        return 0.0
+    try:
+        speed = float(value[:-1] if value.endswith('x') else value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"speed '{value}' ga valid (1-1000 atau 'max')")
+    if not 1 <= speed <= 1000:
+        raise argparse.ArgumentTypeError(f"speed harus 1-1000 atau 'max', bukan {value}")
+    return speed
+
+def create_replay(args, watchlist):
+    """ReplaySource dari --replay / --simulate, None kalau jalan live"""
+    if args.replay:
+        return ReplaySource.from_ndjson(args.replay, speed=args.speed)
+    if args.simulate:
+        coins = [f"sim-{i:04d}" for i in range(args.sim_coins)] if args.sim_coins else watchlist
+        return ReplaySource.synthetic(coins, volatility=args.volatility, seed=args.seed, interval=args.sim_interval,
+                                      steps=args.sim_steps, speed=args.speed)
+    return None
+
+def run_headless_cli(args, tracker):
+    """Entry mode headless: siapin output lalu jalanin loop tanpa UI"""
+    if args.output == "-":
+        stream = sys.stdout
+        write_header = True
+    else:
+        write_header = not os.path.exists(args.output) or os.path.getsize(args.output) == 0
+        stream = open(args.output, "a", buffering=1 << 16, newline="")
+    writer = SnapshotWriter(stream, fmt=args.format, write_header=write_header, portfolio=tracker.portfolio,
+                            provenance=isinstance(tracker.price_source, AggregatedPriceSource))
+    try:
+        tracker.run_headless(writer, max_ticks=args.ticks)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
 if __name__ == "__main__":
     try:
+        args = parse_args()
  
         if not check_and_install_dependencies():
             print("Gagal install required packages. Install manual:")
-            print("   pip install requests rich")
+            print("   pip install requests rich numpy")
             sys.exit(1)
 
         import requests
-        from rich.console import Console
+        import numpy as np
 
-        show_welcome_screen()
+        if not (args.headless or args.serve):
+            show_welcome_screen()
 
-        tracker = CryptoTrackerGenZ()
-        tracker.run()
+        config = TrackerConfig(args.config, args.profile)
+        if config.error is not None:
+            print(f"[config] {config.error}, jalan pakai default", file=sys.stderr)
+        replay = create_replay(args, config.settings['watchlist'])
+        tracker = CryptoTrackerGenZ(
+            api_base_url=args.api_url,
+            currencies=[c.strip().lower() for c in args.currencies.split(',') if c.strip()],
+            display_currency=args.currency.lower() if args.currency else None,
+            alerts=AlertEngine.from_config(args.alerts, args.history_depth) if args.alerts else None,
+            stream_url=args.stream_url if args.stream else None,
+            history_depth=args.history_depth,
+            tick_dir=None if args.no_record or args.connect or replay else args.tick_dir,
+            universe_cache=args.coin_list_cache,
+            portfolio=Portfolio.from_file(args.portfolio) if args.portfolio else None,
+            profiler=FrameProfiler(args.profile_frames, args.profile_dir) if args.profile_frames else None,
+            providers=[p.strip().lower() for p in args.providers.split(',') if p.strip()],
+            provider_deadline=args.provider_deadline,
+            quorum=args.quorum,
+            backfill_days=0 if args.headless or replay else args.backfill_days,
+            remote=StateSubscriber(args.connect, token=args.token) if args.connect else None,
+            config=config,
+            replay=replay,
+            memory_budget=args.memory_budget * 2**20 if args.memory_budget > 0 else None,
+            cold_ttl=args.cold_ttl
+        )
+        tracker.show_debug = args.debug
+        if args.metrics_port is not None:
+            tracker.metrics_server = MetricsServer(tracker.metrics, port=args.metrics_port).start()
+        if args.serve:
+            tracker.run_daemon(StateDaemon(tracker, args.serve, token=args.token), max_ticks=args.ticks)
+        elif args.headless:
+            run_headless_cli(args, tracker)
+        else:
+            tracker.run(engine=args.engine)
         
     except KeyboardInterrupt:
         print("\nInstallasi dibatalkan.")
         sys.exit(0)
     except Exception as e:
         print(f"Unexpected error: {e}")
-        print("Coba install manual: pip install requests rich")
+        print("Coba install manual: pip install requests rich numpy")
         sys.exit(1)
\ No newline at end of file
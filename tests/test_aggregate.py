@@ -0,0 +1,57 @@
+import threading
+
+import index
+
+
+class FixedSource(index.PriceSource):
+    def __init__(self, name, prices, error=None):
+        self.name = name
+        self.prices = prices
+        self.error = error
+
+    def fetch_batch(self, coin_ids):
+        if self.error is not None:
+            raise self.error
+        return {c: {'price': self.prices[c], 'market_cap': None} for c in coin_ids if c in self.prices}
+
+
+def make(*sources, **kwargs):
+    return index.AggregatedPriceSource(list(sources), deadline=2.0, **kwargs)
+
+
+def test_zero_price_is_a_quote_not_a_gap():
+    source = make(FixedSource('a', {'dead': 0.0, 'btc': 100.0}),
+                  FixedSource('b', {'dead': 0.0, 'btc': 101.0}),
+                  FixedSource('c', {'dead': 0.0, 'btc': 100.5}), quorum=3)
+    try:
+        quotes = source.fetch_batch(['dead', 'btc'])
+    finally:
+        source.stop()
+    assert quotes['dead']['price'] == 0.0 and quotes['dead']['sources'] == ['a', 'b', 'c']
+    assert quotes['btc']['price'] == 100.5 and quotes['btc']['rejected'] == []
+
+
+def test_outlier_next_to_zero_median_is_rejected():
+    source = make(FixedSource('a', {}), FixedSource('b', {}), FixedSource('c', {}))
+    results = {name: ({'x': {'price': price}}, 1.0, 10.0) for name, price in (('a', 0.0), ('b', 0.0), ('c', 5.0))}
+    try:
+        quote = source.consolidate(results)['x']
+    finally:
+        source.stop()
+    assert quote['price'] == 0.0 and quote['rejected'] == ['c']
+
+
+def test_health_bookkeeping_happens_under_lock():
+    source = make(FixedSource('a', {'btc': 1.0}), FixedSource('b', {'btc': 1.0}, error=ValueError("down")))
+    try:
+        with source.lock:
+            worker = threading.Thread(target=source.fetch_batch, args=(['btc'],))
+            worker.start()
+            worker.join(0.2)
+            assert worker.is_alive()
+            assert all(h['last_attempt'] == 0 for h in source.health.values())
+        worker.join(5)
+        assert all(h['last_attempt'] > 0 for h in source.health.values())
+        assert source.health['b']['failed'] == 1 and source.health['a']['ok'] == 1
+    finally:
+        source.stop()
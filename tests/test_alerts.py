@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+import bench
+import index
+
+
+def test_from_config_rejects_rules_deeper_than_history(tmp_path):
+    path = tmp_path / "alerts.json"
+    path.write_text(json.dumps({"sinks": [], "rules": [{"type": "move", "coin": "*", "ticks": 10, "pct": 1}]}))
+    assert index.AlertEngine.from_config(str(path), history_depth=11).history_window == 11
+    with pytest.raises(ValueError, match="history-depth"):
+        index.AlertEngine.from_config(str(path), history_depth=10)
+
+    path.write_text(json.dumps({"sinks": [], "rules": [{"type": "cross", "coin": "*", "fast": 5, "slow": 50}]}))
+    with pytest.raises(ValueError):
+        index.AlertEngine.from_config(str(path), history_depth=32)
+
+
+def test_rules_deeper_than_history_store_do_not_crash():
+    history = index.PriceHistoryStore(depth=8)
+    data = {'bitcoin': {'price': 0, 'change_24h': 0, 'volume_24h': 0, 'market_cap': 0}}
+    engine = index.AlertEngine([{'type': 'move', 'coin': '*', 'ticks': 8, 'pct': 1},
+                                {'type': 'move', 'coin': '*', 'ticks': 2, 'pct': 1, 'direction': 'up'}])
+    for price in (100, 100, 100, 100, 100, 100, 100, 110):
+        history.append('bitcoin', price)
+        data['bitcoin']['price'] = price
+        fired = engine.evaluate(['bitcoin'], data, history, now=1000)
+    assert [engine.rules[rule]['id'] for _, rule, _, _ in fired] == ['rule-2']
+
+
+def test_alerts_bench_gate_reports_and_fails_only_past_threshold():
+    results, ok = bench.bench_alerts([100], coins=50, ticks=20, change_ratio=0.1, max_p99_ms=1e6)
+    assert ok and results[0]['rules'] == 100 and results[0]['changed_per_tick'] == 5
+    _, ok = bench.bench_alerts([100], coins=50, ticks=20, change_ratio=0.1, max_p99_ms=0.0)
+    assert not ok
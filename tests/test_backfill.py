@@ -0,0 +1,91 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+import index
+from bench import StubCoinGeckoServer
+
+
+class ChartStub(StubCoinGeckoServer):
+    """market_chart dibales status tetap, endpoint lain normal"""
+    def __init__(self, chart_status, retry_after=None):
+        super().__init__()
+        self.chart_status = chart_status
+        self.retry_after = retry_after
+        self.chart_requests = 0
+
+    def handle(self, handler):
+        if "/market_chart" not in handler.path:
+            return super().handle(handler)
+        self.chart_requests += 1
+        headers = {"Retry-After": self.retry_after} if self.retry_after else None
+        self.send(handler, self.chart_status, b"{}", headers)
+
+
+def run_backfill(stub):
+    tracker = index.CryptoTrackerGenZ(api_base_url=stub.url, backfill_days=1)
+    tracker.watchlist = ['bitcoin', 'ethereum']
+    tracker.backfill_pending = set(tracker.watchlist)
+    tracker.maybe_backfill()
+    deadline = time.time() + 5
+    while tracker.backfill_in_flight and time.time() < deadline:
+        time.sleep(0.01)
+    return tracker
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_backfill_rate_limit_backs_off_whole_scheduler(status):
+    stub = ChartStub(status, retry_after="30").start()
+    try:
+        tracker = run_backfill(stub)
+        try:
+            scheduler = tracker.scheduler
+            assert scheduler.backoff_until >= time.time() + 29
+            assert scheduler.failures >= 1 and str(status) in scheduler.decision
+            assert not tracker.backfill_retry
+            assert tracker.backfill_pending == {'bitcoin', 'ethereum'}
+            sent = stub.chart_requests
+            tracker.maybe_backfill()
+            assert stub.chart_requests == sent
+            assert not scheduler.should_fetch(now=time.time())
+            if status == 429:
+                assert tracker.metrics.counter('rate_limited_total') >= 1
+        finally:
+            tracker.shutdown()
+    finally:
+        stub.stop()
+
+
+def test_backfill_not_found_retries_only_that_coin():
+    stub = ChartStub(404).start()
+    try:
+        tracker = run_backfill(stub)
+        try:
+            assert tracker.scheduler.backoff_until <= time.time()
+            assert tracker.scheduler.failures == 0
+            assert set(tracker.backfill_retry) == {'bitcoin', 'ethereum'}
+        finally:
+            tracker.shutdown()
+    finally:
+        stub.stop()
+
+
+def test_backfill_error_bookkeeping_waits_for_state_lock():
+    tracker = index.CryptoTrackerGenZ(api_base_url="http://127.0.0.1:9", backfill_days=1)
+    tracker.backfill_in_flight.add('bitcoin')
+    future = Future()
+    future.set_exception(ValueError("data market_chart aneh"))
+    try:
+        with tracker.state_lock:
+            worker = threading.Thread(target=tracker._on_backfilled, args=('bitcoin', future))
+            worker.start()
+            worker.join(0.2)
+            assert worker.is_alive()
+            assert 'bitcoin' in tracker.backfill_in_flight and not tracker.backfill_retry
+        worker.join(5)
+        assert 'bitcoin' not in tracker.backfill_in_flight
+        assert tracker.backfill_retry['bitcoin'] > time.time() + 100
+    finally:
+        tracker.shutdown()
@@ -0,0 +1,38 @@
+import json
+
+import bench
+
+E2E = ["e2e", "--sizes", "20", "--ticks", "6", "--batch-size", "10", "--latency-ms", "0", "--jitter-ms", "0",
+       "--error-rate", "0.3", "--rate-limit-rate", "0.2", "--seed", "3"]
+COUNTERS = ('http_requests', 'errors', 'rate_limited')
+
+
+def test_e2e_counts_are_reproducible_from_seed(tmp_path):
+    runs = []
+    for name in ("old.json", "new.json"):
+        path = tmp_path / name
+        bench.main(["--json", str(path)] + E2E)
+        runs.append(json.loads(path.read_text()))
+    old, new = runs
+    assert old['command'] == 'e2e' and old['params'] == new['params']
+    assert old['params']['seed'] == 3
+    row_old, row_new = old['results'][0], new['results'][0]
+    assert row_old['coins'] == 20 and row_old['ticks'] == 6
+    assert [row_old[k] for k in COUNTERS] == [row_new[k] for k in COUNTERS]
+    assert row_old['rate_limited'] > 0 and row_old['errors'] > row_old['rate_limited']
+
+    rows = bench.compare_results(str(tmp_path / "old.json"), str(tmp_path / "new.json"), 10.0)
+    flagged = {row['metric']: row for row in rows}
+    assert all(flagged[k]['change_pct'] == 0.0 for k in COUNTERS)
+
+
+def test_in_process_benches_report_their_columns():
+    frames, = bench.bench_frames([20], 2, 0.1)
+    assert frames['coins'] == 20 and frames['changed_per_frame'] == 2
+    assert frames['idle_build_ms'] >= 0 and frames['update_render_ms'] > 0
+
+    indicators, = bench.bench_indicators([50], 5)
+    assert indicators['update_us_per_coin'] > 0
+
+    replay, = bench.bench_replay([20], 20, 0.5, 1)
+    assert replay['apply_quotes_per_s'] > 0 and replay['frames'] >= 0
@@ -0,0 +1,56 @@
+import numpy as np
+
+import index
+
+C = index.CandleStore
+
+
+def test_update_rolls_ticks_into_every_resolution():
+    store = C(depth=4)
+    store.update(['bitcoin', 'ethereum'], 120, [10.0, 100.0], [1.0, 5.0])
+    store.update(['bitcoin', 'ethereum'], 150, [12.0, 90.0], [2.0, 6.0])
+    store.update(['bitcoin', 'ethereum'], 170, [9.0, 95.0], [3.0, 7.0])
+    store.update(['bitcoin'], 185, [11.0], [4.0])
+
+    minute = store.series('bitcoin', '1m')
+    assert minute[C.TS].tolist() == [120.0, 180.0]
+    assert minute[[C.OPEN, C.HIGH, C.LOW, C.CLOSE, C.VOLUME], 0].tolist() == [10.0, 12.0, 9.0, 9.0, 3.0]
+    assert minute[C.CLOSE, 1] == 11.0
+
+    hour = store.series('bitcoin', '1h')
+    assert hour.shape == (6, 1)
+    assert hour[[C.OPEN, C.HIGH, C.LOW, C.CLOSE], 0].tolist() == [10.0, 12.0, 9.0, 11.0]
+    assert store.series('ethereum', '1m')[C.CLOSE].tolist() == [95.0]
+
+
+def test_update_ring_keeps_latest_depth_candles():
+    store = C(depth=3)
+    for minute in range(5):
+        store.update(['bitcoin'], minute * 60, [float(minute)], [0.0])
+    assert store.series('bitcoin', '1m')[C.TS].tolist() == [120.0, 180.0, 240.0]
+    assert store.series('bitcoin', '1m')[C.CLOSE].tolist() == [2.0, 3.0, 4.0]
+
+
+def test_backfill_goes_before_live_candles_and_skips_finer_resolutions():
+    store = C(depth=100)
+    hours = 3 * 86400 + np.arange(0, 6 * 3600, 3600, dtype=np.float64)
+    store.update(['bitcoin'], hours[-1] + 3600 + 30, [99.0], [7.0])
+    shuffled = np.array([3, 0, 5, 1, 4, 2])
+    store.backfill('bitcoin', hours[shuffled], np.arange(6.0)[shuffled] + 1, np.full(6, 5.0))
+
+    hour = store.series('bitcoin', '1h')
+    assert hour[C.TS].tolist() == hours.tolist() + [hours[-1] + 3600]
+    assert hour[C.CLOSE].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 99.0]
+    # bucket yang udah ada candle live-nya ga ditimpa histori
+    assert store.series('bitcoin', '1d')[[C.OPEN, C.CLOSE]].ravel().tolist() == [99.0, 99.0]
+    assert store.series('bitcoin', '1m').shape[1] == 1
+    assert store.series('bitcoin', '5m').shape[1] == 1
+
+
+def test_removed_coin_slot_is_reset_for_the_next_coin():
+    store = C(depth=4, capacity=1)
+    store.update(['bitcoin'], 60, [1.0], [1.0])
+    del store['bitcoin']
+    store.update(['solana'], 120, [2.0], [1.0])
+    assert 'bitcoin' not in store
+    assert store.series('solana', '1m')[C.CLOSE].tolist() == [2.0]
@@ -0,0 +1,116 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import index
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write(path, data):
+    path.write_text(data if isinstance(data, str) else json.dumps(data))
+
+
+def test_resolve_merges_defaults_with_active_profile():
+    config = index.TrackerConfig()
+    profile, settings = config.resolve({'active_profile': 'cepat', 'profiles': {'cepat': {
+        'watchlist': [' Bitcoin ', 'solana', 'bitcoin'], 'update_interval': 5, 'min_interval': 2,
+        'currency': 'IDR', 'columns': ['RSI'], 'icons': {'solana': 'SOL!'}}}})
+    assert profile == 'cepat'
+    assert settings['watchlist'] == ['bitcoin', 'solana']
+    assert (settings['update_interval'], settings['min_interval'], settings['max_interval']) == (5, 2, 60)
+    assert settings['currency'] == 'idr' and settings['columns'] == ['rsi']
+    assert settings['icons']['solana'] == 'SOL!' and settings['icons']['bitcoin'] == 'BTC'
+
+
+@pytest.mark.parametrize("profile", [
+    {'watchlist': []},
+    {'update_interval': 0},
+    {'min_interval': 'x'},
+    {'min_interval': 90},
+    {'update_interval': True},
+])
+def test_resolve_rejects_invalid_profiles(profile):
+    with pytest.raises(ValueError):
+        index.TrackerConfig().resolve({'profiles': {'default': profile}})
+
+
+def test_resolve_rejects_unknown_requested_profile():
+    config = index.TrackerConfig(profile='ga-ada')
+    with pytest.raises(ValueError, match="ga-ada"):
+        config.resolve({'profiles': {'default': {}}})
+
+
+def test_malformed_config_at_startup_runs_on_defaults(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, '{"profiles": {"default": {"watchlist": ["bitcoin",]}}')
+    config = index.TrackerConfig(str(path))
+    assert config.error and "config.json" in config.error
+    assert config.settings['watchlist'] == index.TrackerConfig.DEFAULTS['watchlist']
+
+    tracker = index.CryptoTrackerGenZ(api_base_url="http://127.0.0.1:9", backfill_days=0, config=config)
+    assert tracker.metrics.errors
+    tracker.add_coin('ripple')
+    assert path.read_text().endswith('["bitcoin",]}}')
+
+    write(path, {'profiles': {'default': {'watchlist': ['bitcoin']}}})
+    config.last_check = 0
+    os.utime(path, ns=(1, 1))
+    tracker.maybe_reload_config()
+    assert config.error is None and tracker.watchlist == ['bitcoin']
+
+
+def test_malformed_config_from_cli_reports_and_continues(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, "{ini bukan json")
+    child = subprocess.run(
+        [sys.executable, os.path.join(HERE, "index.py"), "--config", str(path), "--simulate", "--headless",
+         "--speed", "max", "--sim-steps", "3", "--no-record", "--output", str(tmp_path / "out.ndjson")],
+        capture_output=True, text=True, timeout=60)
+    assert child.returncode == 0, child.stderr + child.stdout
+    assert "ga kepake" in child.stderr and "jalan pakai default" in child.stderr
+    assert "install" not in child.stdout
+    assert (tmp_path / "out.ndjson").read_text().count("\n") > 0
+
+
+def test_portfolio_coins_are_not_saved_into_profile(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, {'profiles': {'default': {'watchlist': ['bitcoin', 'ethereum']}}})
+    portfolio = index.Portfolio([{'coin': 'solana', 'quantity': 1, 'cost_basis': 100}])
+    tracker = index.CryptoTrackerGenZ(api_base_url="http://127.0.0.1:9", backfill_days=0,
+                                      config=index.TrackerConfig(str(path)), portfolio=portfolio)
+    assert tracker.watchlist == ['bitcoin', 'ethereum', 'solana']
+
+    assert tracker.add_coin('ripple')
+    assert tracker.remove_coin('ethereum')
+    saved = json.loads(path.read_text())['profiles']['default']['watchlist']
+    assert saved == ['bitcoin', 'ripple']
+    assert tracker.watchlist == ['bitcoin', 'solana', 'ripple']
+
+    tracker.apply_settings(tracker.config.load())
+    assert tracker.watchlist == ['bitcoin', 'ripple', 'solana']
+    assert tracker.profile_watchlist == ['bitcoin', 'ripple']
+
+
+def test_save_refuses_to_overwrite_half_written_external_edit(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, {'profiles': {'default': {'watchlist': ['bitcoin']}}})
+    config = index.TrackerConfig(str(path))
+    half = '{"profiles": {"default": {"watchlist": ["bitcoin", "sol'
+    write(path, half)
+    os.utime(path, ns=(1, 1))
+
+    with pytest.raises(ValueError, match="ga disimpan"):
+        config.save_watchlist(['bitcoin', 'ripple'])
+    assert path.read_text() == half
+    assert config.error is not None
+    with pytest.raises(ValueError):
+        config.save_watchlist(['bitcoin'])
+
+    write(path, {'profiles': {'default': {'watchlist': ['bitcoin', 'solana']}}})
+    config.load()
+    config.save_watchlist(['bitcoin', 'solana', 'ripple'])
+    assert json.loads(path.read_text())['profiles']['default']['watchlist'] == ['bitcoin', 'solana', 'ripple']
@@ -0,0 +1,41 @@
+import index
+from bench import make_quotes
+
+import random
+
+
+def make_tracker(**kwargs):
+    index.load_rich()
+    tracker = index.CryptoTrackerGenZ(api_base_url="http://127.0.0.1:9", backfill_days=0, **kwargs)
+    tracker.watchlist = ['bitcoin', 'ethereum']
+    tracker.apply_price_data(make_quotes(tracker.watchlist, random.Random(1)))
+    return tracker
+
+
+def test_display_falls_back_to_usd_before_fx_arrives():
+    tracker = make_tracker(currencies=('idr', 'eur'), display_currency='idr')
+    try:
+        assert tracker.fx.rate('idr') is None
+        assert tracker.get_display_currency() == 'usd'
+        converted = tracker.get_converted()
+        assert 'usd' in converted['currencies']
+        status = tracker.create_market_status()
+        assert '$' in status.plain and 'Rp' not in status.plain
+        tracker.create_layout()
+    finally:
+        tracker.shutdown()
+
+
+def test_display_uses_rate_once_fx_arrives():
+    tracker = make_tracker(currencies=('idr', 'eur'), display_currency='idr')
+    try:
+        tracker.fx.rates.update(idr=16000.0, eur=0.9)
+        tracker.fx.version += 1
+        assert tracker.get_display_currency() == 'idr'
+        usd_volume = sum(tracker.crypto_data[c]['volume_24h'] for c in tracker.watchlist)
+        converted = tracker.get_converted()
+        idr_volume = converted['values'][:, 1, converted['currencies']['idr']].sum()
+        assert abs(idr_volume - usd_volume * 16000.0) < 1e-6 * idr_volume
+        assert 'Rp' in tracker.create_market_status().plain
+    finally:
+        tracker.shutdown()
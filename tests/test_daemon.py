@@ -0,0 +1,110 @@
+import os
+import socket
+import tempfile
+import time
+
+import pytest
+
+import index
+from bench import StubCoinGeckoServer, make_tracker
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def address():
+    directory = tempfile.mkdtemp(prefix="crypto-test-")
+    yield "unix:" + os.path.join(directory, "daemon.sock")
+
+
+def test_client_gets_fx_and_names_from_daemon_without_api_calls(address):
+    tracker, _ = make_tracker(20, warm_ticks=3)
+    tracker.fx.load({'idr': 16000.0, 'eur': 0.9, 'btc': 1 / 65000})
+    tracker.coin_names['coin-0'] = 'Koin Nol'
+    tracker.relabel_coins()
+    daemon = index.StateDaemon(tracker, address).start()
+    stub = StubCoinGeckoServer().start()
+    client = index.CryptoTrackerGenZ(api_base_url=stub.url, backfill_days=0, currencies=('idr', 'usd'),
+                                     display_currency='idr', remote=index.StateSubscriber(address))
+    client.remote.start(client)
+    try:
+        assert wait_for(lambda: client.remote.connected)
+        daemon.publish()
+        assert wait_for(lambda: len(client.crypto_data) == 20)
+        assert client.fx.rate('idr') == 16000.0
+        assert client.get_display_currency() == 'idr'
+        assert client.crypto_data['coin-0']['name'] == 'Koin Nol'
+
+        tracker.fx.load({'idr': 17000.0, 'eur': 0.9, 'btc': 1 / 65000})
+        daemon.publish()
+        assert wait_for(lambda: client.fx.rate('idr') == 17000.0)
+
+        client.fx.updated_at = client.universe.updated_at = 0
+        client.maybe_refresh_fx()
+        client.maybe_refresh_universe()
+        client.get_fetch_pool().shutdown(wait=True)
+        assert stub.requests == 0
+    finally:
+        client.remote.stop()
+        daemon.stop()
+        stub.stop()
+
+
+def test_public_bind_requires_token():
+    tracker, _ = make_tracker(1, warm_ticks=1)
+    with pytest.raises(ValueError, match="token"):
+        index.StateDaemon(tracker, "0.0.0.0:0").start()
+    with pytest.raises(SystemExit):
+        index.parse_args(["--serve", "0.0.0.0:7878", "--token", ""])
+    assert index.parse_args(["--serve", "0.0.0.0:7878", "--token", "rahasia"]).token == "rahasia"
+    assert index.parse_args(["--serve", "127.0.0.1:7878", "--token", ""]).serve
+
+
+def test_token_gates_snapshot_and_commands():
+    tracker, _ = make_tracker(5, warm_ticks=1)
+    daemon = index.StateDaemon(tracker, "0.0.0.0:0", token="rahasia").start()
+    port = daemon.listener.getsockname()[1]
+    good = index.CryptoTrackerGenZ(api_base_url="http://127.0.0.1:9", backfill_days=0,
+                                   remote=index.StateSubscriber(f"127.0.0.1:{port}", token="rahasia"))
+    good.remote.start(good)
+    intruder = socket.create_connection(("127.0.0.1", port))
+    try:
+        command = {'op': 'remove', 'coin': 'coin-0'}
+        intruder.sendall(index.StateProtocol.pack_json(index.StateProtocol.COMMAND, command))
+        assert wait_for(lambda: good.remote.connected)
+        daemon.publish()
+        assert wait_for(lambda: len(good.crypto_data) == 5)
+        intruder.settimeout(2)
+        assert intruder.recv(4096) == b""
+        daemon.apply_commands()
+        assert 'coin-0' in tracker.watchlist
+        assert tracker.metrics.counter('daemon_auth_failures_total') == 1
+
+        good.remote.send_command('remove', 'coin-1')
+        assert wait_for(lambda: daemon.commands)
+        daemon.apply_commands()
+        assert 'coin-1' not in tracker.watchlist
+    finally:
+        intruder.close()
+        good.remote.stop()
+        daemon.stop()
+
+
+def test_source_mask_covers_64_providers():
+    tracker, _ = make_tracker(1, warm_ticks=1)
+    daemon = index.StateDaemon(tracker, "unix:/nonexistent/daemon.sock")
+    names = [f"p{i}" for i in range(64)]
+    mask = daemon.source_mask(names)
+    assert mask == (1 << 64) - 1
+    row = (0, mask, 1.0, 0.0, 0.0, 0.0, 0.0)
+    _, _, rows = index.StateProtocol.unpack_delta(index.StateProtocol.pack_delta(1, 0.0, [row])[5:])
+    assert int(rows['sources'][0]) == mask
+    with pytest.raises(ValueError):
+        daemon.source_mask(["p64"])
@@ -0,0 +1,80 @@
+from urllib.parse import parse_qs, urlparse
+
+import index
+from bench import StubCoinGeckoServer
+
+
+def make_tracker(stub, **kwargs):
+    tracker = index.CryptoTrackerGenZ(api_base_url=stub.url, backfill_days=0, **kwargs)
+    tracker.watchlist = ['bitcoin', 'ethereum', 'solana']
+    return tracker
+
+
+def test_fetch_fills_state_from_stub():
+    stub = StubCoinGeckoServer().start()
+    tracker = make_tracker(stub)
+    try:
+        tracker.fetch_crypto_data()
+        assert set(tracker.drain_changed()) == {'bitcoin', 'ethereum', 'solana'}
+        seed = sum(map(ord, 'bitcoin'))
+        coin = tracker.crypto_data['bitcoin']
+        assert 1.0 <= coin['price'] / (seed % 1000 + 1) <= 1.006
+        assert coin['change_24h'] == (seed % 17) - 8
+        assert coin['market_cap'] == coin['price'] * 1e8
+        assert stub.statuses == {200: 1}
+        assert tracker.metrics.counter('fetch_ticks_total', result="ok") == 1
+    finally:
+        tracker.shutdown()
+        stub.stop()
+
+
+def test_rate_limited_fetch_backs_off_and_keeps_old_state():
+    stub = StubCoinGeckoServer().start()
+    tracker = make_tracker(stub)
+    try:
+        tracker.fetch_crypto_data()
+        before = dict(tracker.crypto_data['bitcoin'])
+        stub.rate_limit_rate = 1.0
+        tracker.fetch_crypto_data()
+        assert tracker.crypto_data['bitcoin']['price'] == before['price']
+        assert tracker.metrics.counter('rate_limited_total') == 1
+        assert tracker.scheduler.backoff_until > 0 and "429" in tracker.scheduler.decision
+    finally:
+        tracker.shutdown()
+        stub.stop()
+
+
+class FailingBatchStub(StubCoinGeckoServer):
+    """Batch /simple/price yang isinya koin `poison` selalu dibales 503"""
+    def __init__(self, poison):
+        super().__init__()
+        self.poison = poison
+        self.batches = []
+
+    def handle(self, handler):
+        if "/simple/price" in handler.path:
+            ids = parse_qs(urlparse(handler.path).query).get('ids', [''])[0].split(',')
+            with self.lock:
+                self.batches.append(ids)
+            if self.poison in ids:
+                self.requests += 1
+                return self.send(handler, 503, b'{"error":"down"}')
+        return super().handle(handler)
+
+
+def test_watchlist_is_split_into_capped_batches_and_one_failure_is_isolated():
+    stub = FailingBatchStub('coin-4').start()
+    tracker = index.CryptoTrackerGenZ(api_base_url=stub.url, backfill_days=0, batch_size=3)
+    tracker.watchlist = [f"coin-{i}" for i in range(10)]
+    try:
+        assert [len(batch) for batch in tracker.get_fetch_batches()] == [3, 3, 3, 1]
+        tracker.fetch_crypto_data()
+        assert sorted(len(ids) for ids in stub.batches) == [1, 3, 3, 3]
+        assert sorted(c for ids in stub.batches for c in ids) == sorted(tracker.watchlist)
+        failed = next(ids for ids in stub.batches if 'coin-4' in ids)
+        assert set(tracker.crypto_data) == set(tracker.watchlist) - set(failed)
+        assert tracker.metrics.counter('fetch_ticks_total', result="failed") == 1
+        assert "503" in tracker.scheduler.decision
+    finally:
+        tracker.shutdown()
+        stub.stop()
@@ -0,0 +1,32 @@
+import io
+
+import index
+from bench import StubCoinGeckoServer
+
+
+def run_one_tick(api_url, evict=None):
+    tracker = index.CryptoTrackerGenZ(api_base_url=api_url, backfill_days=0)
+    tracker.watchlist = ['bitcoin', 'ethereum']
+    if evict is not None:
+        # eviksi di dalam loop (kayak config reload / cold TTL), sebelum fetch pertama
+        tracker.maybe_evict_cold = lambda: tracker.evict_coin(evict)
+    output = io.StringIO()
+    tracker.run_headless(index.SnapshotWriter(output), max_ticks=1)
+    return tracker, output.getvalue()
+
+
+def test_eviction_before_first_data_does_not_report_startup(capsys):
+    tracker, _ = run_one_tick("http://127.0.0.1:9", evict='ethereum')
+    assert tracker.first_data_at is None and tracker.first_frame_at is None
+    assert "[startup]" not in capsys.readouterr().err
+
+
+def test_first_data_prints_startup_report(capsys):
+    stub = StubCoinGeckoServer().start()
+    try:
+        tracker, output = run_one_tick(stub.url, evict='solana')
+    finally:
+        stub.stop()
+    assert tracker.first_frame_at is not None
+    assert '"bitcoin"' in output
+    assert "data pertama" in capsys.readouterr().err
@@ -0,0 +1,70 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import index
+from bench import StubCoinGeckoServer
+
+
+@pytest.fixture
+def stub():
+    server = StubCoinGeckoServer().start()
+    yield server
+    server.stop()
+
+
+def test_get_json_marks_keep_alive_reuse_per_response(stub):
+    client = index.PooledHttpClient()
+    url = f"{stub.url}/simple/price"
+    try:
+        first = client.get_json(url, {'ids': 'bitcoin', 'vs_currencies': 'usd'})
+        client.get_json(url, {'ids': 'ethereum', 'vs_currencies': 'usd'})
+        client.get_json(url, {'ids': 'bitcoin', 'vs_currencies': 'usd'})
+    finally:
+        client.close()
+    assert 'bitcoin' in first
+    assert [t['reused'] for t in client.timings] == [False, True, True]
+    summary = client.summarize(list(client.timings))
+    assert summary['requests'] == 3 and summary['reused'] == 2
+
+
+def test_new_connection_is_not_reported_as_reused(stub):
+    url = f"{stub.url}/exchange_rates"
+    for _ in range(2):
+        client = index.PooledHttpClient()
+        client.get_json(url)
+        client.close()
+        assert [t['reused'] for t in client.timings] == [False]
+
+
+class NotModifiedHandler(BaseHTTPRequestHandler):
+    """Balas 304 ke semua request kecuali yang minta no-cache"""
+    protocol_version = "HTTP/1.1"
+    seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        no_cache = self.headers.get('Cache-Control') == 'no-cache'
+        self.seen.append(no_cache)
+        body = b'{"ok": true}' if no_cache else b''
+        self.send_response(200 if no_cache else 304)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_304_without_cached_entry_refetches_in_full():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), NotModifiedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = index.PooledHttpClient()
+    try:
+        data = client.get_json(f"http://127.0.0.1:{server.server_port}/coins/list")
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+    assert data == {'ok': True}
+    assert NotModifiedHandler.seen == [False, True]
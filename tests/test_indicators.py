@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import index
+
+
+def reference_rsi(prices, period=14):
+    """RSI Wilder versi loop biasa: rata-rata sederhana `period` delta pertama, habis itu smoothing"""
+    deltas = np.diff(prices)
+    gain = np.mean(np.maximum(deltas[:period], 0))
+    loss = np.mean(np.maximum(-deltas[:period], 0))
+    for delta in deltas[period:]:
+        gain = (gain * (period - 1) + max(delta, 0)) / period
+        loss = (loss * (period - 1) + max(-delta, 0)) / period
+    return 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+
+
+def reference_macd(prices, fast=12, slow=26, signal=9):
+    def ema(values, span):
+        alpha, out = 2 / (span + 1), [values[0]]
+        for value in values[1:]:
+            out.append(out[-1] + alpha * (value - out[-1]))
+        return np.array(out)
+    macd = ema(prices, fast) - ema(prices, slow)
+    return macd[-1], ema(macd, signal)[-1]
+
+
+@pytest.fixture
+def walks():
+    rng = np.random.default_rng(5)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (3, 120)), axis=1))
+
+
+def feed(engine, coin_ids, walks, ticks):
+    for t in range(ticks):
+        engine.update(coin_ids, walks[:, t], ts=1e9)
+
+
+def test_rsi_and_macd_match_reference(walks):
+    coin_ids = ['a', 'b', 'c']
+    engine = index.IndicatorEngine()
+    feed(engine, coin_ids, walks, walks.shape[1])
+    ids, values = engine.values()
+    assert ids == coin_ids
+    for i in range(len(coin_ids)):
+        assert values['rsi'][i] == pytest.approx(reference_rsi(walks[i]), rel=1e-9)
+        macd, signal = reference_macd(walks[i])
+        assert values['macd'][i] == pytest.approx(macd, rel=1e-9, abs=1e-12)
+        assert values['signal'][i] == pytest.approx(signal, rel=1e-9, abs=1e-12)
+        window = walks[i, -20:]
+        assert values['bb_mid'][i] == pytest.approx(window.mean())
+        upper = window.mean() + 2 * window.std()
+        assert values['bb_upper'][i] == pytest.approx(upper)
+
+
+def test_values_stay_nan_until_warm(walks):
+    engine = index.IndicatorEngine()
+    feed(engine, ['a'], walks[:1], 14)
+    _, values = engine.values()
+    assert np.isnan(values['rsi'][0]) and np.isnan(values['macd'][0])
+    engine.update(['a'], walks[:1, 14], ts=1e9)
+    _, values = engine.values()
+    assert values['rsi'][0] == pytest.approx(reference_rsi(walks[0, :15]))
+    assert np.isnan(values['macd'][0])
+
+
+def test_flat_series_is_neutral():
+    engine = index.IndicatorEngine()
+    for _ in range(30):
+        engine.update(['flat'], [5.0], ts=1e9)
+    _, values = engine.values(['flat'])
+    assert values['rsi'][0] == 50.0
+    assert values['macd'][0] == 0.0 and values['percent_b'][0] == 0.5
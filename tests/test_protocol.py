@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+
+import index
+
+P = index.StateProtocol
+
+
+def test_json_frame_round_trip_with_blob():
+    blob = np.arange(4, dtype=np.float64).tobytes()
+    frame = P.pack_json(P.SNAPSHOT, {'coins': ['bitcoin'], 'fx': {'idr': 16000.0}}, blob)
+    frames = P.split_frames(bytearray(frame))
+    assert [kind for kind, _ in frames] == [P.SNAPSHOT]
+    message, rest = P.unpack_json(frames[0][1])
+    assert message == {'coins': ['bitcoin'], 'fx': {'idr': 16000.0}}
+    assert np.frombuffer(rest).tolist() == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_delta_round_trip_is_52_bytes_per_coin():
+    rows = [(0, 1, 65000.5, -1.25, 3e10, 1.2e12, 1700000000.0),
+            (7, 1 << 63, 0.5, float('nan'), 0.0, float('nan'), 1700000001.0)]
+    frame = P.pack_delta(42, 1700000002.5, rows)
+    assert np.dtype(P.DELTA_FIELDS).itemsize == 52
+    assert len(frame) == P.HEADER.size + P.DELTA_HEADER.size + 52 * len(rows)
+    (kind, payload), = P.split_frames(bytearray(frame))
+    seq, ts, decoded = P.unpack_delta(payload)
+    assert (kind, seq, ts) == (P.DELTA, 42, 1700000002.5)
+    assert decoded['coin'].tolist() == [0, 7]
+    assert int(decoded['sources'][1]) == 1 << 63
+    assert decoded['price'].tolist() == [65000.5, 0.5]
+    assert math.isnan(decoded['market_cap'][1])
+
+
+def test_split_frames_keeps_partial_tail():
+    first = P.pack_json(P.COMMAND, {'op': 'refresh'})
+    second = P.pack_delta(1, 0.0, [(3, 2, 1.0, 0.0, 0.0, 0.0, 0.0)])
+    stream = first + second
+    buffer = bytearray()
+    seen = []
+    for i in range(0, len(stream), 5):
+        buffer.extend(stream[i:i + 5])
+        seen.extend(P.split_frames(buffer))
+    assert [kind for kind, _ in seen] == [P.COMMAND, P.DELTA]
+    assert P.unpack_json(seen[0][1])[0] == {'op': 'refresh'}
+    assert buffer == bytearray()
+
+    buffer = bytearray(first[:P.HEADER.size + 1])
+    assert P.split_frames(buffer) == []
+    assert bytes(buffer) == first[:P.HEADER.size + 1]
+
+
+def test_split_frames_rejects_oversized_frame():
+    buffer = bytearray(P.HEADER.pack(P.SNAPSHOT, P.MAX_FRAME + 1))
+    with pytest.raises(ValueError):
+        P.split_frames(buffer)
@@ -0,0 +1,59 @@
+import time
+
+import index
+
+
+def make_scheduler(**kwargs):
+    scheduler = index.PollScheduler(base_interval=10, min_interval=5, max_interval=60,
+                                    rate_per_minute=60, burst=5, **kwargs)
+    scheduler.last_refill = 1000.0
+    return scheduler
+
+
+def test_tokens_refill_at_rate_up_to_capacity():
+    scheduler = make_scheduler()
+    scheduler.tokens = 0.0
+    scheduler._refill(1002.5)
+    assert scheduler.tokens == 2.5
+    scheduler._refill(1100.0)
+    assert scheduler.tokens == 5
+
+
+def test_fetch_charges_cost_and_schedules_next_poll():
+    scheduler = make_scheduler()
+    assert scheduler.should_fetch(now=1000.0, cost=3)
+    assert scheduler.tokens == 2
+    assert scheduler.next_poll == 1010.0
+    assert not scheduler.should_fetch(now=1005.0)
+    assert scheduler.should_fetch(now=1010.0, cost=3)
+    assert scheduler.tokens == 2
+
+
+def test_fetch_larger_than_burst_is_charged_like_the_check():
+    scheduler = make_scheduler()
+    assert scheduler.should_fetch(now=1000.0, cost=20)
+    assert scheduler.tokens == 0
+    assert not scheduler.should_fetch(now=1010.0 - 0.001, cost=20)
+    assert scheduler.should_fetch(now=1010.0, cost=20)
+    assert scheduler.tokens == 0
+
+
+def test_fetch_waits_for_tokens():
+    scheduler = make_scheduler()
+    scheduler.tokens = 1.0
+    assert not scheduler.should_fetch(now=1000.0, cost=3)
+    assert "nunggu token" in scheduler.decision
+    assert scheduler.should_fetch(now=1002.0, cost=3)
+
+
+def test_backoff_blocks_fetch_and_side_requests():
+    scheduler = make_scheduler()
+    before = time.time()
+    scheduler.record_result(status=429, retry_after=30, failed=True)
+    assert scheduler.backoff_until >= before + 30
+    assert not scheduler.should_fetch(now=scheduler.backoff_until - 1)
+    assert not scheduler.try_acquire()
+    scheduler.record_result(status=503, failed=True)
+    assert scheduler.failures == 2
+    scheduler.record_result(volatility=0.1)
+    assert scheduler.failures == 0
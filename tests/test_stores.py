@@ -0,0 +1,68 @@
+import pytest
+
+import index
+
+
+def record(price, name='Koin'):
+    return {'price': price, 'change_24h': 1.0, 'volume_24h': 2.0, 'market_cap': 3.0,
+            'updated_at': 4.0, 'name': name, 'icon': 'K', 'sources': ['coingecko']}
+
+
+def test_coin_record_store_reuses_freed_slots():
+    store = index.CoinRecordStore(capacity=4)
+    for i in range(4):
+        store[f"c{i}"] = record(i)
+    rows = dict(store.rows)
+    del store['c1']
+    del store['c2']
+    store['baru'] = record(99)
+    assert store.rows['baru'] in (rows['c1'], rows['c2'])
+    assert len(store.touched) == 4
+    assert store['baru']['price'] == 99 and store['c3']['price'] == 3
+    assert store['baru']['sources'] == ['coingecko']
+
+
+def test_coin_record_store_compacts_interned_strings():
+    store = index.CoinRecordStore(capacity=4)
+    for i in range(200):
+        store[f"c{i}"] = record(i, name=f"Koin {i}")
+        if i:
+            del store[f"c{i - 1}"]
+    assert len(store) == 1 and store['c199']['name'] == 'Koin 199'
+    assert len(store.interned) <= 3 * len(store.rows) + 64 + 3
+    assert len(store.touched) <= 4
+
+
+@pytest.mark.parametrize("make", [
+    lambda: index.CoinRecordStore(capacity=4, max_rows=6),
+    lambda: index.PriceHistoryStore(depth=8, capacity=4, max_rows=6),
+    lambda: index.CandleStore(depth=8, capacity=4, max_rows=6),
+    lambda: index.IndicatorEngine(capacity=4, max_rows=6),
+])
+def test_grow_never_exceeds_max_rows(make):
+    store = make()
+    store._grow()
+    assert max(store.free_rows) == 5
+    with pytest.raises(MemoryError):
+        store._grow()
+
+
+def test_grow_doubles_without_limit():
+    assert index.grow_rows(32) == 64
+    assert index.grow_rows(32, 40) == 40
+    with pytest.raises(MemoryError):
+        index.grow_rows(40, 40)
+
+
+def test_budget_caps_tracked_coins_and_is_off_by_default():
+    assert index.parse_args([]).memory_budget == 0
+    probe = index.CryptoTrackerGenZ(api_base_url="http://127.0.0.1:9", backfill_days=0)
+    per_coin = sum(store.row_nbytes() for store in probe.coin_stores())
+    tracker = index.CryptoTrackerGenZ(api_base_url="http://127.0.0.1:9", backfill_days=0,
+                                      memory_budget=per_coin * 40)
+    assert tracker.coin_capacity == 40
+    tracker.watchlist = [f"coin-{i}" for i in range(100)]
+    tracker.apply_price_data({c: {'price': 1.0, 'market_cap': 1.0} for c in tracker.watchlist})
+    assert len(tracker.crypto_data) == 40
+    assert all(len(store.rows) <= 40 for store in tracker.coin_stores())
+    assert tracker.memory_footprint()['coins'] == 40
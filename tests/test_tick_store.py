@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+
+import index
+
+
+def test_partial_record_is_ignored_and_truncated(tmp_path):
+    store = index.TickStore(str(tmp_path))
+    store.append(1_700_000_000.0, 'bitcoin', 100.0, 5.0, 1e9, 1.5)
+    store.flush()
+    day = store.days()[0]
+    path = os.path.join(str(tmp_path), day, index.TickStore.FILENAME)
+    with open(path, 'ab') as f:
+        f.write(b'\x01' * 7)
+
+    assert len(store.open_day(day)['ts']) == 1
+    store.append(1_700_000_001.0, 'ethereum', 10.0, 1.0, 1e8, -0.5)
+    store.flush()
+    columns = store.open_day(day)
+    assert os.path.getsize(path) == 2 * index.TickStore.record_dtype().itemsize
+    assert list(columns['price']) == [100.0, 10.0]
+    assert [store.coin_ids[i] for i in columns['coin']] == ['bitcoin', 'ethereum']
+
+
+def test_coin_index_shared_between_writers(tmp_path):
+    first = index.TickStore(str(tmp_path))
+    second = index.TickStore(str(tmp_path))
+    first.append(1_700_000_000.0, 'bitcoin', 100.0, 0, 0, 0)
+    second.append(1_700_000_000.0, 'ethereum', 10.0, 0, 0, 0)
+    first.flush()
+    second.flush()
+
+    assert second.coin_ids == ['bitcoin', 'ethereum']
+    reader = index.TickStore(str(tmp_path))
+    result = reader.query(1_699_999_999.0, 1_700_000_001.0, ['ethereum'])
+    assert list(result['price']) == [10.0]
+
+
+def test_query_does_not_assume_sorted_ts(tmp_path):
+    first = index.TickStore(str(tmp_path))
+    second = index.TickStore(str(tmp_path))
+    base = 1_700_000_000.0
+    for offset in (30, 10, 20):
+        first.append(base + offset, 'bitcoin', offset, 0, 0, 0)
+    first.flush()
+    for offset in (5, 25):
+        second.append(base + offset, 'bitcoin', offset, 0, 0, 0)
+    second.flush()
+
+    ts = first.open_day(first.days()[0])['ts']
+    assert list(ts[:3] - base) == [10, 20, 30]
+    result = first.query(base + 8, base + 26)
+    assert sorted(result['price']) == [10, 20, 25]
+    assert np.all((result['ts'] >= base + 8) & (result['ts'] < base + 26))
+
+
+def test_load_recent_keeps_last_ticks_per_coin(tmp_path):
+    store = index.TickStore(str(tmp_path))
+    for i in range(10):
+        store.append(1_700_000_000.0 + i, 'bitcoin', 100.0 + i, 0, 0, 0)
+        store.append(1_700_000_000.0 + i, 'ethereum', 10.0 + i, 0, 0, 0)
+    store.flush()
+    recent = index.TickStore(str(tmp_path)).load_recent(['bitcoin', 'ethereum', 'dogecoin'], 3)
+    assert set(recent) == {'bitcoin', 'ethereum'}
+    assert list(recent['bitcoin']['price']) == [107.0, 108.0, 109.0]
+
+
+def test_store_works_when_numpy_arrives_after_import(tmp_path):
+    # kayak auto-installer: index di-import tanpa numpy, numpy baru di-import di __main__
+    script = textwrap.dedent(f"""
+        import sys
+        sys.modules['numpy'] = None
+        import index
+        assert index.np is None
+        del sys.modules['numpy']
+        import numpy
+        index.np = numpy
+        store = index.TickStore({str(tmp_path)!r})
+        store.append(1_700_000_000.0, 'bitcoin', 100.0, 5.0, 1e9, 1.5)
+        store.flush()
+        print(store.query(1_699_999_999.0, 1_700_000_001.0)['price'].tolist())
+    """)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    child = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, timeout=60)
+    assert child.returncode == 0, child.stderr
+    assert child.stdout.strip() == "[100.0]"
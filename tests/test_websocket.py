@@ -0,0 +1,117 @@
+import json
+import random
+import struct
+import threading
+
+import pytest
+
+import index
+from bench import make_quotes
+from ws_stub import StubWebSocketServer
+
+
+@pytest.fixture
+def server():
+    stub = StubWebSocketServer().start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def client(server):
+    ws = index.WebSocketClient(f"{server.url}/stream?streams=btcusdt@miniTicker").connect()
+    yield ws
+    ws.close()
+
+
+@pytest.mark.parametrize("size", [5, 125, 126, 300, 65535, 70000])
+def test_server_frames_of_every_length_encoding(server, client, size):
+    conn = server.wait_connection()
+    assert conn.path == "/stream?streams=btcusdt@miniTicker"
+    text = ''.join(random.Random(size).choice('abcdef€') for _ in range(size))
+    conn.send_text(text)
+    assert client.recv(timeout=5) == text
+
+
+@pytest.mark.parametrize("size", [0, 3, 125, 126, 65536])
+def test_client_frames_are_masked(server, client, size):
+    conn = server.wait_connection()
+    text = 'x' * size
+    client.send_text(text)
+    opcode, payload, masked = conn.next_frame()
+    assert (opcode, payload.decode(), masked) == (0x1, text, True)
+
+
+def test_fragmented_message_with_ping_in_between(server, client):
+    conn = server.wait_connection()
+    conn.send(0x1, b'{"a":', fin=False)
+    conn.ping(b'hi')
+    conn.send(0x0, b' 1}', fin=True)
+    assert client.recv(timeout=5) == '{"a": 1}'
+    assert conn.next_frame() == (0xA, b'hi', True)
+
+
+def test_server_close_is_echoed_and_raised(server, client):
+    conn = server.wait_connection()
+    conn.close(1001)
+    with pytest.raises(ConnectionError):
+        client.recv(timeout=5)
+    assert conn.next_frame() == (0x8, struct.pack(">H", 1001), True)
+
+
+def test_client_close_sends_normal_closure(server, client):
+    conn = server.wait_connection()
+    client.close()
+    assert conn.next_frame() == (0x8, struct.pack(">H", 1000), True)
+
+
+def test_handshake_with_wrong_accept_is_rejected():
+    stub = StubWebSocketServer(bad_accept=True).start()
+    try:
+        with pytest.raises(ConnectionError, match="Accept"):
+            index.WebSocketClient(stub.url).connect()
+    finally:
+        stub.stop()
+
+
+def test_binance_stream_quotes_reach_the_tracker(server):
+    tracker = index.CryptoTrackerGenZ(api_base_url="http://127.0.0.1:9", backfill_days=0)
+    tracker.watchlist = ['bitcoin', 'ethereum']
+    received = threading.Event()
+
+    def on_quotes(quotes):
+        tracker.apply_price_data(quotes, track_last=True, source='binance-stream')
+        received.set()
+
+    source = index.BinanceStreamSource(lambda: tracker.watchlist, {'bitcoin': 'BTC', 'ethereum': 'ETH'},
+                                       base_url=server.url)
+    source.start(on_quotes)
+    try:
+        conn = server.wait_connection()
+        assert conn.path == "/stream?streams=btcusdt@miniTicker/ethusdt@miniTicker"
+        event = {'e': '24hrMiniTicker', 's': 'BTCUSDT', 'c': '66000', 'o': '60000', 'q': '123456'}
+        conn.send_text(json.dumps({'stream': 'btcusdt@miniTicker', 'data': event}))
+        assert received.wait(5)
+        assert source.covered_coins() == {'bitcoin'}
+    finally:
+        source.stop()
+
+    record = tracker.crypto_data['bitcoin']
+    assert record['price'] == 66000 and record['volume_24h'] == 123456
+    assert abs(record['change_24h'] - 10) < 1e-9
+    assert record['market_cap'] != record['market_cap']
+    tracker.shutdown()
+
+
+def test_stream_market_cap_stays_unknown_until_rest_fill():
+    tracker = index.CryptoTrackerGenZ(api_base_url="http://127.0.0.1:9", backfill_days=0)
+    try:
+        tracker.apply_price_data({'bitcoin': {'price': 100.0}})
+        tracker.apply_price_data({'bitcoin': {'price': 110.0}})
+        assert tracker.crypto_data['bitcoin']['market_cap'] != tracker.crypto_data['bitcoin']['market_cap']
+        tracker.apply_price_data(make_quotes(['bitcoin'], random.Random(1), {'bitcoin': 100.0}))
+        rest = tracker.crypto_data['bitcoin']
+        tracker.apply_price_data({'bitcoin': {'price': rest['price'] * 2}})
+        assert tracker.crypto_data['bitcoin']['market_cap'] == pytest.approx(rest['market_cap'] * 2)
+    finally:
+        tracker.shutdown()
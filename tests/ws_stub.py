@@ -0,0 +1,141 @@
+"""Server WebSocket palsu (RFC 6455) di localhost buat ngetes WebSocketClient & BinanceStreamSource.
+
+Frame dari server dikirim tanpa mask, frame dari client dicatat apa adanya (termasuk flag mask)
+jadi test bisa ngecek client beneran nge-mask tiap frame.
+"""
+import base64
+import hashlib
+import os
+import queue
+import socket
+import struct
+import threading
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def encode_frame(opcode, payload=b"", fin=True):
+    """Frame server -> client (ga di-mask, sesuai RFC 6455)"""
+    header = bytearray([(0x80 if fin else 0) | opcode])
+    length = len(payload)
+    if length < 126:
+        header.append(length)
+    elif length < 65536:
+        header.append(126)
+        header.extend(struct.pack(">H", length))
+    else:
+        header.append(127)
+        header.extend(struct.pack(">Q", length))
+    return bytes(header) + payload
+
+
+class StubConnection:
+    """Satu client yang udah handshake; frame masuk ditaruh di queue `frames` sebagai (opcode, payload, masked)"""
+    def __init__(self, sock, path):
+        self.sock = sock
+        self.path = path
+        self.frames = queue.Queue()
+        self.thread = threading.Thread(target=self.read_loop, daemon=True)
+        self.thread.start()
+
+    def recv_exact(self, count):
+        data = bytearray()
+        while len(data) < count:
+            chunk = self.sock.recv(count - len(data))
+            if not chunk:
+                raise ConnectionError("client nutup koneksi")
+            data.extend(chunk)
+        return bytes(data)
+
+    def read_loop(self):
+        try:
+            while True:
+                first, second = self.recv_exact(2)
+                length = second & 0x7f
+                if length == 126:
+                    length = struct.unpack(">H", self.recv_exact(2))[0]
+                elif length == 127:
+                    length = struct.unpack(">Q", self.recv_exact(8))[0]
+                masked = bool(second & 0x80)
+                mask = self.recv_exact(4) if masked else None
+                payload = self.recv_exact(length)
+                if mask:
+                    payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+                self.frames.put((first & 0x0f, payload, masked))
+        except OSError:
+            self.frames.put(None)
+
+    def next_frame(self, timeout=5):
+        return self.frames.get(timeout=timeout)
+
+    def send(self, opcode, payload=b"", fin=True):
+        self.sock.sendall(encode_frame(opcode, payload, fin))
+
+    def send_text(self, text):
+        self.send(0x1, text.encode())
+
+    def ping(self, payload=b""):
+        self.send(0x9, payload)
+
+    def close(self, code=1000):
+        self.send(0x8, struct.pack(">H", code))
+
+
+class StubWebSocketServer:
+    """Terima koneksi websocket di 127.0.0.1; bad_accept=True bikin Sec-WebSocket-Accept sengaja salah"""
+    def __init__(self, bad_accept=False):
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.bad_accept = bad_accept
+        self.connections = queue.Queue()
+        self.thread = threading.Thread(target=self.accept_loop, daemon=True)
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.listener.getsockname()[1]}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def accept_loop(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.handshake, args=(sock,), daemon=True).start()
+
+    def handshake(self, sock):
+        request = bytearray()
+        while b"\r\n\r\n" not in request:
+            chunk = sock.recv(4096)
+            if not chunk:
+                sock.close()
+                return
+            request.extend(chunk)
+        lines = request.decode('latin-1').split("\r\n")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        key = headers.get('sec-websocket-key', '')
+        accept = base64.b64encode(hashlib.sha1((key + GUID).encode()).digest()).decode()
+        if self.bad_accept:
+            accept = base64.b64encode(os.urandom(20)).decode()
+        sock.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode())
+        self.connections.put(StubConnection(sock, lines[0].split()[1]))
+
+    def wait_connection(self, timeout=5):
+        return self.connections.get(timeout=timeout)
+
+    def stop(self):
+        try:
+            self.listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.listener.close()